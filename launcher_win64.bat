@@ -2,7 +2,19 @@
 setlocal
 
 set "AUTODIGISIGN_SCHEDULED=0"
-if /I "%~1"=="--scheduled" set "AUTODIGISIGN_SCHEDULED=1"
+set "AUTODIGISIGN_ARGUMENTS="
+
+REM --scheduled belongs to this launcher; pass every other argument through.
+:parse_arguments
+if "%~1"=="" goto arguments_parsed
+if /I "%~1"=="--scheduled" (
+    set "AUTODIGISIGN_SCHEDULED=1"
+) else (
+    set "AUTODIGISIGN_ARGUMENTS=%AUTODIGISIGN_ARGUMENTS% %1"
+)
+shift
+goto parse_arguments
+:arguments_parsed
 
 REM Use the project directory even when Task Scheduler starts elsewhere.
 pushd "%~dp0"
@@ -15,7 +27,7 @@ set "PYTHONPATH=%~dp0src"
 if not exist "%~dp0.venv\Scripts\python.exe" goto missing_virtual_environment
 
 echo Running AutoDigiSign...
-"%~dp0.venv\Scripts\python.exe" -m autodigisign
+"%~dp0.venv\Scripts\python.exe" -m autodigisign%AUTODIGISIGN_ARGUMENTS%
 set "AUTODIGISIGN_EXIT_CODE=%ERRORLEVEL%"
 goto execution_finished
 
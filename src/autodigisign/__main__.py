@@ -1,11 +1,28 @@
+import argparse
 import logging
 import sys
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
 from autodigisign.browser import detect_operating_system, initialize_driver
+from autodigisign.captcha import (
+    capture_captcha,
+    get_captcha_text,
+    load_ocr_backend,
+    recognize_captured_captcha,
+    set_captcha_strategies,
+    set_ocr_backend,
+    set_template_recognizer,
+)
+from autodigisign.captcha_cnn import CnnRecognizer, load_captcha_cnn
+from autodigisign.captcha_corpus import CAPTCHA_CORPUS_DIRECTORY, CaptchaCorpus
+from autodigisign.captcha_stats import CAPTCHA_STATISTICS_PATH, StrategyStatistics
+from autodigisign.captcha_templates import TemplateRecognizer, load_glyph_bank
+from autodigisign.captcha_tuning import load_strategy_profile
 from autodigisign.config import (
     load_credentials_settings,
+    load_runtime_options,
     resolve_project_paths,
 )
 from autodigisign.email_delivery import (
@@ -17,17 +34,38 @@ from autodigisign.email_delivery import (
 from autodigisign.employees import get_employees
 from autodigisign.logging_config import (
     LOG_TIMESTAMP_FORMAT,
+    format_exception_summary,
     log_exception,
     setup_logging,
 )
+from autodigisign.login_telemetry import LoginTelemetry, get_login_telemetry_path
 from autodigisign.portal import navigate, retry_login
+from autodigisign.session_cache import (
+    SESSION_CACHE_PATH,
+    SessionCache,
+    SessionCacheError,
+    load_session_cipher,
+)
 from autodigisign.signing import (
     SIGNATURE_BUTTON_ID,
     SIGNATURE_POPUP_TIMEOUT_SECONDS,
     SIGNATURE_PROCESSING_TIMEOUT_SECONDS,
 )
+from autodigisign.signing_journal import (
+    SIGNING_JOURNAL_DIRECTORY,
+    SigningJournal,
+    get_signing_journal_path,
+)
+from autodigisign.signing_timing import (
+    SigningTimingReport,
+    get_signing_timing_path,
+)
 from autodigisign.signing_workflow import process_employees
-from autodigisign.tesseract import configure_pytesseract
+from autodigisign.tesseract import (
+    configure_pytesseract,
+    find_tesseract_library,
+    limit_tesseract_threads,
+)
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -58,7 +96,21 @@ def validate_python_version(version_info=None):
         )
 
 
-def main():
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m autodigisign')
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help=(
+            "skip employees that today's signing journal already records as "
+            'signed or as having no pending records'
+        ),
+    )
+    return parser
+
+
+def main(argv=None):
+    arguments = build_parser().parse_args(argv)
     timestamp = datetime.now().strftime(LOG_TIMESTAMP_FORMAT)
     log_directory = get_log_directory(PROJECT_ROOT, timestamp)
     debug_log_filepath, info_log_filepath = setup_logging(
@@ -69,6 +121,7 @@ def main():
     logging.info("Project root: %s", PROJECT_ROOT)
 
     driver = None
+    ocr_backend = None
     project_paths = None
     email_settings = None
     exit_code = 0
@@ -80,6 +133,28 @@ def main():
         project_paths = resolve_project_paths(PROJECT_ROOT)
         credentials = load_credentials_settings(project_paths.credentials)
         employees = get_employees(project_paths.employee_list)
+        runtime_options = load_runtime_options()
+        if project_paths.captcha_model is not None:
+            # The CNN reads all six positions at once, so it takes the fast
+            # recognizer slot ahead of a glyph bank.
+            set_template_recognizer(
+                CnnRecognizer(load_captcha_cnn(project_paths.captcha_model))
+            )
+            logging.info("CAPTCHA CNN model loaded for recognition.")
+        elif project_paths.glyph_bank is not None:
+            set_template_recognizer(
+                TemplateRecognizer(load_glyph_bank(project_paths.glyph_bank))
+            )
+            logging.info("CAPTCHA glyph bank loaded for template recognition.")
+        if project_paths.strategy_profile is not None:
+            captcha_strategies = load_strategy_profile(
+                project_paths.strategy_profile
+            )
+            set_captcha_strategies(captcha_strategies)
+            logging.info(
+                "CAPTCHA strategy profile loaded: %s",
+                ', '.join(strategy[0] for strategy in captcha_strategies),
+            )
         if project_paths.email_config is not None:
             email_settings = load_email_settings(project_paths.email_config)
             logging.info("Optional email configuration loaded successfully.")
@@ -109,26 +184,141 @@ def main():
             tesseract_selection.source,
             tesseract_selection.executable_path.name,
         )
+        if runtime_options.ocr_thread_limit is not None:
+            limit_tesseract_threads(runtime_options.ocr_thread_limit)
+        ocr_backend = load_ocr_backend(
+            runtime_options.ocr_backend,
+            (
+                None
+                if runtime_options.ocr_backend == 'pytesseract'
+                else find_tesseract_library(
+                    tesseract_selection.executable_path,
+                    operating_system,
+                )
+            ),
+        )
+        set_ocr_backend(ocr_backend)
+        logging.info(
+            "CAPTCHA OCR: backend=%s, workers=%d, tesseract_thread_limit=%s, "
+            "capture=%s, tiled=%s, quality_gate=%s, pipelined_login=%s, "
+            "form_fill=%s",
+            ocr_backend.name,
+            runtime_options.captcha_workers,
+            runtime_options.ocr_thread_limit or 'default',
+            runtime_options.captcha_capture,
+            runtime_options.tiled_captcha_ocr,
+            runtime_options.captcha_quality_gate,
+            runtime_options.pipelined_login,
+            runtime_options.login_form_fill,
+        )
+
+        captcha_recorders = []
+        if runtime_options.captcha_corpus:
+            captcha_recorders.append(
+                CaptchaCorpus(PROJECT_ROOT / CAPTCHA_CORPUS_DIRECTORY)
+            )
+            logging.info("CAPTCHA corpus recording enabled.")
+        strategy_statistics = None
+        if runtime_options.adaptive_captcha_strategies:
+            strategy_statistics = StrategyStatistics(
+                PROJECT_ROOT / CAPTCHA_STATISTICS_PATH
+            )
+            captcha_recorders.append(strategy_statistics)
+            logging.info("Adaptive CAPTCHA strategy ordering enabled.")
+        if runtime_options.captcha_consensus_threshold is not None:
+            logging.info(
+                "CAPTCHA consensus voting enabled: threshold=%.2f",
+                runtime_options.captcha_consensus_threshold,
+            )
 
         driver = initialize_driver(
             project_root=PROJECT_ROOT,
             operating_system=operating_system,
+            browser_events=runtime_options.browser_events,
+        )
+        login_telemetry = LoginTelemetry(
+            get_login_telemetry_path(info_log_filepath),
+            settings={
+                'captcha_capture': runtime_options.captcha_capture,
+                'pipelined_login': runtime_options.pipelined_login,
+                'form_fill': runtime_options.login_form_fill,
+            },
         )
-        driver.get(PORTAL_LOGIN_URL)
-        if not retry_login(
-            driver,
-            credentials.username,
-            credentials.password,
-            max_retries=30,
-        ):
+        recognition_options = {
+            'max_workers': runtime_options.captcha_workers,
+            'recorders': captcha_recorders,
+            'strategy_statistics': strategy_statistics,
+            'consensus_threshold': runtime_options.captcha_consensus_threshold,
+            'tiled': runtime_options.tiled_captcha_ocr,
+            'quality_gate': runtime_options.captcha_quality_gate,
+        }
+        captcha_pipeline = None
+        if runtime_options.pipelined_login:
+            # retry_login() passes each prefetched CAPTCHA its own timings.
+            captcha_pipeline = (
+                partial(
+                    capture_captcha,
+                    capture_method=runtime_options.captcha_capture,
+                ),
+                partial(recognize_captured_captcha, **recognition_options),
+            )
+        session_cache = None
+        if runtime_options.session_cache:
+            try:
+                session_cache = SessionCache(
+                    PROJECT_ROOT / SESSION_CACHE_PATH,
+                    load_session_cipher(operating_system),
+                )
+            except SessionCacheError as error:
+                logging.warning(
+                    "Portal session cache disabled: %s",
+                    format_exception_summary(error),
+                )
+
+        if session_cache is not None and session_cache.restore(driver):
+            logged_in = True
+        else:
+            driver.get(PORTAL_LOGIN_URL)
+            logged_in = retry_login(
+                driver,
+                credentials.username,
+                credentials.password,
+                max_retries=30,
+                captcha_loader=partial(
+                    get_captcha_text,
+                    capture_method=runtime_options.captcha_capture,
+                    timings=login_telemetry.captcha_timings,
+                    **recognition_options,
+                ),
+                captcha_recorders=captcha_recorders,
+                captcha_pipeline=captcha_pipeline,
+                login_telemetry=login_telemetry,
+                form_fill=runtime_options.login_form_fill,
+            )
+            if logged_in:
+                navigate(driver)
+                if session_cache is not None:
+                    session_cache.save(driver)
+        if not logged_in:
             logging.error("Exiting the script due to unsuccessful login.")
             exit_code = 1
         else:
-            navigate(driver)
+            signing_journal = SigningJournal(
+                get_signing_journal_path(
+                    PROJECT_ROOT / SIGNING_JOURNAL_DIRECTORY,
+                    employees,
+                )
+            )
+            if arguments.resume:
+                employees = signing_journal.remaining_employees(employees)
             failed_employee_count = process_employees(
                 driver,
                 employees,
                 credentials.pincode,
+                timing_report=SigningTimingReport(
+                    get_signing_timing_path(info_log_filepath)
+                ),
+                journal=signing_journal,
             )
             if failed_employee_count:
                 logging.error(
@@ -149,6 +339,8 @@ def main():
             except Exception as error:
                 log_exception("Failed to close WebDriver", error)
                 exit_code = 1
+        if ocr_backend is not None:
+            ocr_backend.close()
         logging.info(
             "AutoDigiSign Finished: %s",
             datetime.now().strftime(LOG_TIMESTAMP_FORMAT),
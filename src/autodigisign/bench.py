@@ -0,0 +1,807 @@
+"""Offline benchmarks for AutoDigiSign CAPTCHA recognition.
+
+Run with ``python -m autodigisign.bench <command>``. Benchmarks never contact
+the portal; they only read local CAPTCHA images. Only ``capture`` opens a
+local browser, on a blank page with the images embedded as data URLs.
+"""
+import argparse
+import base64
+import dataclasses
+import json
+import logging
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from autodigisign.browser import detect_operating_system, initialize_driver
+from autodigisign.captcha import (
+    CAPTCHA_OCR_STRATEGIES,
+    CAPTCHA_PATTERN,
+    DEFAULT_PREPROCESSING_SETTINGS,
+    OCR_BACKEND_NAMES,
+    CaptchaRecognitionError,
+    OcrBackendError,
+    PreprocessingSettings,
+    assess_captcha_quality,
+    captcha_quality_problem,
+    capture_captcha_bytes,
+    capture_captcha_pixels,
+    decode_captcha_image,
+    load_ocr_backend,
+    preprocess_captcha,
+    recognize_captcha,
+    set_ocr_backend,
+)
+from autodigisign.captcha_cnn import (
+    CnnRecognizer,
+    load_captcha_cnn,
+    save_captcha_cnn,
+    train_captcha_cnn,
+)
+from autodigisign.captcha_corpus import iter_corpus_samples
+from autodigisign.captcha_synthetic import (
+    SYNTHETIC_FONTS,
+    SyntheticCaptchaStyle,
+    generate_captcha_batch,
+)
+from autodigisign.captcha_templates import (
+    GlyphBankError,
+    TemplateRecognizer,
+    build_glyph_bank,
+    load_glyph_bank,
+    save_glyph_bank,
+)
+from autodigisign.captcha_tuning import (
+    STRATEGY_PROFILE_PATH,
+    candidate_strategies,
+    save_strategy_profile,
+    tune_strategies,
+)
+from autodigisign.tesseract import (
+    TesseractConfigurationError,
+    configure_pytesseract,
+    find_tesseract_library,
+)
+
+
+def percentile_ms(durations, percentile):
+    """Return one latency percentile in milliseconds from seconds."""
+    if not durations:
+        return float('nan')
+    return float(np.percentile(np.asarray(durations) * 1000, percentile))
+
+
+def json_ready(value):
+    """Replace NaN and infinite floats, which JSON cannot encode, with None."""
+    if isinstance(value, dict):
+        return {key: json_ready(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_ready(item) for item in value]
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _configure_tesseract():
+    """Configure pytesseract and return the resident library, if available.
+
+    Benchmarks may run on a Linux CI box, where the production OS detection
+    refuses to start. pytesseract then uses the ``tesseract`` found on PATH.
+    """
+    try:
+        operating_system = detect_operating_system()
+        selection = configure_pytesseract(operating_system)
+    except (EnvironmentError, TesseractConfigurationError) as error:
+        logging.info("Using pytesseract defaults: %s", error)
+        return find_tesseract_library('tesseract', sys.platform)
+    return find_tesseract_library(selection.executable_path, operating_system)
+
+
+def load_benchmark_images(image_paths):
+    """Decode PNG files into grayscale arrays, keyed by their path."""
+    return [
+        (Path(image_path), decode_captcha_image(Path(image_path).read_bytes()))
+        for image_path in image_paths
+    ]
+
+
+def label_from_filename(image_path):
+    """Return the label of a ``<LABEL>.png`` or ``<LABEL>_<suffix>.png`` file."""
+    label = Path(image_path).stem.split('_', 1)[0].upper()
+    return label if CAPTCHA_PATTERN.fullmatch(label) else None
+
+
+def load_labelled_samples(sample_directory):
+    """Return ``(png_path, label)`` pairs from a corpus or a labelled folder.
+
+    A recorder corpus supplies labels from its JSON sidecars; otherwise each
+    PNG's filename prefix is used. Unlabelled samples keep a ``None`` label and
+    still count toward the format-valid rate.
+    """
+    samples = [
+        (image_path, metadata.get('label'))
+        for image_path, metadata in iter_corpus_samples(sample_directory)
+    ]
+    if samples:
+        return samples
+    return [
+        (image_path, label_from_filename(image_path))
+        for image_path in sorted(Path(sample_directory).glob('*.png'))
+    ]
+
+
+def _strategy_summary(name, durations, candidates, labels):
+    valid = [
+        candidate is not None and CAPTCHA_PATTERN.fullmatch(candidate) is not None
+        for candidate in candidates
+    ]
+    labelled = [
+        (candidate, label)
+        for candidate, label in zip(candidates, labels)
+        if label is not None
+    ]
+    correct = sum(candidate == label for candidate, label in labelled)
+    accuracy = correct / len(labelled) if labelled else float('nan')
+    # Each login attempt is an independent draw, so attempts until the first
+    # accepted CAPTCHA follow a geometric distribution.
+    if math.isnan(accuracy):
+        expected_attempts = float('nan')
+    elif accuracy == 0:
+        expected_attempts = float('inf')
+    else:
+        expected_attempts = 1 / accuracy
+    return {
+        'strategy': name,
+        'samples': len(candidates),
+        'labelled': len(labelled),
+        'format_valid_rate': sum(valid) / len(valid) if valid else float('nan'),
+        'accuracy': accuracy,
+        'p50_ms': percentile_ms(durations, 50),
+        'p95_ms': percentile_ms(durations, 95),
+        'p99_ms': percentile_ms(durations, 99),
+        'expected_attempts': expected_attempts,
+    }
+
+
+def denoised_strategies(strategies):
+    """Return a ``+cc`` twin of each strategy with denoising switched on."""
+    twins = []
+    for strategy_name, preprocessing_method, page_segmentation_mode in strategies:
+        settings = (
+            preprocessing_method
+            if isinstance(preprocessing_method, PreprocessingSettings)
+            else DEFAULT_PREPROCESSING_SETTINGS[preprocessing_method]
+        )
+        twins.append(
+            (
+                f'{strategy_name}+cc',
+                dataclasses.replace(settings, denoise=True),
+                page_segmentation_mode,
+            )
+        )
+    return tuple(twins)
+
+
+def benchmark_captcha_strategies(
+    samples,
+    strategies=CAPTCHA_OCR_STRATEGIES,
+    template_recognizer=None,
+):
+    """Replay labelled CAPTCHAs through every strategy and the full pipeline.
+
+    Strategy latency covers preprocessing and recognition. The ``pipeline``
+    row mirrors get_captcha_text(): strategies run in order and the first
+    format-valid candidate is submitted, so its latency includes decoding and
+    every strategy tried before the selected one.
+    """
+    strategy_names = [strategy[0] for strategy in strategies]
+    if template_recognizer is not None:
+        strategy_names.insert(0, template_recognizer.name)
+    durations = {name: [] for name in strategy_names + ['pipeline']}
+    candidates = {name: [] for name in strategy_names + ['pipeline']}
+    labels = []
+
+    for image_path, label in samples:
+        labels.append(label)
+        decode_started_at = time.perf_counter()
+        image = decode_captcha_image(Path(image_path).read_bytes())
+        pipeline_seconds = time.perf_counter() - decode_started_at
+        selected = None
+
+        if template_recognizer is not None:
+            started_at = time.perf_counter()
+            candidate = None
+            try:
+                candidate, confidence = template_recognizer.recognize(
+                    preprocess_captcha(image, template_recognizer.preprocessing_method)
+                )
+            except CaptchaRecognitionError:
+                confidence = 0.0
+            elapsed = time.perf_counter() - started_at
+            durations[template_recognizer.name].append(elapsed)
+            candidates[template_recognizer.name].append(candidate)
+            pipeline_seconds += elapsed
+            if (
+                candidate is not None
+                and CAPTCHA_PATTERN.fullmatch(candidate)
+                and confidence >= template_recognizer.confidence_threshold
+            ):
+                selected = candidate
+
+        for strategy_name, preprocessing_method, page_segmentation_mode in strategies:
+            started_at = time.perf_counter()
+            candidate = recognize_captcha(
+                preprocess_captcha(image, preprocessing_method),
+                page_segmentation_mode,
+            )
+            elapsed = time.perf_counter() - started_at
+            durations[strategy_name].append(elapsed)
+            candidates[strategy_name].append(candidate)
+            if selected is None:
+                pipeline_seconds += elapsed
+                if CAPTCHA_PATTERN.fullmatch(candidate):
+                    selected = candidate
+
+        durations['pipeline'].append(pipeline_seconds)
+        candidates['pipeline'].append(selected)
+
+    return [
+        _strategy_summary(name, durations[name], candidates[name], labels)
+        for name in strategy_names + ['pipeline']
+    ]
+
+
+def _pipeline_candidate(image, strategies, template_recognizer=None):
+    """Return the candidate get_captcha_text() would submit, or None."""
+    if template_recognizer is not None:
+        try:
+            candidate, confidence = template_recognizer.recognize(
+                preprocess_captcha(image, template_recognizer.preprocessing_method)
+            )
+        except CaptchaRecognitionError:
+            pass
+        else:
+            if (
+                CAPTCHA_PATTERN.fullmatch(candidate)
+                and confidence >= template_recognizer.confidence_threshold
+            ):
+                return candidate
+    for _, preprocessing_method, page_segmentation_mode in strategies:
+        candidate = recognize_captcha(
+            preprocess_captcha(image, preprocessing_method),
+            page_segmentation_mode,
+        )
+        if CAPTCHA_PATTERN.fullmatch(candidate):
+            return candidate
+    return None
+
+
+def benchmark_quality_gate(
+    samples,
+    strategies=CAPTCHA_OCR_STRATEGIES,
+    template_recognizer=None,
+):
+    """Report how often the quality gate skips and what skipping saves.
+
+    A false skip is a gated sample that the pipeline, with the same strategies
+    and recognizer as the strategy benchmark, would have read correctly;
+    unlabelled gated samples count as skipped but not as false skips. Saved
+    time is the pipeline time on gated samples minus the gate's own cost on
+    every sample.
+    """
+    gated = 0
+    false_skips = 0
+    gate_seconds = []
+    saved_seconds = 0.0
+    for image_path, label in samples:
+        image = decode_captcha_image(Path(image_path).read_bytes())
+        started_at = time.perf_counter()
+        problem = captcha_quality_problem(assess_captcha_quality(image))
+        gate_seconds.append(time.perf_counter() - started_at)
+        if problem is None:
+            continue
+        gated += 1
+        started_at = time.perf_counter()
+        selected = _pipeline_candidate(image, strategies, template_recognizer)
+        saved_seconds += time.perf_counter() - started_at
+        false_skips += label is not None and selected == label
+    return {
+        'samples': len(gate_seconds),
+        'gated': gated,
+        'false_skips': false_skips,
+        'false_skip_rate': false_skips / gated if gated else float('nan'),
+        'gate_mean_ms': float(np.mean(gate_seconds)) * 1000,
+        'saved_ms_per_sample': (
+            (saved_seconds - sum(gate_seconds)) / len(gate_seconds) * 1000
+        ),
+    }
+
+
+def benchmark_ocr_backends(images, backends, repeat=5, page_segmentation_mode=8):
+    """Measure per-call OCR latency for each backend on the same inputs."""
+    processed_images = [
+        preprocess_captcha(image, 'otsu') for _, image in images
+    ]
+    results = []
+    for backend in backends:
+        # The first call includes any one-time model load; report it apart
+        # from the steady-state per-call latency.
+        warmup_started_at = time.perf_counter()
+        recognize_captcha(processed_images[0], page_segmentation_mode, backend)
+        warmup_seconds = time.perf_counter() - warmup_started_at
+        durations = []
+        for _ in range(repeat):
+            for processed_image in processed_images:
+                call_started_at = time.perf_counter()
+                recognize_captcha(processed_image, page_segmentation_mode, backend)
+                durations.append(time.perf_counter() - call_started_at)
+        results.append(
+            {
+                'backend': backend.name,
+                'calls': len(durations),
+                'first_call_ms': warmup_seconds * 1000,
+                'mean_ms': float(np.mean(durations)) * 1000,
+                'p50_ms': percentile_ms(durations, 50),
+                'p95_ms': percentile_ms(durations, 95),
+            }
+        )
+    return results
+
+
+# Replace the page with one imgVerifyCode element and wait for it to decode.
+_SHOW_CAPTCHA_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const container = document.body || document.documentElement;
+container.replaceChildren();
+const image = document.createElement('img');
+image.id = 'imgVerifyCode';
+image.addEventListener('load', () => done(image), {once: true});
+image.addEventListener('error', () => done(null), {once: true});
+image.src = 'data:image/png;base64,' + arguments[0];
+container.appendChild(image);
+"""
+
+
+def benchmark_capture_paths(driver, image_paths, repeat=10):
+    """Compare screenshot-and-decode capture with in-page canvas pixels.
+
+    Both paths end with the grayscale array that preprocessing receives, so
+    the screenshot timing includes OpenCV's PNG decode. ``same_size_rate`` is
+    the share of calls whose array has the screenshot's dimensions.
+    """
+    durations = {'screenshot': [], 'canvas': []}
+    payload_bytes = {'screenshot': [], 'canvas': []}
+    same_size = {'screenshot': [], 'canvas': []}
+    for image_path in image_paths:
+        image_element = driver.execute_async_script(
+            _SHOW_CAPTCHA_SCRIPT,
+            base64.b64encode(Path(image_path).read_bytes()).decode('ascii'),
+        )
+        if image_element is None:
+            raise CaptchaRecognitionError(
+                f"The browser could not display {image_path}."
+            )
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            image_bytes = capture_captcha_bytes(image_element)
+            screenshot = decode_captcha_image(image_bytes)
+            durations['screenshot'].append(time.perf_counter() - started_at)
+            payload_bytes['screenshot'].append(len(image_bytes))
+            same_size['screenshot'].append(True)
+
+            started_at = time.perf_counter()
+            image = capture_captcha_pixels(driver, image_element)
+            durations['canvas'].append(time.perf_counter() - started_at)
+            # The script returns base64 text, four characters per three bytes.
+            payload_bytes['canvas'].append(math.ceil(image.size / 3) * 4)
+            same_size['canvas'].append(image.shape == screenshot.shape)
+    return [
+        {
+            'method': method,
+            'calls': len(durations[method]),
+            'mean_ms': float(np.mean(durations[method])) * 1000,
+            'p50_ms': percentile_ms(durations[method], 50),
+            'p95_ms': percentile_ms(durations[method], 95),
+            'payload_kb': float(np.mean(payload_bytes[method])) / 1024,
+            'same_size_rate': float(np.mean(same_size[method])),
+        }
+        for method in ('screenshot', 'canvas')
+    ]
+
+
+def _print_table(rows, columns, output):
+    widths = [max(len(column), 12) for column in columns]
+    output.write(
+        '  '.join(
+            f'{column:>{width}}' for column, width in zip(columns, widths)
+        )
+        + '\n'
+    )
+    for row in rows:
+        output.write(
+            '  '.join(
+                f'{row[column]:>{width}.2f}'
+                if isinstance(row[column], float)
+                else f'{row[column]!s:>{width}}'
+                for column, width in zip(columns, widths)
+            )
+            + '\n'
+        )
+
+
+def _load_backend(backend_name):
+    try:
+        return load_ocr_backend(backend_name, _configure_tesseract())
+    except OcrBackendError as error:
+        raise SystemExit(
+            f"Could not load the {backend_name} OCR backend: {error}"
+        ) from error
+
+
+def _run_ocr_backends(arguments, output):
+    images = load_benchmark_images(arguments.images)
+    if not images:
+        raise SystemExit("At least one CAPTCHA image is required.")
+    tesseract_library = _configure_tesseract()
+    backends = []
+    for backend_name in arguments.backend or ('pytesseract', 'tesseract-api'):
+        try:
+            backends.append(load_ocr_backend(backend_name, tesseract_library))
+        except OcrBackendError as error:
+            output.write(f"Skipping {backend_name}: {error}\n")
+    try:
+        results = benchmark_ocr_backends(images, backends, repeat=arguments.repeat)
+    finally:
+        for backend in backends:
+            backend.close()
+    _print_table(
+        results,
+        ('backend', 'calls', 'first_call_ms', 'mean_ms', 'p50_ms', 'p95_ms'),
+        output,
+    )
+    return 0
+
+
+def _run_captcha(arguments, output):
+    samples = load_labelled_samples(arguments.corpus_directory)
+    if not samples:
+        raise SystemExit(
+            f"No CAPTCHA PNG samples were found in {arguments.corpus_directory}."
+        )
+    backend = _load_backend(arguments.backend)
+    set_ocr_backend(backend)
+    template_recognizer = None
+    if arguments.cnn_model is not None:
+        template_recognizer = CnnRecognizer(load_captcha_cnn(arguments.cnn_model))
+    elif arguments.glyph_bank is not None:
+        template_recognizer = TemplateRecognizer(load_glyph_bank(arguments.glyph_bank))
+    strategies = CAPTCHA_OCR_STRATEGIES
+    if arguments.denoise:
+        strategies += denoised_strategies(strategies)
+    try:
+        results = benchmark_captcha_strategies(
+            samples,
+            strategies,
+            template_recognizer=template_recognizer,
+        )
+        gate_result = None
+        if arguments.quality_gate:
+            gate_result = benchmark_quality_gate(
+                samples,
+                strategies,
+                template_recognizer=template_recognizer,
+            )
+    finally:
+        backend.close()
+    _print_table(
+        results,
+        (
+            'strategy',
+            'samples',
+            'labelled',
+            'format_valid_rate',
+            'accuracy',
+            'p50_ms',
+            'p95_ms',
+            'p99_ms',
+            'expected_attempts',
+        ),
+        output,
+    )
+    if gate_result is not None:
+        output.write('\nQuality gate\n')
+        _print_table([gate_result], tuple(gate_result), output)
+    if arguments.json is not None:
+        report = {'strategies': results, 'quality_gate': gate_result}
+        arguments.json.write_text(
+            json.dumps(json_ready(report), indent=2, allow_nan=False) + '\n',
+            encoding='utf-8',
+        )
+    return 0
+
+
+def _run_capture(arguments, output):
+    driver = initialize_driver(project_root=Path.cwd())
+    try:
+        driver.get('about:blank')
+        results = benchmark_capture_paths(
+            driver,
+            arguments.images,
+            repeat=arguments.repeat,
+        )
+    finally:
+        driver.quit()
+    _print_table(
+        results,
+        (
+            'method',
+            'calls',
+            'mean_ms',
+            'p50_ms',
+            'p95_ms',
+            'payload_kb',
+            'same_size_rate',
+        ),
+        output,
+    )
+    return 0
+
+
+def _run_synthesize(arguments, output):
+    style = SyntheticCaptchaStyle(
+        font=SYNTHETIC_FONTS[arguments.font],
+        noise_density=arguments.noise,
+        line_count=arguments.lines,
+        warp=arguments.warp,
+        invert=arguments.invert,
+        color=not arguments.grayscale,
+    )
+    samples = generate_captcha_batch(
+        arguments.output_directory,
+        arguments.count,
+        style,
+        seed=arguments.seed,
+    )
+    output.write(
+        f"Wrote {len(samples)} synthetic CAPTCHA(s) to "
+        f"{arguments.output_directory}\n"
+    )
+    return 0
+
+
+def _run_tune(arguments, output):
+    samples = load_labelled_samples(arguments.corpus_directory)
+    backend = _load_backend(arguments.backend)
+    set_ocr_backend(backend)
+    strategies = candidate_strategies(
+        trials=arguments.trials,
+        random_source=random.Random(arguments.seed),
+    )
+    output.write(f"Evaluating {len(strategies)} candidate strategies.\n")
+    try:
+        result = tune_strategies(
+            samples,
+            strategies,
+            arguments.target_accuracy,
+            max_strategies=arguments.max_strategies,
+        )
+    except ValueError as error:
+        raise SystemExit(
+            f"Could not tune {arguments.corpus_directory}: {error}"
+        ) from error
+    finally:
+        backend.close()
+    save_strategy_profile(arguments.output, result)
+    output.write(
+        f"Selected {', '.join(strategy[0] for strategy in result['strategies'])}: "
+        f"accuracy={result['accuracy']:.3f}, mean_ms={result['mean_ms']:.1f}, "
+        f"meets_target={result['meets_target']}\n"
+        f"Saved the strategy profile to {arguments.output}\n"
+    )
+    return 0
+
+
+def _run_train_cnn(arguments, output):
+    samples = [
+        (image_path, label)
+        for image_path, label in load_labelled_samples(arguments.corpus_directory)
+        if label is not None
+    ]
+    processed_images = [
+        preprocess_captcha(
+            decode_captcha_image(Path(image_path).read_bytes()),
+            CnnRecognizer.preprocessing_method,
+        )
+        for image_path, _ in samples
+    ]
+    try:
+        model, history = train_captcha_cnn(
+            processed_images,
+            [label for _, label in samples],
+            epochs=arguments.epochs,
+            seed=arguments.seed,
+        )
+    except ValueError as error:
+        raise SystemExit(
+            f"Could not train on {arguments.corpus_directory}: {error}"
+        ) from error
+    save_captcha_cnn(model, arguments.output)
+    _print_table(
+        [
+            {'epoch': epoch, 'loss': loss, 'validation_accuracy': accuracy}
+            for epoch, loss, accuracy in history
+        ],
+        ('epoch', 'loss', 'validation_accuracy'),
+        output,
+    )
+    output.write(
+        f"Saved the CAPTCHA model trained on {len(samples)} labelled image(s) "
+        f"to {arguments.output}\n"
+    )
+    return 0
+
+
+def _run_build_glyph_bank(arguments, output):
+    labelled_images = [
+        (
+            preprocess_captcha(
+                decode_captcha_image(Path(image_path).read_bytes()),
+                'otsu',
+            ),
+            label,
+        )
+        for image_path, label in load_labelled_samples(arguments.image_directory)
+        if label is not None
+    ]
+    try:
+        bank = build_glyph_bank(labelled_images)
+    except GlyphBankError as error:
+        raise SystemExit(
+            f"Could not build a glyph bank from {arguments.image_directory}: "
+            f"{error}"
+        ) from error
+    save_glyph_bank(bank, arguments.output)
+    output.write(
+        f"Saved {len(bank.labels)} glyph templates from "
+        f"{len(labelled_images)} labelled image(s) to {arguments.output}\n"
+    )
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m autodigisign.bench')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ocr_backends = commands.add_parser(
+        'ocr-backends',
+        help='compare per-call latency of the available OCR backends',
+    )
+    ocr_backends.add_argument('images', nargs='+', type=Path)
+    ocr_backends.add_argument(
+        '--backend',
+        action='append',
+        choices=[name for name in OCR_BACKEND_NAMES if name != 'auto'],
+    )
+    ocr_backends.add_argument('--repeat', type=int, default=5)
+    ocr_backends.set_defaults(handler=_run_ocr_backends)
+
+    captcha = commands.add_parser(
+        'captcha',
+        help='replay stored CAPTCHAs and report accuracy and latency per strategy',
+    )
+    captcha.add_argument('corpus_directory', type=Path)
+    captcha.add_argument(
+        '--backend',
+        choices=OCR_BACKEND_NAMES,
+        default='pytesseract',
+    )
+    recognizer = captcha.add_mutually_exclusive_group()
+    recognizer.add_argument('--glyph-bank', type=Path)
+    recognizer.add_argument('--cnn-model', type=Path)
+    captcha.add_argument(
+        '--denoise',
+        action='store_true',
+        help='also measure a denoised and cropped twin of every strategy',
+    )
+    captcha.add_argument(
+        '--quality-gate',
+        action='store_true',
+        help='also report the quality gate false-skip rate and time saved',
+    )
+    captcha.add_argument(
+        '--json',
+        type=Path,
+        help='also write strategy and quality gate results to this JSON file',
+    )
+    captcha.set_defaults(handler=_run_captcha)
+
+    capture = commands.add_parser(
+        'capture',
+        help='compare screenshot and canvas CAPTCHA capture in a local browser',
+    )
+    capture.add_argument('images', nargs='+', type=Path)
+    capture.add_argument('--repeat', type=int, default=10)
+    capture.set_defaults(handler=_run_capture)
+
+    synthesize = commands.add_parser(
+        'synthesize',
+        help='write labelled synthetic CAPTCHAs named <LABEL>_<index>.png',
+    )
+    synthesize.add_argument('output_directory', type=Path)
+    synthesize.add_argument('--count', type=int, default=1000)
+    synthesize.add_argument('--seed', type=int)
+    synthesize.add_argument(
+        '--font',
+        choices=tuple(SYNTHETIC_FONTS),
+        default='simplex',
+    )
+    synthesize.add_argument('--noise', type=float, default=0.03)
+    synthesize.add_argument('--lines', type=int, default=2)
+    synthesize.add_argument('--warp', type=float, default=0.0)
+    synthesize.add_argument('--invert', action='store_true')
+    synthesize.add_argument('--grayscale', action='store_true')
+    synthesize.set_defaults(handler=_run_synthesize)
+
+    tune = commands.add_parser(
+        'tune',
+        help='search preprocessing and PSM settings and save a strategy profile',
+    )
+    tune.add_argument('corpus_directory', type=Path)
+    tune.add_argument('--target-accuracy', type=float, default=0.9)
+    tune.add_argument(
+        '--trials',
+        type=int,
+        help='evaluate this many random grid points instead of the full grid',
+    )
+    tune.add_argument('--max-strategies', type=int, default=3)
+    tune.add_argument('--seed', type=int)
+    tune.add_argument(
+        '--backend',
+        choices=OCR_BACKEND_NAMES,
+        default='pytesseract',
+    )
+    tune.add_argument('--output', type=Path, default=STRATEGY_PROFILE_PATH)
+    tune.set_defaults(handler=_run_tune)
+
+    train_cnn = commands.add_parser(
+        'train-cnn',
+        help='train the NumPy CAPTCHA CNN on labelled CAPTCHAs',
+    )
+    train_cnn.add_argument('corpus_directory', type=Path)
+    train_cnn.add_argument('--epochs', type=int, default=30)
+    train_cnn.add_argument('--seed', type=int)
+    train_cnn.add_argument(
+        '--output',
+        type=Path,
+        default=Path('inputs') / 'captcha' / 'captcha_cnn.npz',
+    )
+    train_cnn.set_defaults(handler=_run_train_cnn)
+
+    glyph_bank = commands.add_parser(
+        'build-glyph-bank',
+        help=(
+            'build a template glyph bank from a recorder corpus or from PNGs '
+            'named <LABEL>[_*].png'
+        ),
+    )
+    glyph_bank.add_argument('image_directory', type=Path)
+    glyph_bank.add_argument(
+        '--output',
+        type=Path,
+        default=Path('inputs') / 'captcha' / 'glyph_bank.npz',
+    )
+    glyph_bank.set_defaults(handler=_run_build_glyph_bank)
+    return parser
+
+
+def main(argv=None, output=None):
+    arguments = build_parser().parse_args(argv)
+    return arguments.handler(arguments, output or sys.stdout)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
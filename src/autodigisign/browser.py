@@ -23,17 +23,31 @@ def detect_operating_system(platform_name=None):
     )
 
 
-def start_browser(browser, driver_path):
-    """Start one supported browser with its validated local WebDriver."""
+def start_browser(browser, driver_path, browser_events=False):
+    """Start one supported browser with its validated local WebDriver.
+
+    ``browser_events`` requests a WebDriver BiDi connection so that browser
+    events, such as a new popup window, can be received without polling.
+    """
     if browser == 'edge':
         os.environ['MSEDGEDRIVER_TELEMETRY_OPTOUT'] = '1'
-        return webdriver.Edge(service=EdgeService(str(driver_path)))
+        options = webdriver.EdgeOptions()
+        options.enable_bidi = browser_events
+        return webdriver.Edge(
+            service=EdgeService(str(driver_path)),
+            options=options,
+        )
     if browser == 'chrome':
-        return webdriver.Chrome(service=ChromeService(str(driver_path)))
+        options = webdriver.ChromeOptions()
+        options.enable_bidi = browser_events
+        return webdriver.Chrome(
+            service=ChromeService(str(driver_path)),
+            options=options,
+        )
     raise ValueError(f"Unsupported browser: {browser}")
 
 
-def initialize_driver(project_root, operating_system=None):
+def initialize_driver(project_root, operating_system=None, browser_events=False):
     """Initialize Edge with Chrome as fallback on a supported OS."""
     operating_system = operating_system or detect_operating_system()
 
@@ -47,7 +61,11 @@ def initialize_driver(project_root, operating_system=None):
                 browser,
                 operating_system,
             )
-            driver = start_browser(browser, selection.driver_path)
+            driver = start_browser(
+                browser,
+                selection.driver_path,
+                browser_events,
+            )
             driver_selection = selection
             break
         except Exception as error:
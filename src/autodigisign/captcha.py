@@ -1,6 +1,12 @@
+import base64
+import ctypes
 import logging
 import re
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Optional
 
 import cv2
 import numpy as np
@@ -13,6 +19,7 @@ from selenium.common.exceptions import (
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 
+from autodigisign.logging_config import format_exception_summary
 from autodigisign.selenium_helpers import safe_find
 
 
@@ -27,6 +34,70 @@ CAPTCHA_OCR_STRATEGIES = (
     ('adaptive-psm7', 'adaptive', 7),
     ('otsu-psm13', 'otsu', 13),
 )
+OCR_BACKEND_NAMES = ('pytesseract', 'tesseract-api', 'auto')
+CONSENSUS_STRATEGY_NAME = 'consensus'
+CAPTCHA_CAPTURE_METHODS = ('screenshot', 'canvas')
+# Tiled OCR reads all stacked variants as one uniform block of text lines.
+TILED_PAGE_SEGMENTATION_MODE = 6
+TILED_STRATEGY_PREFIX = 'tiled:'
+# Strokes thinner than this opening kernel, such as interference lines at the
+# default 3x scale, are removed by the denoising stage.
+DENOISE_LINE_KERNEL_SIZE = 3
+DENOISE_CROP_MARGIN = 8
+# Quality gate limits. Glyph blobs are counted with and without an opening
+# that removes the thin interference lines joining glyphs into one blob; the
+# larger count is used so 1-pixel text survives. On 2,000 synthetic CAPTCHAs
+# per style, the range skipped no default image and at most 0.2% of any
+# other style, and still skipped every blank, speckle-only or half-loaded
+# image and 85% of images holding only interference lines.
+QUALITY_MIN_CONTRAST = 48
+QUALITY_INK_RATIO_RANGE = (0.03, 0.45)
+QUALITY_GLYPH_OPENING_SIZE = 2
+QUALITY_GLYPH_BLOB_RANGE = (3, 12)
+QUALITY_GLYPH_MIN_HEIGHT_SHARE = 0.3
+TESSERACT_OEM_DEFAULT = 3
+# tesseract::PageIteratorLevel value for single words in the C API.
+TESSERACT_RIL_WORD = 3
+
+
+PREPROCESSING_METHODS = ('otsu', 'adaptive')
+
+
+@dataclass(frozen=True)
+class PreprocessingSettings:
+    method: str
+    scale_factor: float = CAPTCHA_SCALE_FACTOR
+    # Gaussian blur kernel before thresholding; 0 disables the blur.
+    blur_kernel: int = 0
+    adaptive_block_size: int = 31
+    adaptive_c: float = 9
+    # Remove small components and thin lines, then crop to the text.
+    denoise: bool = False
+    denoise_min_area: int = 30
+
+
+DEFAULT_PREPROCESSING_SETTINGS = {
+    'otsu': PreprocessingSettings('otsu'),
+    'adaptive': PreprocessingSettings('adaptive', blur_kernel=3),
+}
+
+
+@dataclass(frozen=True)
+class StrategyResult:
+    strategy: str
+    candidate: str
+    format_valid: bool
+    elapsed_ms: float
+    confidence: Optional[float] = None
+    character_confidences: Optional[tuple] = None
+
+
+@dataclass(frozen=True)
+class CaptchaQuality:
+    # Grayscale spread between the 5th and 95th percentiles.
+    contrast: float
+    ink_ratio: float
+    glyph_blobs: int
 
 
 class CaptchaError(RuntimeError):
@@ -45,6 +116,428 @@ class CaptchaRecognitionError(RetryableCaptchaError):
     """The captured CAPTCHA image could not be processed or recognized."""
 
 
+class OcrBackendError(CaptchaError):
+    """The requested OCR backend could not be loaded or initialized."""
+
+
+class PytesseractBackend:
+    """Run Tesseract once per image through pytesseract's subprocess call."""
+
+    name = 'pytesseract'
+
+    def image_to_string(self, processed_image, page_segmentation_mode):
+        config = (
+            f'--oem {TESSERACT_OEM_DEFAULT} --psm {page_segmentation_mode} '
+            f'-c tessedit_char_whitelist={CAPTCHA_WHITELIST}'
+        )
+        try:
+            return pytesseract.image_to_string(
+                processed_image,
+                config=config,
+            )
+        except (TypeError, ValueError, pytesseract.TesseractError) as error:
+            raise CaptchaRecognitionError(
+                f"Tesseract could not recognize the CAPTCHA image: {error}"
+            ) from error
+
+    def image_to_scored_text(self, processed_image, page_segmentation_mode):
+        """Return ``(text, confidence)`` pairs for each recognized word."""
+        config = (
+            f'--oem {TESSERACT_OEM_DEFAULT} --psm {page_segmentation_mode} '
+            f'-c tessedit_char_whitelist={CAPTCHA_WHITELIST}'
+        )
+        try:
+            data = pytesseract.image_to_data(
+                processed_image,
+                config=config,
+                output_type=pytesseract.Output.DICT,
+            )
+        except (TypeError, ValueError, pytesseract.TesseractError) as error:
+            raise CaptchaRecognitionError(
+                f"Tesseract could not recognize the CAPTCHA image: {error}"
+            ) from error
+        # Tesseract reports -1 for layout rows that carry no recognized text.
+        return [
+            (text, float(confidence) / 100)
+            for text, confidence in zip(data['text'], data['conf'])
+            if text.strip() and float(confidence) >= 0
+        ]
+
+    def image_to_words(self, processed_image, page_segmentation_mode):
+        """Return ``(text, left, top, height)`` for each recognized word."""
+        config = (
+            f'--oem {TESSERACT_OEM_DEFAULT} --psm {page_segmentation_mode} '
+            f'-c tessedit_char_whitelist={CAPTCHA_WHITELIST}'
+        )
+        try:
+            data = pytesseract.image_to_data(
+                processed_image,
+                config=config,
+                output_type=pytesseract.Output.DICT,
+            )
+        except (TypeError, ValueError, pytesseract.TesseractError) as error:
+            raise CaptchaRecognitionError(
+                f"Tesseract could not recognize the CAPTCHA image: {error}"
+            ) from error
+        return [
+            (text, int(left), int(top), int(height))
+            for text, left, top, height in zip(
+                data['text'],
+                data['left'],
+                data['top'],
+                data['height'],
+            )
+            if text.strip()
+        ]
+
+    def close(self):
+        pass
+
+
+class TesseractApiBackend:
+    """Keep libtesseract resident so the language model loads once per run.
+
+    A TessBaseAPI handle is not thread-safe, so each recognition checks an
+    idle handle out of a pool and returns it afterwards. The pool only grows
+    to the number of recognitions that ever ran at once, whichever threads
+    run them.
+    """
+
+    name = 'tesseract-api'
+
+    def __init__(self, library_path, tessdata_path=None, language='eng'):
+        try:
+            library = ctypes.CDLL(str(library_path))
+        except OSError as error:
+            raise OcrBackendError(
+                f"Could not load the Tesseract library: {error}"
+            ) from error
+        try:
+            self._bind(library)
+        except AttributeError as error:
+            raise OcrBackendError(
+                f"The Tesseract library does not provide the C API: {error}"
+            ) from error
+        self._library = library
+        self._tessdata_path = (
+            None if tessdata_path is None else str(tessdata_path).encode()
+        )
+        self._language = language.encode()
+        self._idle_handles = []
+        self._handles_lock = threading.Lock()
+        self._closed = False
+        # Fail during startup, not on the first login attempt.
+        self._release(self._create_engine())
+
+    @staticmethod
+    def _bind(library):
+        library.TessBaseAPICreate.restype = ctypes.c_void_p
+        library.TessBaseAPICreate.argtypes = []
+        library.TessBaseAPIInit2.restype = ctypes.c_int
+        library.TessBaseAPIInit2.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_char_p,
+            ctypes.c_char_p,
+            ctypes.c_int,
+        ]
+        library.TessBaseAPISetVariable.restype = ctypes.c_int
+        library.TessBaseAPISetVariable.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_char_p,
+            ctypes.c_char_p,
+        ]
+        library.TessBaseAPISetPageSegMode.restype = None
+        library.TessBaseAPISetPageSegMode.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_int,
+        ]
+        library.TessBaseAPISetImage.restype = None
+        library.TessBaseAPISetImage.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+        ]
+        library.TessBaseAPIGetUTF8Text.restype = ctypes.c_void_p
+        library.TessBaseAPIGetUTF8Text.argtypes = [ctypes.c_void_p]
+        library.TessBaseAPIMeanTextConf.restype = ctypes.c_int
+        library.TessBaseAPIMeanTextConf.argtypes = [ctypes.c_void_p]
+        library.TessDeleteText.restype = None
+        library.TessDeleteText.argtypes = [ctypes.c_void_p]
+        library.TessBaseAPIClear.restype = None
+        library.TessBaseAPIClear.argtypes = [ctypes.c_void_p]
+        library.TessBaseAPIEnd.restype = None
+        library.TessBaseAPIEnd.argtypes = [ctypes.c_void_p]
+        library.TessBaseAPIDelete.restype = None
+        library.TessBaseAPIDelete.argtypes = [ctypes.c_void_p]
+        library.TessBaseAPIRecognize.restype = ctypes.c_int
+        library.TessBaseAPIRecognize.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+        ]
+        library.TessBaseAPIGetIterator.restype = ctypes.c_void_p
+        library.TessBaseAPIGetIterator.argtypes = [ctypes.c_void_p]
+        library.TessResultIteratorGetPageIterator.restype = ctypes.c_void_p
+        library.TessResultIteratorGetPageIterator.argtypes = [ctypes.c_void_p]
+        library.TessResultIteratorGetUTF8Text.restype = ctypes.c_void_p
+        library.TessResultIteratorGetUTF8Text.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_int,
+        ]
+        library.TessPageIteratorBoundingBox.restype = ctypes.c_int
+        library.TessPageIteratorBoundingBox.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_int,
+            ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_int),
+        ]
+        library.TessResultIteratorNext.restype = ctypes.c_int
+        library.TessResultIteratorNext.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_int,
+        ]
+        library.TessResultIteratorDelete.restype = None
+        library.TessResultIteratorDelete.argtypes = [ctypes.c_void_p]
+
+    def _create_engine(self):
+        handle = self._library.TessBaseAPICreate()
+        if not handle:
+            raise OcrBackendError("Tesseract could not create an API handle.")
+        if self._library.TessBaseAPIInit2(
+            handle,
+            self._tessdata_path,
+            self._language,
+            TESSERACT_OEM_DEFAULT,
+        ) != 0:
+            self._library.TessBaseAPIDelete(handle)
+            raise OcrBackendError(
+                "Tesseract could not load the "
+                f"{self._language.decode()} language data."
+            )
+        self._library.TessBaseAPISetVariable(
+            handle,
+            b'tessedit_char_whitelist',
+            CAPTCHA_WHITELIST.encode(),
+        )
+        return handle
+
+    def _delete_engine(self, handle):
+        self._library.TessBaseAPIEnd(handle)
+        self._library.TessBaseAPIDelete(handle)
+
+    def _acquire(self):
+        with self._handles_lock:
+            if self._closed:
+                raise OcrBackendError("The Tesseract API backend is closed.")
+            if self._idle_handles:
+                return self._idle_handles.pop()
+        try:
+            return self._create_engine()
+        except OcrBackendError as error:
+            raise CaptchaRecognitionError(str(error)) from error
+
+    def _release(self, handle):
+        with self._handles_lock:
+            if not self._closed:
+                self._idle_handles.append(handle)
+                return
+        self._delete_engine(handle)
+
+    def _run(self, processed_image, page_segmentation_mode, read_result):
+        """Load the image into a pooled handle and return ``read_result``."""
+        image = np.ascontiguousarray(processed_image, dtype=np.uint8)
+        if image.ndim != 2 or image.size == 0:
+            raise CaptchaRecognitionError(
+                "Tesseract requires a non-empty grayscale CAPTCHA image."
+            )
+        handle = self._acquire()
+        try:
+            height, width = image.shape
+            self._library.TessBaseAPISetPageSegMode(
+                handle,
+                page_segmentation_mode,
+            )
+            self._library.TessBaseAPISetImage(
+                handle,
+                image.ctypes.data,
+                width,
+                height,
+                1,
+                image.strides[0],
+            )
+            try:
+                return read_result(handle)
+            finally:
+                self._library.TessBaseAPIClear(handle)
+        finally:
+            self._release(handle)
+
+    def _read_text(self, handle):
+        text_pointer = self._library.TessBaseAPIGetUTF8Text(handle)
+        if not text_pointer:
+            raise CaptchaRecognitionError(
+                "Tesseract did not return text for the CAPTCHA image."
+            )
+        try:
+            text = ctypes.string_at(text_pointer).decode('utf-8', 'replace')
+            confidence = self._library.TessBaseAPIMeanTextConf(handle) / 100
+        finally:
+            self._library.TessDeleteText(text_pointer)
+        return text, confidence
+
+    def _read_words(self, handle):
+        if self._library.TessBaseAPIRecognize(handle, None) != 0:
+            raise CaptchaRecognitionError(
+                "Tesseract could not recognize the CAPTCHA image."
+            )
+        iterator = self._library.TessBaseAPIGetIterator(handle)
+        if not iterator:
+            return []
+        page_iterator = self._library.TessResultIteratorGetPageIterator(
+            iterator
+        )
+        words = []
+        try:
+            while True:
+                text_pointer = self._library.TessResultIteratorGetUTF8Text(
+                    iterator,
+                    TESSERACT_RIL_WORD,
+                )
+                if text_pointer:
+                    try:
+                        text = ctypes.string_at(text_pointer).decode(
+                            'utf-8',
+                            'replace',
+                        )
+                    finally:
+                        self._library.TessDeleteText(text_pointer)
+                    box = text.strip() and self._word_box(page_iterator)
+                    if box:
+                        words.append((text, *box))
+                if not self._library.TessResultIteratorNext(
+                    iterator,
+                    TESSERACT_RIL_WORD,
+                ):
+                    break
+        finally:
+            self._library.TessResultIteratorDelete(iterator)
+        return words
+
+    def _word_box(self, page_iterator):
+        """Return ``(left, top, height)`` of the current word, or None."""
+        left, top, right, bottom = (ctypes.c_int() for _ in range(4))
+        if not self._library.TessPageIteratorBoundingBox(
+            page_iterator,
+            TESSERACT_RIL_WORD,
+            ctypes.byref(left),
+            ctypes.byref(top),
+            ctypes.byref(right),
+            ctypes.byref(bottom),
+        ):
+            return None
+        return left.value, top.value, bottom.value - top.value
+
+    def image_to_string(self, processed_image, page_segmentation_mode):
+        text, _ = self._run(
+            processed_image,
+            page_segmentation_mode,
+            self._read_text,
+        )
+        return text
+
+    def image_to_scored_text(self, processed_image, page_segmentation_mode):
+        """Return the text with Tesseract's mean confidence for the image."""
+        return [
+            self._run(processed_image, page_segmentation_mode, self._read_text)
+        ]
+
+    def image_to_words(self, processed_image, page_segmentation_mode):
+        """Return ``(text, left, top, height)`` for each recognized word."""
+        return self._run(
+            processed_image,
+            page_segmentation_mode,
+            self._read_words,
+        )
+
+    def close(self):
+        """Free idle handles; a handle still in use is freed on release.
+
+        A closed backend refuses further recognitions instead of creating
+        handles that nothing would free.
+        """
+        with self._handles_lock:
+            self._closed = True
+            handles, self._idle_handles = self._idle_handles, []
+        for handle in handles:
+            self._delete_engine(handle)
+
+
+_ocr_backend = PytesseractBackend()
+
+
+def set_ocr_backend(backend):
+    """Select the process-wide OCR backend used by recognize_captcha()."""
+    global _ocr_backend
+    _ocr_backend = backend
+
+
+_captcha_strategies = CAPTCHA_OCR_STRATEGIES
+
+
+def set_captcha_strategies(strategies):
+    """Replace the default OCR strategies, e.g. with a tuned profile.
+
+    Each strategy is ``(name, preprocessing, page_segmentation_mode)``, where
+    ``preprocessing`` is a method name or a PreprocessingSettings.
+    """
+    global _captcha_strategies
+    if not strategies:
+        raise ValueError("At least one CAPTCHA OCR strategy is required.")
+    _captcha_strategies = tuple(strategies)
+
+
+_template_recognizer = None
+
+
+def set_template_recognizer(recognizer):
+    """Install a fast recognizer tried before any Tesseract strategy.
+
+    ``None`` disables it. The recognizer must provide ``name``,
+    ``preprocessing_method``, ``confidence_threshold``, and ``recognize()``.
+    """
+    global _template_recognizer
+    _template_recognizer = recognizer
+
+
+def load_ocr_backend(name, tesseract_library=None):
+    """Create the requested backend; ``auto`` falls back to pytesseract."""
+    if name not in OCR_BACKEND_NAMES:
+        raise ValueError(f"Unsupported OCR backend: {name}")
+    if name == 'pytesseract':
+        return PytesseractBackend()
+    try:
+        if tesseract_library is None:
+            raise OcrBackendError(
+                "No Tesseract library was found next to the executable."
+            )
+        return TesseractApiBackend(
+            tesseract_library.library_path,
+            tesseract_library.tessdata_path,
+        )
+    except OcrBackendError as error:
+        if name != 'auto':
+            raise
+        logging.info(
+            "Resident Tesseract engine unavailable; using pytesseract: %s",
+            error,
+        )
+        return PytesseractBackend()
+
+
 def capture_captcha_bytes(image_element):
     """Return the exact CAPTCHA currently rendered by the Selenium browser."""
     if image_element is None:
@@ -67,6 +560,87 @@ def capture_captcha_bytes(image_element):
     return bytes(image_bytes)
 
 
+# Draw the loaded CAPTCHA over white at the device-pixel size an element
+# screenshot would have, so tuned strategies and the quality gate see the
+# same scale on both paths, and return its grayscale pixels as base64 using
+# the same BT.601 weights as OpenCV.
+_CANVAS_CAPTURE_SCRIPT = """
+const image = arguments[0];
+const box = image.getBoundingClientRect();
+const scale = window.devicePixelRatio || 1;
+const width = Math.round(box.width * scale) || image.naturalWidth;
+const height = Math.round(box.height * scale) || image.naturalHeight;
+const canvas = document.createElement('canvas');
+canvas.width = width;
+canvas.height = height;
+const context = canvas.getContext('2d');
+context.fillStyle = '#ffffff';
+context.fillRect(0, 0, width, height);
+context.drawImage(image, 0, 0, width, height);
+const rgba = context.getImageData(0, 0, width, height).data;
+const gray = new Uint8Array(width * height);
+for (let pixel = 0; pixel < gray.length; pixel += 1) {
+    const offset = pixel * 4;
+    gray[pixel] = Math.round(
+        0.299 * rgba[offset] + 0.587 * rgba[offset + 1] + 0.114 * rgba[offset + 2]
+    );
+}
+let binary = '';
+for (let start = 0; start < gray.length; start += 0x8000) {
+    binary += String.fromCharCode.apply(null, gray.subarray(start, start + 0x8000));
+}
+return [width, height, btoa(binary)];
+"""
+
+
+def capture_captcha_pixels(driver, image_element):
+    """Return the loaded CAPTCHA as grayscale pixels read from a canvas.
+
+    One script call replaces the screenshot and PNG round trip. The image is
+    scaled to its rendered size in device pixels, matching an element
+    screenshot, and a cross-origin image that taints the canvas raises
+    CaptchaCaptureError.
+    """
+    if image_element is None:
+        raise CaptchaCaptureError("The CAPTCHA image element was not available.")
+
+    try:
+        width, height, encoded_pixels = driver.execute_script(
+            _CANVAS_CAPTURE_SCRIPT,
+            image_element,
+        )
+    except WebDriverException as error:
+        raise CaptchaCaptureError(
+            f"Could not read the CAPTCHA pixels from a canvas: {error}"
+        ) from error
+    except (TypeError, ValueError) as error:
+        raise CaptchaCaptureError(
+            "The browser returned malformed CAPTCHA canvas pixels."
+        ) from error
+
+    try:
+        pixels = np.frombuffer(
+            base64.b64decode(encoded_pixels, validate=True),
+            dtype=np.uint8,
+        )
+        image = pixels.reshape(int(height), int(width))
+    except (TypeError, ValueError) as error:
+        raise CaptchaCaptureError(
+            "The browser returned malformed CAPTCHA canvas pixels."
+        ) from error
+    if image.size == 0:
+        raise CaptchaCaptureError("The browser returned an empty CAPTCHA canvas.")
+    return image
+
+
+def encode_captcha_png(image):
+    """Encode a grayscale CAPTCHA as PNG bytes for recorders."""
+    encoded, png = cv2.imencode('.png', image)
+    if not encoded:
+        raise CaptchaRecognitionError("OpenCV could not encode the CAPTCHA image.")
+    return png.tobytes()
+
+
 def decode_captcha_image(image_bytes):
     """Decode PNG bytes directly into a grayscale OpenCV image."""
     try:
@@ -83,35 +657,95 @@ def decode_captcha_image(image_bytes):
     return image
 
 
+def _count_glyph_blobs(ink, image_height):
+    _, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    return int(
+        (
+            stats[1:, cv2.CC_STAT_HEIGHT]
+            >= QUALITY_GLYPH_MIN_HEIGHT_SHARE * image_height
+        ).sum()
+    )
+
+
+def assess_captcha_quality(image):
+    """Return cheap statistics of a decoded grayscale CAPTCHA."""
+    low, high = np.percentile(image, (5, 95))
+    _, binary = cv2.threshold(image, 0, 1, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    # Ink is the minority class, whatever the portal colors are.
+    ink = binary if binary.mean() < 0.5 else 1 - binary
+    glyph_ink = cv2.morphologyEx(
+        ink,
+        cv2.MORPH_OPEN,
+        np.ones(
+            (QUALITY_GLYPH_OPENING_SIZE, QUALITY_GLYPH_OPENING_SIZE),
+            dtype=np.uint8,
+        ),
+    )
+    glyph_blobs = max(
+        _count_glyph_blobs(ink, image.shape[0]),
+        _count_glyph_blobs(glyph_ink, image.shape[0]),
+    )
+    return CaptchaQuality(
+        contrast=float(high - low),
+        ink_ratio=float(ink.mean()),
+        glyph_blobs=glyph_blobs,
+    )
+
+
+def captcha_quality_problem(quality):
+    """Return why a CAPTCHA is predicted unreadable, or None to recognize it."""
+    if quality.contrast < QUALITY_MIN_CONTRAST:
+        return f"contrast={quality.contrast:.0f}"
+    if not QUALITY_INK_RATIO_RANGE[0] <= quality.ink_ratio <= QUALITY_INK_RATIO_RANGE[1]:
+        return f"ink_ratio={quality.ink_ratio:.2f}"
+    if not QUALITY_GLYPH_BLOB_RANGE[0] <= quality.glyph_blobs <= QUALITY_GLYPH_BLOB_RANGE[1]:
+        return f"glyph_blobs={quality.glyph_blobs}"
+    return None
+
+
 def preprocess_captcha(image, method):
-    """Scale and binarize one in-memory CAPTCHA image."""
+    """Scale and binarize one in-memory CAPTCHA image.
+
+    ``method`` is a method name using its default settings, or a
+    PreprocessingSettings from a tuned strategy profile.
+    """
+    settings = (
+        method
+        if isinstance(method, PreprocessingSettings)
+        else DEFAULT_PREPROCESSING_SETTINGS.get(method)
+    )
     try:
+        if settings is None or settings.method not in PREPROCESSING_METHODS:
+            raise ValueError(f"Unsupported CAPTCHA preprocessing method: {method}")
         scaled = cv2.resize(
             image,
             None,
-            fx=CAPTCHA_SCALE_FACTOR,
-            fy=CAPTCHA_SCALE_FACTOR,
+            fx=settings.scale_factor,
+            fy=settings.scale_factor,
             interpolation=cv2.INTER_CUBIC,
         )
-        if method == 'otsu':
+        if settings.blur_kernel:
+            scaled = cv2.GaussianBlur(
+                scaled,
+                (settings.blur_kernel, settings.blur_kernel),
+                0,
+            )
+        if settings.method == 'otsu':
             _, processed = cv2.threshold(
                 scaled,
                 0,
                 255,
                 cv2.THRESH_BINARY + cv2.THRESH_OTSU,
             )
-        elif method == 'adaptive':
-            denoised = cv2.GaussianBlur(scaled, (3, 3), 0)
+        else:
             processed = cv2.adaptiveThreshold(
-                denoised,
+                scaled,
                 255,
                 cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
                 cv2.THRESH_BINARY,
-                31,
-                9,
+                settings.adaptive_block_size,
+                settings.adaptive_c,
             )
-        else:
-            raise ValueError(f"Unsupported CAPTCHA preprocessing method: {method}")
     except cv2.error as error:
         raise CaptchaRecognitionError(
             f"OpenCV could not preprocess the CAPTCHA image: {error}"
@@ -121,29 +755,151 @@ def preprocess_captcha(image, method):
     # background. Normalize the polarity without assuming the portal colors.
     if float(np.mean(processed)) < 127:
         processed = cv2.bitwise_not(processed)
+    if settings.denoise:
+        processed = denoise_captcha(processed, settings.denoise_min_area)
     return np.ascontiguousarray(processed)
 
 
-def recognize_captcha(processed_image, page_segmentation_mode):
+def denoise_captcha(processed_image, min_component_area):
+    """Drop specks and thin lines from a binary CAPTCHA and crop to the text.
+
+    The image must already be dark text on white. If nothing survives the
+    cleanup, the input is returned unchanged rather than an empty image.
+    """
+    ink = (processed_image < 128).astype(np.uint8)
+    kernel = np.ones(
+        (DENOISE_LINE_KERNEL_SIZE, DENOISE_LINE_KERNEL_SIZE),
+        dtype=np.uint8,
+    )
+    ink = cv2.morphologyEx(ink, cv2.MORPH_OPEN, kernel)
+    component_count, labels, stats, _ = cv2.connectedComponentsWithStats(
+        ink,
+        connectivity=8,
+    )
+    keep = stats[:, cv2.CC_STAT_AREA] >= min_component_area
+    keep[0] = False
+    text_mask = keep[labels]
+    if component_count <= 1 or not text_mask.any():
+        return processed_image
+
+    rows = np.flatnonzero(text_mask.any(axis=1))
+    columns = np.flatnonzero(text_mask.any(axis=0))
+    top = max(rows[0] - DENOISE_CROP_MARGIN, 0)
+    bottom = min(rows[-1] + DENOISE_CROP_MARGIN + 1, text_mask.shape[0])
+    left = max(columns[0] - DENOISE_CROP_MARGIN, 0)
+    right = min(columns[-1] + DENOISE_CROP_MARGIN + 1, text_mask.shape[1])
+    cleaned = np.where(text_mask[top:bottom, left:right], 0, 255)
+    return cleaned.astype(np.uint8)
+
+
+def recognize_captcha(processed_image, page_segmentation_mode, backend=None):
     """Return a filtered uppercase alphanumeric CAPTCHA candidate."""
-    config = (
-        f'--oem 3 --psm {page_segmentation_mode} '
-        f'-c tessedit_char_whitelist={CAPTCHA_WHITELIST}'
+    backend = backend or _ocr_backend
+    extracted_text = backend.image_to_string(
+        processed_image,
+        page_segmentation_mode,
     )
-    try:
-        extracted_text = pytesseract.image_to_string(
-            processed_image,
-            config=config,
-        )
-    except (TypeError, ValueError, pytesseract.TesseractError) as error:
-        raise CaptchaRecognitionError(
-            f"Tesseract could not recognize the CAPTCHA image: {error}"
-        ) from error
 
     filtered_text = re.sub(r'[^A-Z0-9]', '', extracted_text.upper()).strip()
     return filtered_text
 
 
+def recognize_captcha_scored(
+    processed_image,
+    page_segmentation_mode,
+    backend=None,
+):
+    """Return a filtered candidate and one 0-1 confidence per character.
+
+    Each character inherits the confidence of the word Tesseract read it in.
+    """
+    backend = backend or _ocr_backend
+    candidate = []
+    confidences = []
+    for text, confidence in backend.image_to_scored_text(
+        processed_image,
+        page_segmentation_mode,
+    ):
+        filtered_text = re.sub(r'[^A-Z0-9]', '', text.upper())
+        candidate.append(filtered_text)
+        confidences.extend([min(max(confidence, 0.0), 1.0)] * len(filtered_text))
+    return ''.join(candidate), tuple(confidences)
+
+
+def stack_captcha_tiles(processed_images):
+    """Stack processed variants vertically on white, separated by blank rows.
+
+    Returns the stacked image and, for each variant, the ``[start, stop)`` row
+    band that owns any word whose vertical center falls inside it.
+    """
+    gap = max(image.shape[0] for image in processed_images) // 2
+    width = max(image.shape[1] for image in processed_images) + 2 * gap
+    height = gap + sum(image.shape[0] + gap for image in processed_images)
+    stacked = np.full((height, width), 255, dtype=np.uint8)
+    row_bands = []
+    top = gap
+    for image in processed_images:
+        stacked[top:top + image.shape[0], gap:gap + image.shape[1]] = image
+        row_bands.append((top - gap // 2, top + image.shape[0] + gap // 2))
+        top += image.shape[0] + gap
+    return stacked, row_bands
+
+
+def recognize_captcha_tiles(processed_images, backend=None):
+    """Return one filtered candidate per variant from a single OCR call."""
+    backend = backend or _ocr_backend
+    stacked, row_bands = stack_captcha_tiles(processed_images)
+    tile_words = [[] for _ in processed_images]
+    for text, left, top, height in backend.image_to_words(
+        stacked,
+        TILED_PAGE_SEGMENTATION_MODE,
+    ):
+        center = top + height / 2
+        for index, (start, stop) in enumerate(row_bands):
+            if start <= center < stop:
+                tile_words[index].append((left, text))
+                break
+    return [
+        re.sub(
+            r'[^A-Z0-9]',
+            '',
+            ''.join(text for _, text in sorted(words)).upper(),
+        )
+        for words in tile_words
+    ]
+
+
+def vote_on_candidates(strategy_results):
+    """Combine format-valid candidates position by position.
+
+    Every character's confidence is a vote for it at its position. A position's
+    combined confidence is the winning vote total divided by the number of
+    voters, so disagreement and low engine confidence both lower it. The
+    candidate's confidence is that of its weakest position.
+    """
+    voters = [
+        result
+        for result in strategy_results
+        if result.format_valid and result.character_confidences
+    ]
+    if not voters:
+        return None, 0.0
+    characters = []
+    position_confidences = []
+    for position in range(CAPTCHA_LENGTH):
+        votes = {}
+        for result in voters:
+            character = result.candidate[position]
+            votes[character] = (
+                votes.get(character, 0.0)
+                + result.character_confidences[position]
+            )
+        character, total = max(votes.items(), key=lambda item: item[1])
+        characters.append(character)
+        position_confidences.append(total / len(voters))
+    return ''.join(characters), min(position_confidences)
+
+
 def _wait_for_captcha_image(driver):
     image_element = safe_find(driver, By.ID, 'imgVerifyCode')
     logging.debug("CAPTCHA image element located.")
@@ -170,59 +926,538 @@ def _wait_for_captcha_image(driver):
     return image_element
 
 
-def get_captcha_text(driver):
-    """Capture and recognize the displayed CAPTCHA without writing files."""
-    started_at = time.monotonic()
-    image_element = _wait_for_captcha_image(driver)
-    image_bytes = capture_captcha_bytes(image_element)
-    image = decode_captcha_image(image_bytes)
+def _run_ocr_strategy(
+    strategy_name,
+    processed_image,
+    page_segmentation_mode,
+    strategy_results,
+):
+    """Run one OCR strategy, record its result, and return it."""
+    attempt_started_at = time.monotonic()
+    candidate = recognize_captcha(processed_image, page_segmentation_mode)
+    result = StrategyResult(
+        strategy=strategy_name,
+        candidate=candidate,
+        format_valid=CAPTCHA_PATTERN.fullmatch(candidate) is not None,
+        elapsed_ms=(time.monotonic() - attempt_started_at) * 1000,
+    )
+    strategy_results.append(result)
     logging.debug(
-        "CAPTCHA capture and decode completed: elapsed_ms=%.1f",
-        (time.monotonic() - started_at) * 1000,
+        "CAPTCHA OCR strategy completed: method=%s, elapsed_ms=%.1f, "
+        "candidate_length=%d, format_valid=%s",
+        strategy_name,
+        result.elapsed_ms,
+        len(candidate),
+        result.format_valid,
     )
-    processed_images = {}
+    return result
+
 
+class _ProcessedImages(dict):
+    """Processed images by preprocessing, with their total preprocessing cost."""
+
+    def __init__(self):
+        super().__init__()
+        self.elapsed_ms = 0.0
+
+
+def _preprocess_once(image, processed_images, preprocessing_method):
+    if preprocessing_method not in processed_images:
+        preprocessing_started_at = time.monotonic()
+        processed_images[preprocessing_method] = preprocess_captcha(
+            image,
+            preprocessing_method,
+        )
+        elapsed_ms = (time.monotonic() - preprocessing_started_at) * 1000
+        processed_images.elapsed_ms += elapsed_ms
+        logging.debug(
+            "CAPTCHA preprocessing completed: method=%s, elapsed_ms=%.1f",
+            preprocessing_method,
+            elapsed_ms,
+        )
+    return processed_images[preprocessing_method]
+
+
+def _recognize_with_template(
+    image,
+    processed_images,
+    recognizer,
+    strategy_results,
+):
+    """Return a confident template result, or None to fall back to OCR."""
+    attempt_started_at = time.monotonic()
+    processed_image = _preprocess_once(
+        image,
+        processed_images,
+        recognizer.preprocessing_method,
+    )
+    try:
+        candidate, confidence = recognizer.recognize(processed_image)
+    except CaptchaRecognitionError as error:
+        logging.debug(
+            "CAPTCHA template strategy could not segment the image: %s",
+            error,
+        )
+        return None
+    result = StrategyResult(
+        strategy=recognizer.name,
+        candidate=candidate,
+        format_valid=CAPTCHA_PATTERN.fullmatch(candidate) is not None,
+        elapsed_ms=(time.monotonic() - attempt_started_at) * 1000,
+        confidence=confidence,
+    )
+    strategy_results.append(result)
+    logging.debug(
+        "CAPTCHA template strategy completed: method=%s, elapsed_ms=%.2f, "
+        "confidence=%.3f, format_valid=%s",
+        recognizer.name,
+        result.elapsed_ms,
+        confidence,
+        result.format_valid,
+    )
+    if result.format_valid and confidence >= recognizer.confidence_threshold:
+        return result
+    return None
+
+
+def _recognize_tiled(image, strategies, processed_images, strategy_results):
+    """Read every distinct preprocessing variant in one OCR call.
+
+    Each variant is named after the first strategy that uses it. Returns the
+    first format-valid candidate in strategy order, or None.
+    """
+    if not hasattr(_ocr_backend, 'image_to_words'):
+        logging.debug(
+            "CAPTCHA tiled OCR skipped: backend=%s has no word boxes.",
+            _ocr_backend.name,
+        )
+        return None
+    tile_names = {}
+    for strategy_name, preprocessing_method, _ in strategies:
+        tile_names.setdefault(
+            preprocessing_method,
+            f'{TILED_STRATEGY_PREFIX}{strategy_name}',
+        )
+    processed_tiles = [
+        _preprocess_once(image, processed_images, preprocessing_method)
+        for preprocessing_method in tile_names
+    ]
+    attempt_started_at = time.monotonic()
+    candidates = recognize_captcha_tiles(processed_tiles)
+    # One call recognized every tile, so each result carries an equal share.
+    elapsed_ms = (time.monotonic() - attempt_started_at) * 1000 / len(candidates)
+    logging.debug(
+        "CAPTCHA tiled OCR completed: tiles=%d, elapsed_ms=%.1f",
+        len(candidates),
+        elapsed_ms * len(candidates),
+    )
+
+    selected = None
+    for strategy_name, candidate in zip(tile_names.values(), candidates):
+        result = StrategyResult(
+            strategy=strategy_name,
+            candidate=candidate,
+            format_valid=CAPTCHA_PATTERN.fullmatch(candidate) is not None,
+            elapsed_ms=elapsed_ms,
+        )
+        strategy_results.append(result)
+        logging.debug(
+            "CAPTCHA tiled OCR result: method=%s, candidate_length=%d, "
+            "format_valid=%s",
+            strategy_name,
+            len(candidate),
+            result.format_valid,
+        )
+        if selected is None and result.format_valid:
+            selected = result
+    return selected
+
+
+def _recognize_sequentially(image, strategies, processed_images, strategy_results):
     for strategy_name, preprocessing_method, page_segmentation_mode in (
-        CAPTCHA_OCR_STRATEGIES
+        strategies
     ):
-        if preprocessing_method not in processed_images:
-            preprocessing_started_at = time.monotonic()
-            processed_images[preprocessing_method] = preprocess_captcha(
-                image,
-                preprocessing_method,
+        processed_image = _preprocess_once(
+            image,
+            processed_images,
+            preprocessing_method,
+        )
+        result = _run_ocr_strategy(
+            strategy_name,
+            processed_image,
+            page_segmentation_mode,
+            strategy_results,
+        )
+        if result.format_valid:
+            return result
+    return None
+
+
+def _recognize_concurrently(
+    image,
+    strategies,
+    max_workers,
+    processed_images,
+    strategy_results,
+):
+    """Return the first format-valid result from a bounded thread pool.
+
+    Preprocessing happens once on the calling thread. Strategies that have not
+    started are cancelled after a winner is found; a Tesseract process that is
+    already running is left to finish in the background.
+    """
+    for _, preprocessing_method, _ in strategies:
+        _preprocess_once(image, processed_images, preprocessing_method)
+
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix='captcha-ocr',
+    )
+    try:
+        pending = {
+            executor.submit(
+                _run_ocr_strategy,
+                strategy_name,
+                processed_images[preprocessing_method],
+                page_segmentation_mode,
+                strategy_results,
             )
-            logging.debug(
-                "CAPTCHA preprocessing completed: method=%s, elapsed_ms=%.1f",
-                preprocessing_method,
-                (time.monotonic() - preprocessing_started_at) * 1000,
+            for strategy_name, preprocessing_method, page_segmentation_mode in (
+                strategies
             )
-        attempt_started_at = time.monotonic()
-        candidate = recognize_captcha(
+        }
+        while pending:
+            completed, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in completed:
+                result = future.result()
+                if result.format_valid:
+                    return result
+        return None
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_scored_ocr_strategy(
+    strategy_name,
+    processed_image,
+    page_segmentation_mode,
+    strategy_results,
+):
+    attempt_started_at = time.monotonic()
+    candidate, character_confidences = recognize_captcha_scored(
+        processed_image,
+        page_segmentation_mode,
+    )
+    result = StrategyResult(
+        strategy=strategy_name,
+        candidate=candidate,
+        format_valid=CAPTCHA_PATTERN.fullmatch(candidate) is not None,
+        elapsed_ms=(time.monotonic() - attempt_started_at) * 1000,
+        confidence=min(character_confidences, default=0.0),
+        character_confidences=character_confidences,
+    )
+    strategy_results.append(result)
+    logging.debug(
+        "CAPTCHA OCR strategy completed: method=%s, elapsed_ms=%.1f, "
+        "candidate_length=%d, format_valid=%s, confidence=%.2f",
+        strategy_name,
+        result.elapsed_ms,
+        len(candidate),
+        result.format_valid,
+        result.confidence,
+    )
+    return result
+
+
+def _recognize_by_consensus(
+    image,
+    strategies,
+    max_workers,
+    processed_images,
+    strategy_results,
+    threshold,
+):
+    """Run every strategy and submit only a sufficiently confident vote."""
+    started_at = time.monotonic()
+    if _template_recognizer is not None:
+        processed_image = _preprocess_once(
+            image,
+            processed_images,
+            _template_recognizer.preprocessing_method,
+        )
+        try:
+            candidate, scores = _template_recognizer.recognize_with_scores(
+                processed_image
+            )
+        except CaptchaRecognitionError:
+            pass
+        else:
+            strategy_results.append(
+                StrategyResult(
+                    strategy=_template_recognizer.name,
+                    candidate=candidate,
+                    format_valid=CAPTCHA_PATTERN.fullmatch(candidate) is not None,
+                    elapsed_ms=(time.monotonic() - started_at) * 1000,
+                    confidence=min(scores),
+                    character_confidences=tuple(
+                        min(max(score, 0.0), 1.0) for score in scores
+                    ),
+                )
+            )
+
+    for _, preprocessing_method, _ in strategies:
+        _preprocess_once(image, processed_images, preprocessing_method)
+    strategy_arguments = [
+        (
+            strategy_name,
             processed_images[preprocessing_method],
             page_segmentation_mode,
+            strategy_results,
         )
-        is_valid = CAPTCHA_PATTERN.fullmatch(candidate) is not None
-        logging.debug(
-            "CAPTCHA OCR strategy completed: method=%s, elapsed_ms=%.1f, "
-            "candidate_length=%d, format_valid=%s",
-            strategy_name,
-            (time.monotonic() - attempt_started_at) * 1000,
-            len(candidate),
-            is_valid,
+        for strategy_name, preprocessing_method, page_segmentation_mode in (
+            strategies
         )
-        if is_valid:
+    ]
+    if max_workers == 1:
+        for arguments in strategy_arguments:
+            _run_scored_ocr_strategy(*arguments)
+    else:
+        with ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='captcha-ocr',
+        ) as executor:
+            for future in [
+                executor.submit(_run_scored_ocr_strategy, *arguments)
+                for arguments in strategy_arguments
+            ]:
+                future.result()
+
+    candidate, confidence = vote_on_candidates(strategy_results)
+    logging.debug(
+        "CAPTCHA consensus completed: voters=%d, confidence=%.2f, "
+        "threshold=%.2f",
+        sum(result.format_valid for result in strategy_results),
+        confidence,
+        threshold,
+    )
+    if candidate is None or confidence < threshold:
+        return None
+    return StrategyResult(
+        strategy=CONSENSUS_STRATEGY_NAME,
+        candidate=candidate,
+        format_valid=True,
+        elapsed_ms=(time.monotonic() - started_at) * 1000,
+        confidence=confidence,
+    )
+
+
+def _capture_captcha_image(driver, image_element, capture_method, timings):
+    """Return the grayscale CAPTCHA and its PNG bytes, when already encoded."""
+    started_at = time.monotonic()
+    if capture_method == 'canvas':
+        try:
+            image = capture_captcha_pixels(driver, image_element)
+        except CaptchaCaptureError as error:
             logging.debug(
-                "CAPTCHA recognition selected method=%s, total_elapsed_ms=%.1f",
-                strategy_name,
-                (time.monotonic() - started_at) * 1000,
+                "Canvas CAPTCHA capture failed; using a screenshot: %s",
+                format_exception_summary(error),
             )
-            return candidate
+        else:
+            # The canvas script returns decoded pixels.
+            timings['capture_ms'] = (time.monotonic() - started_at) * 1000
+            timings['decode_ms'] = 0.0
+            return image, None
+    image_bytes = capture_captcha_bytes(image_element)
+    decode_started_at = time.monotonic()
+    timings['capture_ms'] = (decode_started_at - started_at) * 1000
+    image = decode_captcha_image(image_bytes)
+    timings['decode_ms'] = (time.monotonic() - decode_started_at) * 1000
+    return image, image_bytes
+
+
+@dataclass(frozen=True)
+class CapturedCaptcha:
+    image: np.ndarray
+    # PNG bytes when the capture path produced them; recorders encode lazily.
+    image_bytes: Optional[bytes]
+    started_at: float
+
+
+def capture_captcha(driver, capture_method='screenshot', timings=None):
+    """Wait for the displayed CAPTCHA and capture it as a grayscale image.
+
+    This is the only part of reading a CAPTCHA that uses the driver, so
+    recognize_captured_captcha() may run on another thread. An optional
+    ``timings`` dict receives ``image_wait_ms``, ``capture_ms``, and
+    ``decode_ms``.
+    """
+    if capture_method not in CAPTCHA_CAPTURE_METHODS:
+        raise ValueError(f"Unknown CAPTCHA capture method: {capture_method}")
+    timings = {} if timings is None else timings
+    started_at = time.monotonic()
+    image_element = _wait_for_captcha_image(driver)
+    timings['image_wait_ms'] = (time.monotonic() - started_at) * 1000
+    image, image_bytes = _capture_captcha_image(
+        driver,
+        image_element,
+        capture_method,
+        timings,
+    )
+    logging.debug(
+        "CAPTCHA capture and decode completed: elapsed_ms=%.1f",
+        (time.monotonic() - started_at) * 1000,
+    )
+    return CapturedCaptcha(image, image_bytes, started_at)
+
+
+def recognize_captured_captcha(
+    captured,
+    max_workers=1,
+    recorders=(),
+    strategy_statistics=None,
+    consensus_threshold=None,
+    tiled=False,
+    quality_gate=False,
+    timings=None,
+):
+    """Recognize a captured CAPTCHA; see get_captcha_text() for the options.
+
+    An optional ``timings`` dict receives ``preprocess_ms`` and ``ocr_ms``,
+    where OCR covers all recognition work after preprocessing.
+    """
+    if max_workers <= 0:
+        raise ValueError("max_workers must be greater than zero.")
+    timings = {} if timings is None else timings
+    image = captured.image
+    image_bytes = captured.image_bytes
+    started_at = captured.started_at
+    if quality_gate:
+        quality_problem = captcha_quality_problem(assess_captcha_quality(image))
+        if quality_problem is not None:
+            if recorders and image_bytes is None:
+                image_bytes = encode_captcha_png(image)
+            for recorder in recorders:
+                recorder.record_capture(image_bytes, None, [])
+            raise CaptchaRecognitionError(
+                f"CAPTCHA quality gate skipped an unreadable image: "
+                f"{quality_problem}."
+            )
+
+    recognition_started_at = time.monotonic()
+    strategies = _captcha_strategies
+    if strategy_statistics is not None:
+        strategies = strategy_statistics.order_strategies(strategies)
+    processed_images = _ProcessedImages()
+    strategy_results = []
+    selected = None
+    if consensus_threshold is not None:
+        selected = _recognize_by_consensus(
+            image,
+            strategies,
+            min(max_workers, len(strategies)),
+            processed_images,
+            strategy_results,
+            consensus_threshold,
+        )
+    elif _template_recognizer is not None:
+        selected = _recognize_with_template(
+            image,
+            processed_images,
+            _template_recognizer,
+            strategy_results,
+        )
+    if consensus_threshold is None and selected is None and tiled:
+        selected = _recognize_tiled(
+            image,
+            strategies,
+            processed_images,
+            strategy_results,
+        )
+    if consensus_threshold is None and selected is None and max_workers == 1:
+        selected = _recognize_sequentially(
+            image,
+            strategies,
+            processed_images,
+            strategy_results,
+        )
+    elif consensus_threshold is None and selected is None:
+        selected = _recognize_concurrently(
+            image,
+            strategies,
+            min(max_workers, len(strategies)),
+            processed_images,
+            strategy_results,
+        )
+    timings['preprocess_ms'] = processed_images.elapsed_ms
+    timings['ocr_ms'] = (
+        (time.monotonic() - recognition_started_at) * 1000
+        - processed_images.elapsed_ms
+    )
+    if recorders and image_bytes is None:
+        image_bytes = encode_captcha_png(image)
+    for recorder in recorders:
+        recorder.record_capture(image_bytes, selected, list(strategy_results))
+    if selected is not None:
+        logging.debug(
+            "CAPTCHA recognition selected method=%s, total_elapsed_ms=%.1f",
+            selected.strategy,
+            (time.monotonic() - started_at) * 1000,
+        )
+        return selected.candidate
 
     logging.debug(
         "CAPTCHA recognition exhausted all strategies: total_elapsed_ms=%.1f",
         (time.monotonic() - started_at) * 1000,
     )
+    if consensus_threshold is not None:
+        raise CaptchaRecognitionError(
+            "CAPTCHA strategies did not agree with a combined confidence of "
+            f"at least {consensus_threshold:.2f}."
+        )
     raise CaptchaRecognitionError(
         f"Tesseract did not produce an exact {CAPTCHA_LENGTH}-character "
         "uppercase alphanumeric CAPTCHA candidate."
     )
+
+
+def get_captcha_text(
+    driver,
+    max_workers=1,
+    recorders=(),
+    strategy_statistics=None,
+    consensus_threshold=None,
+    capture_method='screenshot',
+    tiled=False,
+    quality_gate=False,
+    timings=None,
+):
+    """Capture and recognize the displayed CAPTCHA.
+
+    With ``max_workers`` greater than one, the OCR strategies run concurrently
+    and the first format-valid candidate wins instead of the first in order.
+    ``strategy_statistics`` may reorder or skip strategies from past results.
+    With a ``consensus_threshold``, every strategy runs and the candidates are
+    combined by a confidence-weighted vote; a vote below the threshold raises
+    a retryable error so a new CAPTCHA is requested instead of submitted.
+    With ``tiled``, the distinct preprocessing variants are stacked into one
+    image and read by a single OCR call before any per-strategy fallback.
+    With ``quality_gate``, an image predicted unreadable by
+    captcha_quality_problem() is rejected before any OCR strategy runs.
+    ``capture_method='canvas'`` reads the pixels in-page and falls back to
+    the element screenshot when the canvas cannot be read.
+    Each of the opt-in ``recorders`` receives the captured PNG and every
+    strategy result; nothing is written to disk without one. An optional
+    ``timings`` dict receives the duration of each stage in milliseconds.
+    """
+    if max_workers <= 0:
+        raise ValueError("max_workers must be greater than zero.")
+    return recognize_captured_captcha(
+        capture_captcha(driver, capture_method, timings),
+        max_workers=max_workers,
+        recorders=recorders,
+        strategy_statistics=strategy_statistics,
+        consensus_threshold=consensus_threshold,
+        tiled=tiled,
+        quality_gate=quality_gate,
+        timings=timings,
+    )
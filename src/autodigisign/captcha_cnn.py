@@ -0,0 +1,407 @@
+import logging
+from pathlib import Path
+
+import cv2
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from autodigisign.captcha import (
+    CAPTCHA_LENGTH,
+    CAPTCHA_PATTERN,
+    CAPTCHA_WHITELIST,
+    CaptchaRecognitionError,
+)
+
+
+CAPTCHA_CNN_FORMAT_VERSION = 1
+CAPTCHA_CNN_INPUT_SHAPE = (32, 96)
+CAPTCHA_CNN_FILTERS = (8, 16)
+# A fixed-position model is only trusted without Tesseract when every one of
+# the six characters is this probable.
+CNN_CONFIDENCE_THRESHOLD = 0.9
+ADAM_BETAS = (0.9, 0.999)
+ADAM_EPSILON = 1e-8
+
+
+class CaptchaModelError(ValueError):
+    """A CAPTCHA model file is missing, malformed, or from another version."""
+
+
+def prepare_cnn_input(processed_image):
+    """Resize a dark-on-light binary CAPTCHA to the model's ink-is-one input."""
+    height, width = CAPTCHA_CNN_INPUT_SHAPE
+    resized = cv2.resize(
+        np.asarray(processed_image),
+        (width, height),
+        interpolation=cv2.INTER_AREA,
+    )
+    return 1.0 - resized.astype(np.float32) / 255.0
+
+
+def _conv_columns(inputs):
+    """Return 3x3, padding-1 patches as ``(N * H * W, C * 9)`` rows."""
+    batch, channels, height, width = inputs.shape
+    padded = np.pad(inputs, ((0, 0), (0, 0), (1, 1), (1, 1)))
+    windows = sliding_window_view(padded, (3, 3), axis=(2, 3))
+    return np.ascontiguousarray(windows.transpose(0, 2, 3, 1, 4, 5)).reshape(
+        batch * height * width,
+        channels * 9,
+    )
+
+
+def _conv_forward(inputs, weights, bias):
+    batch, _, height, width = inputs.shape
+    columns = _conv_columns(inputs)
+    outputs = columns @ weights.T + bias
+    return (
+        outputs.reshape(batch, height, width, -1).transpose(0, 3, 1, 2),
+        columns,
+    )
+
+
+def _conv_backward(output_gradient, columns, weights, input_shape):
+    batch, channels, height, width = input_shape
+    flat_gradient = output_gradient.transpose(0, 2, 3, 1).reshape(
+        -1,
+        weights.shape[0],
+    )
+    weight_gradient = flat_gradient.T @ columns
+    bias_gradient = flat_gradient.sum(axis=0)
+    column_gradient = (flat_gradient @ weights).reshape(
+        batch,
+        height,
+        width,
+        channels,
+        3,
+        3,
+    )
+    padded_gradient = np.zeros(
+        (batch, channels, height + 2, width + 2),
+        dtype=output_gradient.dtype,
+    )
+    for row in range(3):
+        for column in range(3):
+            padded_gradient[:, :, row:row + height, column:column + width] += (
+                column_gradient[:, :, :, :, row, column].transpose(0, 3, 1, 2)
+            )
+    return padded_gradient[:, :, 1:-1, 1:-1], weight_gradient, bias_gradient
+
+
+def _pool_forward(inputs):
+    batch, channels, height, width = inputs.shape
+    blocks = inputs.reshape(batch, channels, height // 2, 2, width // 2, 2)
+    return blocks.max(axis=(3, 5))
+
+
+def _pool_backward(output_gradient, inputs, outputs):
+    upsampled = outputs.repeat(2, axis=2).repeat(2, axis=3)
+    mask = inputs == upsampled
+    return mask * output_gradient.repeat(2, axis=2).repeat(2, axis=3)
+
+
+def _softmax(logits):
+    shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+
+class CaptchaCnn:
+    """Two 3x3 convolution blocks and one dense layer per character position.
+
+    Inference is plain NumPy. ``loss_and_gradients`` supports training in
+    the same module, so no ML runtime is needed at sign time or in training.
+    """
+
+    def __init__(self, parameters):
+        self.parameters = {
+            name: np.asarray(value, dtype=np.float32)
+            for name, value in parameters.items()
+        }
+
+    @classmethod
+    def initialize(cls, random_generator=None):
+        """Return an untrained model with He-initialized weights."""
+        random_generator = random_generator or np.random.default_rng()
+        first_filters, second_filters = CAPTCHA_CNN_FILTERS
+        height, width = CAPTCHA_CNN_INPUT_SHAPE
+        dense_inputs = second_filters * (height // 4) * (width // 4)
+        dense_outputs = CAPTCHA_LENGTH * len(CAPTCHA_WHITELIST)
+
+        def he(fan_in, shape):
+            return random_generator.normal(0, np.sqrt(2 / fan_in), shape)
+
+        return cls(
+            {
+                'conv1_w': he(9, (first_filters, 9)),
+                'conv1_b': np.zeros(first_filters),
+                'conv2_w': he(first_filters * 9, (second_filters, first_filters * 9)),
+                'conv2_b': np.zeros(second_filters),
+                'dense_w': he(dense_inputs, (dense_inputs, dense_outputs)),
+                'dense_b': np.zeros(dense_outputs),
+            }
+        )
+
+    def _forward(self, inputs):
+        parameters = self.parameters
+        inputs = inputs[:, np.newaxis].astype(np.float32)
+        conv1, conv1_columns = _conv_forward(
+            inputs,
+            parameters['conv1_w'],
+            parameters['conv1_b'],
+        )
+        relu1 = np.maximum(conv1, 0)
+        pool1 = _pool_forward(relu1)
+        conv2, conv2_columns = _conv_forward(
+            pool1,
+            parameters['conv2_w'],
+            parameters['conv2_b'],
+        )
+        relu2 = np.maximum(conv2, 0)
+        pool2 = _pool_forward(relu2)
+        features = pool2.reshape(len(inputs), -1)
+        logits = features @ parameters['dense_w'] + parameters['dense_b']
+        cache = (
+            inputs,
+            conv1,
+            conv1_columns,
+            relu1,
+            pool1,
+            conv2,
+            conv2_columns,
+            relu2,
+            pool2,
+            features,
+        )
+        return (
+            logits.reshape(len(inputs), CAPTCHA_LENGTH, len(CAPTCHA_WHITELIST)),
+            cache,
+        )
+
+    def predict_probabilities(self, inputs):
+        """Return ``(N, 6, 36)`` class probabilities for prepared inputs."""
+        logits, _ = self._forward(np.asarray(inputs))
+        return _softmax(logits)
+
+    def loss_and_gradients(self, inputs, targets):
+        """Return mean cross-entropy and parameter gradients for one batch."""
+        logits, cache = self._forward(inputs)
+        (
+            inputs,
+            conv1,
+            conv1_columns,
+            relu1,
+            pool1,
+            conv2,
+            conv2_columns,
+            relu2,
+            pool2,
+            features,
+        ) = cache
+        batch = len(inputs)
+        probabilities = _softmax(logits)
+        picked = np.take_along_axis(probabilities, targets[..., np.newaxis], -1)
+        loss = float(-np.log(picked + 1e-12).mean())
+
+        logit_gradient = probabilities
+        np.put_along_axis(
+            logit_gradient,
+            targets[..., np.newaxis],
+            np.take_along_axis(logit_gradient, targets[..., np.newaxis], -1) - 1,
+            -1,
+        )
+        logit_gradient = logit_gradient.reshape(batch, -1) / (batch * CAPTCHA_LENGTH)
+
+        gradients = {
+            'dense_w': features.T @ logit_gradient,
+            'dense_b': logit_gradient.sum(axis=0),
+        }
+        pool2_gradient = (logit_gradient @ self.parameters['dense_w'].T).reshape(
+            pool2.shape
+        )
+        conv2_gradient = _pool_backward(pool2_gradient, relu2, pool2) * (conv2 > 0)
+        pool1_gradient, gradients['conv2_w'], gradients['conv2_b'] = _conv_backward(
+            conv2_gradient,
+            conv2_columns,
+            self.parameters['conv2_w'],
+            pool1.shape,
+        )
+        conv1_gradient = _pool_backward(pool1_gradient, relu1, pool1) * (conv1 > 0)
+        _, gradients['conv1_w'], gradients['conv1_b'] = _conv_backward(
+            conv1_gradient,
+            conv1_columns,
+            self.parameters['conv1_w'],
+            inputs.shape,
+        )
+        return loss, gradients
+
+
+def encode_labels(labels):
+    """Convert six-character labels to ``(N, 6)`` class indices."""
+    return np.array(
+        [[CAPTCHA_WHITELIST.index(character) for character in label] for label in labels],
+        dtype=np.intp,
+    )
+
+
+def _shift_batch(inputs, random_generator, max_shift=2):
+    """Translate each image by a few pixels so position jitter is learned."""
+    shifted = np.empty_like(inputs)
+    for index, image in enumerate(inputs):
+        row_shift, column_shift = random_generator.integers(
+            -max_shift,
+            max_shift + 1,
+            2,
+        )
+        shifted[index] = np.roll(image, (row_shift, column_shift), axis=(0, 1))
+    return shifted
+
+
+def evaluate_captcha_cnn(model, inputs, labels):
+    """Return the share of samples whose six characters are all correct."""
+    probabilities = model.predict_probabilities(inputs)
+    return float((probabilities.argmax(axis=-1) == encode_labels(labels)).all(axis=1).mean())
+
+
+def train_captcha_cnn(
+    processed_images,
+    labels,
+    epochs=30,
+    batch_size=64,
+    learning_rate=2e-3,
+    validation_share=0.1,
+    seed=None,
+):
+    """Fit a CaptchaCnn with Adam on labelled, preprocessed CAPTCHAs.
+
+    Returns the model and one ``(epoch, loss, validation_accuracy)`` tuple per
+    epoch. Samples whose label is not six allowed characters are ignored.
+    """
+    pairs = [
+        (prepare_cnn_input(image), label)
+        for image, label in zip(processed_images, labels)
+        if label and CAPTCHA_PATTERN.fullmatch(label)
+    ]
+    if len(pairs) < 2:
+        raise ValueError("CNN training requires at least two labelled CAPTCHAs.")
+    random_generator = np.random.default_rng(seed)
+    order = random_generator.permutation(len(pairs))
+    inputs = np.stack([pairs[index][0] for index in order])
+    label_list = [pairs[index][1] for index in order]
+    validation_count = max(int(len(pairs) * validation_share), 1)
+    training_inputs = inputs[validation_count:]
+    training_targets = encode_labels(label_list[validation_count:])
+    validation_inputs = inputs[:validation_count]
+    validation_labels = label_list[:validation_count]
+
+    model = CaptchaCnn.initialize(random_generator)
+    first_moments = {name: np.zeros_like(value) for name, value in model.parameters.items()}
+    second_moments = {name: np.zeros_like(value) for name, value in model.parameters.items()}
+    step = 0
+    history = []
+    for epoch in range(1, epochs + 1):
+        epoch_order = random_generator.permutation(len(training_inputs))
+        losses = []
+        for start in range(0, len(epoch_order), batch_size):
+            batch = epoch_order[start:start + batch_size]
+            loss, gradients = model.loss_and_gradients(
+                _shift_batch(training_inputs[batch], random_generator),
+                training_targets[batch],
+            )
+            losses.append(loss)
+            step += 1
+            for name, gradient in gradients.items():
+                first_moments[name] = (
+                    ADAM_BETAS[0] * first_moments[name]
+                    + (1 - ADAM_BETAS[0]) * gradient
+                )
+                second_moments[name] = (
+                    ADAM_BETAS[1] * second_moments[name]
+                    + (1 - ADAM_BETAS[1]) * gradient ** 2
+                )
+                corrected_first = first_moments[name] / (1 - ADAM_BETAS[0] ** step)
+                corrected_second = second_moments[name] / (1 - ADAM_BETAS[1] ** step)
+                model.parameters[name] -= (
+                    learning_rate
+                    * corrected_first
+                    / (np.sqrt(corrected_second) + ADAM_EPSILON)
+                ).astype(np.float32)
+        validation_accuracy = evaluate_captcha_cnn(
+            model,
+            validation_inputs,
+            validation_labels,
+        )
+        history.append((epoch, float(np.mean(losses)), validation_accuracy))
+        logging.info(
+            "CAPTCHA CNN epoch %d: loss=%.4f, validation_accuracy=%.3f",
+            epoch,
+            history[-1][1],
+            validation_accuracy,
+        )
+    return model, history
+
+
+def save_captcha_cnn(model, model_path):
+    model_path = Path(model_path)
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    with model_path.open('wb') as model_file:
+        np.savez_compressed(
+            model_file,
+            version=np.array(CAPTCHA_CNN_FORMAT_VERSION),
+            **model.parameters,
+        )
+
+
+def load_captcha_cnn(model_path):
+    expected_shapes = {
+        name: value.shape
+        for name, value in CaptchaCnn.initialize(np.random.default_rng(0)).parameters.items()
+    }
+    try:
+        with np.load(Path(model_path), allow_pickle=False) as model_data:
+            if int(model_data['version']) != CAPTCHA_CNN_FORMAT_VERSION:
+                raise CaptchaModelError(
+                    f"Unsupported CAPTCHA model version in {model_path}."
+                )
+            parameters = {name: model_data[name] for name in expected_shapes}
+    except (OSError, KeyError, ValueError) as error:
+        if isinstance(error, CaptchaModelError):
+            raise
+        raise CaptchaModelError(
+            f"Could not read CAPTCHA model {model_path}: {error}"
+        ) from error
+    for name, shape in expected_shapes.items():
+        if parameters[name].shape != shape:
+            raise CaptchaModelError(
+                f"CAPTCHA model {model_path} has an unexpected {name} shape."
+            )
+    return CaptchaCnn(parameters)
+
+
+class CnnRecognizer:
+    """Recognize all six CAPTCHA positions with one NumPy CNN forward pass."""
+
+    name = 'otsu-cnn'
+    preprocessing_method = 'otsu'
+
+    def __init__(self, model, confidence_threshold=CNN_CONFIDENCE_THRESHOLD):
+        self.model = model
+        self.confidence_threshold = confidence_threshold
+
+    def recognize_with_scores(self, processed_image):
+        """Return the candidate and the probability of every character."""
+        try:
+            probabilities = self.model.predict_probabilities(
+                prepare_cnn_input(processed_image)[np.newaxis]
+            )[0]
+        except cv2.error as error:
+            raise CaptchaRecognitionError(
+                f"The CAPTCHA model could not read the image: {error}"
+            ) from error
+        classes = probabilities.argmax(axis=-1)
+        text = ''.join(CAPTCHA_WHITELIST[index] for index in classes)
+        scores = probabilities[np.arange(CAPTCHA_LENGTH), classes]
+        return text, tuple(float(score) for score in scores)
+
+    def recognize(self, processed_image):
+        """Return the candidate and the probability of its weakest character."""
+        text, scores = self.recognize_with_scores(processed_image)
+        return text, min(scores)
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+from autodigisign.file_helpers import write_atomically
+from autodigisign.logging_config import format_exception_summary
+from autodigisign.portal import LOGIN_REJECTED, LOGIN_SUCCEEDED
+
+
+CAPTCHA_CORPUS_FORMAT_VERSION = 1
+CAPTCHA_CORPUS_DIRECTORY = Path('outputs') / 'captcha_corpus'
+OUTCOME_UNRECOGNIZED = 'unrecognized'
+
+
+def sample_identifier(image_bytes):
+    """Return the content address of one captured CAPTCHA PNG."""
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def iter_corpus_samples(corpus_directory):
+    """Yield ``(png_path, metadata)`` for every sample in a corpus."""
+    for metadata_path in sorted(Path(corpus_directory).glob('*/*.json')):
+        image_path = metadata_path.with_suffix('.png')
+        if not image_path.is_file():
+            continue
+        try:
+            metadata = json.loads(metadata_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as error:
+            logging.warning(
+                "Skipping unreadable CAPTCHA corpus metadata %s: %s",
+                metadata_path.name,
+                format_exception_summary(error),
+            )
+            continue
+        yield image_path, metadata
+
+
+class CaptchaCorpus:
+    """Opt-in, content-addressed store of real portal CAPTCHAs.
+
+    Each PNG is stored once as ``<id[:2]>/<id>.png``. Its JSON sidecar keeps
+    every observation of that image: the selected candidate and strategy, the
+    per-strategy results, and the login outcome reported later. A candidate
+    accepted by the portal becomes the sample's ``label``.
+    """
+
+    def __init__(self, corpus_directory):
+        self.corpus_directory = Path(corpus_directory)
+        self._pending = None
+        self._lock = threading.Lock()
+
+    def _paths(self, identifier):
+        sample_directory = self.corpus_directory / identifier[:2]
+        return (
+            sample_directory / f'{identifier}.png',
+            sample_directory / f'{identifier}.json',
+        )
+
+    def _load_metadata(self, identifier, metadata_path):
+        if metadata_path.is_file():
+            return json.loads(metadata_path.read_text(encoding='utf-8'))
+        return {
+            'format_version': CAPTCHA_CORPUS_FORMAT_VERSION,
+            'sample_id': identifier,
+            'label': None,
+            'rejected_candidates': [],
+            'observations': [],
+        }
+
+    def _update(self, identifier, update):
+        _, metadata_path = self._paths(identifier)
+        try:
+            metadata = self._load_metadata(identifier, metadata_path)
+            update(metadata)
+            write_atomically(
+                metadata_path,
+                json.dumps(metadata, ensure_ascii=False, indent=2).encode(
+                    'utf-8'
+                ),
+            )
+        except (OSError, ValueError) as error:
+            logging.warning(
+                "Could not update the CAPTCHA corpus: %s",
+                format_exception_summary(error),
+            )
+
+    def record_capture(self, image_bytes, selected_result, strategy_results):
+        """Store one captured PNG and the recognition that produced a guess."""
+        identifier = sample_identifier(image_bytes)
+        image_path, _ = self._paths(identifier)
+        observation = {
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'candidate': getattr(selected_result, 'candidate', None),
+            'strategy': getattr(selected_result, 'strategy', None),
+            'strategy_results': [asdict(result) for result in strategy_results],
+            'outcome': OUTCOME_UNRECOGNIZED if selected_result is None else None,
+        }
+        with self._lock:
+            try:
+                image_path.parent.mkdir(parents=True, exist_ok=True)
+                if not image_path.is_file():
+                    write_atomically(image_path, bytes(image_bytes))
+            except OSError as error:
+                logging.warning(
+                    "Could not store a CAPTCHA corpus image: %s",
+                    format_exception_summary(error),
+                )
+                self._pending = None
+                return None
+            self._update(
+                identifier,
+                lambda metadata: metadata['observations'].append(observation),
+            )
+            self._pending = None if selected_result is None else identifier
+        logging.debug("CAPTCHA corpus sample recorded: sample=%s", identifier[:12])
+        return identifier
+
+    def record_outcome(self, outcome):
+        """Attach the portal's response to the most recent submitted guess."""
+        with self._lock:
+            identifier, self._pending = self._pending, None
+            if identifier is None:
+                return
+
+            def apply_outcome(metadata):
+                observation = metadata['observations'][-1]
+                observation['outcome'] = outcome
+                candidate = observation['candidate']
+                if outcome == LOGIN_SUCCEEDED:
+                    metadata['label'] = candidate
+                elif (
+                    outcome == LOGIN_REJECTED
+                    and candidate not in metadata['rejected_candidates']
+                ):
+                    metadata['rejected_candidates'].append(candidate)
+
+            self._update(identifier, apply_outcome)
@@ -0,0 +1,190 @@
+import json
+import logging
+import random
+import threading
+from pathlib import Path
+
+from autodigisign.captcha import CONSENSUS_STRATEGY_NAME, TILED_STRATEGY_PREFIX
+from autodigisign.file_helpers import write_atomically
+from autodigisign.logging_config import format_exception_summary
+from autodigisign.portal import LOGIN_REJECTED, LOGIN_SUCCEEDED
+
+
+CAPTCHA_STATISTICS_FORMAT_VERSION = 1
+CAPTCHA_STATISTICS_PATH = Path('outputs') / 'captcha_strategy_stats.json'
+# Share of recognitions that try a random order, including skipped strategies,
+# so that a strategy that started badly can still recover its ranking.
+EXPLORATION_RATE = 0.1
+# A strategy is skipped outside exploration once it has this many runs and
+# still rarely produces a six-character candidate.
+SKIP_MINIMUM_RUNS = 20
+SKIP_MAXIMUM_FORMAT_VALID_RATE = 0.05
+OUTCOME_COUNTS = {LOGIN_SUCCEEDED: 'accepted', LOGIN_REJECTED: 'rejected'}
+
+
+def _strategy_key(strategy_name):
+    """Return the configured strategy a tiled OCR result stands for."""
+    return strategy_name.removeprefix(TILED_STRATEGY_PREFIX)
+
+
+def _submitting_strategies(selected_result, strategy_results):
+    """Return the strategies credited with the submitted candidate.
+
+    A consensus vote is credited to every strategy that read the winning
+    candidate, so consensus and tiled runs rank the same strategies as the
+    sequential and concurrent modes.
+    """
+    if selected_result.strategy != CONSENSUS_STRATEGY_NAME:
+        return [_strategy_key(selected_result.strategy)]
+    return list(
+        dict.fromkeys(
+            _strategy_key(result.strategy)
+            for result in strategy_results
+            if result.format_valid
+            and result.candidate == selected_result.candidate
+        )
+    )
+
+
+def _empty_counts():
+    return {
+        'runs': 0,
+        'format_valid': 0,
+        'submitted': 0,
+        'accepted': 0,
+        'rejected': 0,
+        'elapsed_ms_total': 0.0,
+    }
+
+
+class StrategyStatistics:
+    """Persistent per-strategy OCR results used to order later recognitions.
+
+    Strategies are ranked by their Laplace-smoothed login acceptance rate per
+    run, so an untried strategy starts at one half, with mean latency as the
+    tie-breaker.
+    """
+
+    def __init__(
+        self,
+        statistics_path,
+        exploration_rate=EXPLORATION_RATE,
+        random_source=None,
+    ):
+        self.statistics_path = Path(statistics_path)
+        self.exploration_rate = exploration_rate
+        self._random = random_source or random.Random()
+        self._lock = threading.Lock()
+        self._pending_strategies = []
+        self.strategies = self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.statistics_path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as error:
+            logging.warning(
+                "Ignoring unreadable CAPTCHA strategy statistics: %s",
+                format_exception_summary(error),
+            )
+            return {}
+        if data.get('format_version') != CAPTCHA_STATISTICS_FORMAT_VERSION:
+            logging.info("Resetting CAPTCHA strategy statistics from an old format.")
+            return {}
+        return {
+            name: {**_empty_counts(), **counts}
+            for name, counts in data.get('strategies', {}).items()
+        }
+
+    def _save(self):
+        statistics = {
+            'format_version': CAPTCHA_STATISTICS_FORMAT_VERSION,
+            'strategies': self.strategies,
+        }
+        try:
+            self.statistics_path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomically(
+                self.statistics_path,
+                json.dumps(statistics, indent=2, sort_keys=True).encode('utf-8'),
+            )
+        except OSError as error:
+            logging.warning(
+                "Could not save CAPTCHA strategy statistics: %s",
+                format_exception_summary(error),
+            )
+
+    def _counts(self, strategy_name):
+        return self.strategies.setdefault(strategy_name, _empty_counts())
+
+    def acceptance_score(self, strategy_name):
+        counts = self.strategies.get(strategy_name, _empty_counts())
+        return (counts['accepted'] + 1) / (counts['runs'] + 2)
+
+    def mean_elapsed_ms(self, strategy_name):
+        counts = self.strategies.get(strategy_name, _empty_counts())
+        if not counts['runs']:
+            return 0.0
+        return counts['elapsed_ms_total'] / counts['runs']
+
+    def _is_unproductive(self, strategy_name):
+        counts = self.strategies.get(strategy_name, _empty_counts())
+        return (
+            counts['runs'] >= SKIP_MINIMUM_RUNS
+            and counts['format_valid'] / counts['runs']
+            < SKIP_MAXIMUM_FORMAT_VALID_RATE
+        )
+
+    def order_strategies(self, strategies):
+        """Return strategies best-first, or a random order when exploring."""
+        with self._lock:
+            if self._random.random() < self.exploration_rate:
+                ordered = list(strategies)
+                self._random.shuffle(ordered)
+                logging.debug("CAPTCHA strategy order: exploring.")
+                return tuple(ordered)
+            ordered = sorted(
+                strategies,
+                key=lambda strategy: (
+                    -self.acceptance_score(strategy[0]),
+                    self.mean_elapsed_ms(strategy[0]),
+                ),
+            )
+            productive = [
+                strategy
+                for strategy in ordered
+                if not self._is_unproductive(strategy[0])
+            ]
+        logging.debug(
+            "CAPTCHA strategy order: %s",
+            ', '.join(strategy[0] for strategy in productive or ordered),
+        )
+        return tuple(productive or ordered)
+
+    def record_capture(self, image_bytes, selected_result, strategy_results):
+        with self._lock:
+            for result in strategy_results:
+                counts = self._counts(_strategy_key(result.strategy))
+                counts['runs'] += 1
+                counts['format_valid'] += int(result.format_valid)
+                counts['elapsed_ms_total'] += result.elapsed_ms
+            self._pending_strategies = []
+            if selected_result is not None:
+                self._pending_strategies = _submitting_strategies(
+                    selected_result,
+                    strategy_results,
+                )
+                for strategy_name in self._pending_strategies:
+                    self._counts(strategy_name)['submitted'] += 1
+            self._save()
+
+    def record_outcome(self, outcome):
+        with self._lock:
+            strategy_names = self._pending_strategies
+            self._pending_strategies = []
+            outcome_count = OUTCOME_COUNTS.get(outcome)
+            if outcome_count is None or not strategy_names:
+                return
+            for strategy_name in strategy_names:
+                self._counts(strategy_name)[outcome_count] += 1
+            self._save()
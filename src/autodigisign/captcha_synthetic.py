@@ -0,0 +1,155 @@
+import math
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from autodigisign.captcha import CAPTCHA_LENGTH, CAPTCHA_WHITELIST
+
+
+# OpenCV's built-in Hershey fonts, so no font files are needed.
+SYNTHETIC_FONTS = {
+    'simplex': cv2.FONT_HERSHEY_SIMPLEX,
+    'plain': cv2.FONT_HERSHEY_PLAIN,
+    'duplex': cv2.FONT_HERSHEY_DUPLEX,
+    'complex': cv2.FONT_HERSHEY_COMPLEX,
+    'triplex': cv2.FONT_HERSHEY_TRIPLEX,
+}
+
+
+@dataclass(frozen=True)
+class SyntheticCaptchaStyle:
+    """Rendering controls for portal-like six-character CAPTCHAs.
+
+    ``noise_density`` is the share of pixels replaced by random speckles and
+    ``warp`` is the peak vertical displacement, in pixels, of a sine wave
+    applied across the image.
+    """
+
+    width: int = 100
+    height: int = 32
+    font: int = cv2.FONT_HERSHEY_SIMPLEX
+    font_scale: float = 0.75
+    thickness: int = 2
+    noise_density: float = 0.03
+    line_count: int = 2
+    warp: float = 0.0
+    invert: bool = False
+    color: bool = True
+
+
+def random_captcha_text(random_generator):
+    """Return one random label from the portal's CAPTCHA alphabet."""
+    indices = random_generator.integers(0, len(CAPTCHA_WHITELIST), CAPTCHA_LENGTH)
+    return ''.join(CAPTCHA_WHITELIST[index] for index in indices)
+
+
+def _random_color(random_generator, low, high, color):
+    if color:
+        return tuple(int(value) for value in random_generator.integers(low, high, 3))
+    value = int(random_generator.integers(low, high))
+    return (value, value, value)
+
+
+def _apply_warp(image, amplitude, random_generator):
+    rows, columns = np.indices(image.shape[:2], dtype=np.float32)
+    period = random_generator.uniform(0.6, 1.2) * image.shape[1]
+    phase = random_generator.uniform(0, 2 * math.pi)
+    map_y = rows + amplitude * np.sin(2 * math.pi * columns / period + phase)
+    return cv2.remap(
+        image,
+        columns,
+        map_y.astype(np.float32),
+        interpolation=cv2.INTER_LINEAR,
+        borderMode=cv2.BORDER_REPLICATE,
+    )
+
+
+def render_captcha(text, style=None, random_generator=None):
+    """Render one BGR CAPTCHA image of ``text`` in the requested style."""
+    style = style or SyntheticCaptchaStyle()
+    random_generator = random_generator or np.random.default_rng()
+    image = np.empty((style.height, style.width, 3), dtype=np.uint8)
+    image[:] = _random_color(random_generator, 215, 256, style.color)
+
+    cell_width = style.width / max(len(text), 1)
+    for index, character in enumerate(text):
+        (text_width, text_height), _ = cv2.getTextSize(
+            character,
+            style.font,
+            style.font_scale,
+            style.thickness,
+        )
+        x = int(index * cell_width + (cell_width - text_width) / 2)
+        x += int(random_generator.integers(-1, 2))
+        y = int((style.height + text_height) / 2)
+        y += int(random_generator.integers(-2, 3))
+        cv2.putText(
+            image,
+            character,
+            (x, y),
+            style.font,
+            style.font_scale,
+            _random_color(random_generator, 0, 90, style.color),
+            style.thickness,
+            cv2.LINE_AA,
+        )
+
+    for _ in range(style.line_count):
+        start = (
+            int(random_generator.integers(0, style.width)),
+            int(random_generator.integers(0, style.height)),
+        )
+        end = (
+            int(random_generator.integers(0, style.width)),
+            int(random_generator.integers(0, style.height)),
+        )
+        cv2.line(
+            image,
+            start,
+            end,
+            _random_color(random_generator, 40, 160, style.color),
+            1,
+            cv2.LINE_AA,
+        )
+
+    if style.noise_density > 0:
+        speckles = random_generator.random(image.shape[:2]) < style.noise_density
+        image[speckles] = random_generator.integers(
+            0,
+            256,
+            (int(speckles.sum()), 3) if style.color else (int(speckles.sum()), 1),
+            dtype=np.uint8,
+        )
+    if style.warp > 0:
+        image = _apply_warp(image, style.warp, random_generator)
+    if style.invert:
+        image = cv2.bitwise_not(image)
+    return image
+
+
+def generate_captcha_batch(output_directory, count, style=None, seed=None):
+    """Write ``count`` labelled PNGs named ``<LABEL>_<index>.png``.
+
+    The filenames follow the labelled-folder convention read by the bench
+    module. Returns ``(png_path, label)`` pairs in generation order.
+    """
+    if count <= 0:
+        raise ValueError("count must be greater than zero.")
+    output_directory = Path(output_directory)
+    output_directory.mkdir(parents=True, exist_ok=True)
+    random_generator = np.random.default_rng(seed)
+    samples = []
+    for index in range(count):
+        label = random_captcha_text(random_generator)
+        encoded, png = cv2.imencode(
+            '.png',
+            render_captcha(label, style, random_generator),
+        )
+        if not encoded:
+            raise ValueError("OpenCV could not encode a synthetic CAPTCHA.")
+        image_path = output_directory / f'{label}_{index:05d}.png'
+        image_path.write_bytes(png.tobytes())
+        samples.append((image_path, label))
+    return samples
@@ -0,0 +1,204 @@
+import logging
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from autodigisign.captcha import (
+    CAPTCHA_LENGTH,
+    CAPTCHA_WHITELIST,
+    CaptchaRecognitionError,
+)
+
+
+GLYPH_TEMPLATE_SHAPE = (20, 14)
+GLYPH_INK_THRESHOLD = 128
+GLYPH_BANK_FORMAT_VERSION = 1
+# Minimum cosine similarity of the weakest glyph before the template result
+# is trusted without Tesseract.
+TEMPLATE_CONFIDENCE_THRESHOLD = 0.85
+
+
+class GlyphBankError(ValueError):
+    """A glyph bank file is missing, malformed, or from another version."""
+
+
+def _ink_runs(column_ink):
+    """Return [start, stop) column ranges that contain any ink."""
+    has_ink = np.concatenate(([False], column_ink > 0, [False]))
+    edges = np.flatnonzero(np.diff(has_ink.astype(np.int8)))
+    return [tuple(pair) for pair in edges.reshape(-1, 2)]
+
+
+def segment_glyphs(processed_image, expected_count=CAPTCHA_LENGTH):
+    """Split a dark-on-light binary CAPTCHA into per-character column ranges.
+
+    Touching characters are split at the weakest column of the widest run and
+    fragments are merged across the narrowest gap until the expected count is
+    reached. Returns an empty list when the image has no usable ink.
+    """
+    ink = np.asarray(processed_image) < GLYPH_INK_THRESHOLD
+    column_ink = ink.sum(axis=0)
+    runs = _ink_runs(column_ink)
+    if not runs:
+        return []
+
+    while len(runs) > expected_count:
+        gaps = [runs[index + 1][0] - runs[index][1] for index in range(len(runs) - 1)]
+        merge_at = int(np.argmin(gaps))
+        runs[merge_at:merge_at + 2] = [(runs[merge_at][0], runs[merge_at + 1][1])]
+
+    while len(runs) < expected_count:
+        widths = [stop - start for start, stop in runs]
+        split_at = int(np.argmax(widths))
+        start, stop = runs[split_at]
+        if stop - start < 2:
+            break
+        # Split near the middle, at the column with the least ink.
+        margin = max((stop - start) // 4, 1)
+        window = column_ink[start + margin:stop - margin]
+        cut = start + margin + int(np.argmin(window)) if window.size else (start + stop) // 2
+        runs[split_at:split_at + 1] = [(start, cut), (cut, stop)]
+    return runs
+
+
+def glyph_vectors(processed_image, column_ranges):
+    """Normalize segmented glyphs into unit vectors for cosine matching."""
+    ink = (np.asarray(processed_image) < GLYPH_INK_THRESHOLD).astype(np.float32)
+    vectors = np.zeros(
+        (len(column_ranges), GLYPH_TEMPLATE_SHAPE[0] * GLYPH_TEMPLATE_SHAPE[1]),
+        dtype=np.float32,
+    )
+    for index, (start, stop) in enumerate(column_ranges):
+        glyph = ink[:, start:stop]
+        rows = np.flatnonzero(glyph.any(axis=1))
+        if rows.size == 0:
+            continue
+        glyph = glyph[rows[0]:rows[-1] + 1]
+        resized = cv2.resize(
+            glyph,
+            (GLYPH_TEMPLATE_SHAPE[1], GLYPH_TEMPLATE_SHAPE[0]),
+            interpolation=cv2.INTER_AREA,
+        )
+        vector = resized.ravel() - resized.mean()
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vectors[index] = vector / norm
+    return vectors
+
+
+class GlyphBank:
+    """Labelled glyph templates stored as one row-normalized matrix."""
+
+    def __init__(self, templates, labels):
+        templates = np.asarray(templates, dtype=np.float32)
+        labels = np.asarray(labels)
+        if templates.ndim != 2 or templates.shape[0] != labels.shape[0]:
+            raise GlyphBankError("Glyph templates and labels do not match.")
+        if templates.shape[1] != GLYPH_TEMPLATE_SHAPE[0] * GLYPH_TEMPLATE_SHAPE[1]:
+            raise GlyphBankError("Glyph templates use an unsupported size.")
+        unknown = set(labels.tolist()) - set(CAPTCHA_WHITELIST)
+        if unknown:
+            raise GlyphBankError(
+                f"Glyph bank contains unsupported labels: {sorted(unknown)}"
+            )
+        self.templates = templates
+        self.labels = labels
+        self._class_indices = np.array(
+            [CAPTCHA_WHITELIST.index(label) for label in labels.tolist()],
+            dtype=np.intp,
+        )
+
+    def classify(self, vectors):
+        """Return the best label and its similarity for each glyph vector."""
+        similarities = vectors @ self.templates.T
+        # Best template per class, then best class per glyph.
+        class_scores = np.full(
+            (vectors.shape[0], len(CAPTCHA_WHITELIST)),
+            -np.inf,
+            dtype=np.float32,
+        )
+        np.maximum.at(
+            class_scores,
+            (slice(None), self._class_indices),
+            similarities,
+        )
+        best_classes = np.argmax(class_scores, axis=1)
+        best_scores = class_scores[np.arange(vectors.shape[0]), best_classes]
+        text = ''.join(CAPTCHA_WHITELIST[index] for index in best_classes)
+        return text, best_scores
+
+
+def build_glyph_bank(labelled_images):
+    """Build a bank from ``(processed_image, text)`` pairs that segment cleanly."""
+    templates = []
+    labels = []
+    skipped = 0
+    for processed_image, text in labelled_images:
+        column_ranges = segment_glyphs(processed_image, len(text))
+        if len(column_ranges) != len(text):
+            skipped += 1
+            continue
+        templates.extend(glyph_vectors(processed_image, column_ranges))
+        labels.extend(text)
+    if skipped:
+        logging.info("Glyph bank skipped %d unsegmentable image(s).", skipped)
+    if not templates:
+        raise GlyphBankError("No labelled CAPTCHA image could be segmented.")
+    return GlyphBank(np.stack(templates), np.array(labels))
+
+
+def save_glyph_bank(bank, bank_path):
+    bank_path = Path(bank_path)
+    bank_path.parent.mkdir(parents=True, exist_ok=True)
+    with bank_path.open('wb') as bank_file:
+        np.savez_compressed(
+            bank_file,
+            version=np.array(GLYPH_BANK_FORMAT_VERSION),
+            templates=bank.templates,
+            labels=bank.labels,
+        )
+
+
+def load_glyph_bank(bank_path):
+    try:
+        with np.load(Path(bank_path), allow_pickle=False) as bank_data:
+            if int(bank_data['version']) != GLYPH_BANK_FORMAT_VERSION:
+                raise GlyphBankError(
+                    f"Unsupported glyph bank version in {bank_path}."
+                )
+            return GlyphBank(bank_data['templates'], bank_data['labels'])
+    except (OSError, KeyError, ValueError) as error:
+        if isinstance(error, GlyphBankError):
+            raise
+        raise GlyphBankError(
+            f"Could not read glyph bank {bank_path}: {error}"
+        ) from error
+
+
+class TemplateRecognizer:
+    """Recognize CAPTCHA glyphs by nearest-template matching, without OCR."""
+
+    name = 'otsu-template'
+    preprocessing_method = 'otsu'
+
+    def __init__(self, bank, confidence_threshold=TEMPLATE_CONFIDENCE_THRESHOLD):
+        self.bank = bank
+        self.confidence_threshold = confidence_threshold
+
+    def recognize_with_scores(self, processed_image):
+        """Return the candidate and the similarity of every glyph."""
+        column_ranges = segment_glyphs(processed_image)
+        if len(column_ranges) != CAPTCHA_LENGTH:
+            raise CaptchaRecognitionError(
+                f"Template recognition found {len(column_ranges)} glyph(s)."
+            )
+        text, scores = self.bank.classify(
+            glyph_vectors(processed_image, column_ranges)
+        )
+        return text, tuple(float(score) for score in scores)
+
+    def recognize(self, processed_image):
+        """Return the candidate and the similarity of its weakest glyph."""
+        text, scores = self.recognize_with_scores(processed_image)
+        return text, min(scores)
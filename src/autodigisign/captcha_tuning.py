@@ -0,0 +1,302 @@
+import itertools
+import json
+import logging
+import random
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+from autodigisign.captcha import (
+    CAPTCHA_PATTERN,
+    DEFAULT_PREPROCESSING_SETTINGS,
+    PREPROCESSING_METHODS,
+    PreprocessingSettings,
+    decode_captcha_image,
+    preprocess_captcha,
+    recognize_captcha,
+)
+from autodigisign.file_helpers import write_atomically
+
+
+STRATEGY_PROFILE_FORMAT_VERSION = 1
+STRATEGY_PROFILE_PATH = Path('inputs') / 'captcha' / 'strategy_profile.json'
+TUNING_SCALE_FACTORS = (2, 3, 4)
+TUNING_BLUR_KERNELS = (0, 3, 5)
+TUNING_ADAPTIVE_BLOCK_SIZES = (21, 31, 41)
+TUNING_ADAPTIVE_CONSTANTS = (5, 9, 13)
+TUNING_PAGE_SEGMENTATION_MODES = (7, 8, 13)
+TUNING_DENOISE = (False, True)
+# Only the best individual strategies are combined into ordered sets, which
+# keeps the set search to a few hundred simulated pipelines.
+TUNING_SHORTLIST_SIZE = 8
+
+
+class StrategyProfileError(ValueError):
+    """A strategy profile is missing, malformed, or from another version."""
+
+
+def strategy_name(settings, page_segmentation_mode):
+    """Return a stable, readable name for one tuned strategy."""
+    parts = [settings.method, f's{settings.scale_factor:g}', f'b{settings.blur_kernel}']
+    if settings.method == 'adaptive':
+        parts.extend(
+            [f'k{settings.adaptive_block_size}', f'c{settings.adaptive_c:g}']
+        )
+    if settings.denoise:
+        parts.append(f'cc{settings.denoise_min_area}')
+    parts.append(f'psm{page_segmentation_mode}')
+    return '-'.join(parts)
+
+
+def _strategy_from_entry(entry):
+    try:
+        settings = PreprocessingSettings(
+            method=entry['method'],
+            scale_factor=float(entry['scale_factor']),
+            blur_kernel=int(entry['blur_kernel']),
+            adaptive_block_size=int(entry['adaptive_block_size']),
+            adaptive_c=float(entry['adaptive_c']),
+            denoise=bool(entry.get('denoise', False)),
+            denoise_min_area=int(entry.get('denoise_min_area', 30)),
+        )
+        page_segmentation_mode = int(entry['page_segmentation_mode'])
+        name = str(entry['name'])
+    except (KeyError, TypeError, ValueError) as error:
+        raise StrategyProfileError(
+            f"Strategy profile entry is incomplete: {error}"
+        ) from error
+    if (
+        settings.method not in PREPROCESSING_METHODS
+        or settings.scale_factor <= 0
+        or settings.blur_kernel < 0
+        or (settings.blur_kernel and settings.blur_kernel % 2 == 0)
+        or settings.adaptive_block_size < 3
+        or settings.adaptive_block_size % 2 == 0
+        or settings.denoise_min_area < 1
+        or not 0 <= page_segmentation_mode <= 13
+    ):
+        raise StrategyProfileError(f"Strategy profile entry is invalid: {name}")
+    return name, settings, page_segmentation_mode
+
+
+def load_strategy_profile(profile_path):
+    """Return the ordered OCR strategies stored in a tuned profile."""
+    try:
+        profile = json.loads(Path(profile_path).read_text(encoding='utf-8'))
+    except (OSError, ValueError) as error:
+        raise StrategyProfileError(
+            f"Could not read strategy profile {profile_path}: {error}"
+        ) from error
+    if not isinstance(profile, dict):
+        raise StrategyProfileError(f"Strategy profile is malformed: {profile_path}")
+    if profile.get('format_version') != STRATEGY_PROFILE_FORMAT_VERSION:
+        raise StrategyProfileError(
+            f"Unsupported strategy profile version in {profile_path}."
+        )
+    entries = profile.get('strategies')
+    if not isinstance(entries, list) or not entries:
+        raise StrategyProfileError(
+            f"Strategy profile has no strategies: {profile_path}"
+        )
+    return tuple(_strategy_from_entry(entry) for entry in entries)
+
+
+def save_strategy_profile(profile_path, tuning_result):
+    """Write a tuning result as a versioned profile, replacing it atomically."""
+    profile_path = Path(profile_path)
+    profile = {
+        'format_version': STRATEGY_PROFILE_FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'samples': tuning_result['samples'],
+        'target_accuracy': tuning_result['target_accuracy'],
+        'accuracy': tuning_result['accuracy'],
+        'mean_ms': tuning_result['mean_ms'],
+        'strategies': [
+            {
+                'name': name,
+                **asdict(settings),
+                'page_segmentation_mode': page_segmentation_mode,
+            }
+            for name, settings, page_segmentation_mode in tuning_result['strategies']
+        ],
+    }
+    profile_path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomically(
+        profile_path,
+        (json.dumps(profile, indent=2) + '\n').encode('utf-8'),
+    )
+
+
+def candidate_strategies(trials=None, random_source=None):
+    """Return the tuning grid, or ``trials`` random points from it.
+
+    The default strategies are always included, so a tuned profile is never
+    chosen from a search that could not reproduce the current behavior.
+    """
+    settings = [
+        PreprocessingSettings('otsu', scale_factor, blur_kernel, denoise=denoise)
+        for scale_factor, blur_kernel, denoise in itertools.product(
+            TUNING_SCALE_FACTORS,
+            TUNING_BLUR_KERNELS,
+            TUNING_DENOISE,
+        )
+    ] + [
+        PreprocessingSettings(
+            'adaptive',
+            scale_factor,
+            blur_kernel,
+            block_size,
+            constant,
+            denoise,
+        )
+        for scale_factor, blur_kernel, block_size, constant, denoise in (
+            itertools.product(
+                TUNING_SCALE_FACTORS,
+                TUNING_BLUR_KERNELS,
+                TUNING_ADAPTIVE_BLOCK_SIZES,
+                TUNING_ADAPTIVE_CONSTANTS,
+                TUNING_DENOISE,
+            )
+        )
+    ]
+    grid = list(itertools.product(settings, TUNING_PAGE_SEGMENTATION_MODES))
+    if trials is not None and trials < len(grid):
+        grid = (random_source or random.Random()).sample(grid, trials)
+    defaults = [
+        (DEFAULT_PREPROCESSING_SETTINGS[method], page_segmentation_mode)
+        for method, page_segmentation_mode in (
+            ('otsu', 8),
+            ('adaptive', 7),
+            ('otsu', 13),
+        )
+    ]
+    candidates = list(dict.fromkeys(defaults + grid))
+    return tuple(
+        (strategy_name(settings, page_segmentation_mode), settings, page_segmentation_mode)
+        for settings, page_segmentation_mode in candidates
+    )
+
+
+def evaluate_strategies(samples, strategies):
+    """Run every strategy on every labelled sample.
+
+    Returns ``(labels, evaluations, preprocessing_seconds)``. Each evaluation
+    holds a strategy's candidates and recognition seconds per sample;
+    preprocessing time is kept per settings because the pipeline shares it.
+    """
+    labels = []
+    evaluations = {
+        name: {'candidates': [], 'seconds': []} for name, _, _ in strategies
+    }
+    preprocessing_seconds = {settings: [] for _, settings, _ in strategies}
+    for image_path, label in samples:
+        labels.append(label)
+        image = decode_captcha_image(Path(image_path).read_bytes())
+        processed_images = {}
+        for settings in preprocessing_seconds:
+            started_at = time.perf_counter()
+            processed_images[settings] = preprocess_captcha(image, settings)
+            preprocessing_seconds[settings].append(time.perf_counter() - started_at)
+        for name, settings, page_segmentation_mode in strategies:
+            started_at = time.perf_counter()
+            candidate = recognize_captcha(
+                processed_images[settings],
+                page_segmentation_mode,
+            )
+            evaluations[name]['seconds'].append(time.perf_counter() - started_at)
+            evaluations[name]['candidates'].append(candidate)
+    return labels, evaluations, preprocessing_seconds
+
+
+def _simulate_pipeline(strategy_set, labels, evaluations, preprocessing_seconds):
+    """Replay get_captcha_text()'s first-valid selection over stored results."""
+    correct = 0
+    total_seconds = 0.0
+    for index, label in enumerate(labels):
+        preprocessed = set()
+        for name, settings, _ in strategy_set:
+            if settings not in preprocessed:
+                preprocessed.add(settings)
+                total_seconds += preprocessing_seconds[settings][index]
+            total_seconds += evaluations[name]['seconds'][index]
+            candidate = evaluations[name]['candidates'][index]
+            if CAPTCHA_PATTERN.fullmatch(candidate):
+                correct += candidate == label
+                break
+    return correct / len(labels), total_seconds / len(labels) * 1000
+
+
+def tune_strategies(
+    samples,
+    strategies,
+    target_accuracy,
+    max_strategies=3,
+):
+    """Return the fastest ordered strategy set that meets ``target_accuracy``.
+
+    When no set reaches the target, the most accurate set is returned and
+    ``meets_target`` is false. Unlabelled samples are ignored.
+    """
+    samples = [(image_path, label) for image_path, label in samples if label]
+    if not samples:
+        raise ValueError("Strategy tuning requires labelled CAPTCHA samples.")
+    labels, evaluations, preprocessing_seconds = evaluate_strategies(
+        samples,
+        strategies,
+    )
+    individual_scores = {
+        strategy[0]: _simulate_pipeline(
+            (strategy,),
+            labels,
+            evaluations,
+            preprocessing_seconds,
+        )
+        for strategy in strategies
+    }
+    individual = sorted(
+        strategies,
+        key=lambda strategy: (
+            -individual_scores[strategy[0]][0],
+            individual_scores[strategy[0]][1],
+        ),
+    )
+    shortlist = individual[:TUNING_SHORTLIST_SIZE]
+
+    best = None
+    for set_size in range(1, max_strategies + 1):
+        for strategy_set in itertools.permutations(shortlist, set_size):
+            accuracy, mean_ms = _simulate_pipeline(
+                strategy_set,
+                labels,
+                evaluations,
+                preprocessing_seconds,
+            )
+            meets_target = accuracy >= target_accuracy
+            # Among sets that meet the target, latency decides; otherwise the
+            # most accurate set wins.
+            rank = (
+                (0, mean_ms, -accuracy)
+                if meets_target
+                else (1, -accuracy, mean_ms)
+            )
+            if best is None or rank < best[0]:
+                best = (rank, strategy_set, accuracy, mean_ms, meets_target)
+
+    _, strategy_set, accuracy, mean_ms, meets_target = best
+    logging.info(
+        "CAPTCHA strategy tuning selected %d strategy(ies): accuracy=%.3f, "
+        "mean_ms=%.1f, meets_target=%s",
+        len(strategy_set),
+        accuracy,
+        mean_ms,
+        meets_target,
+    )
+    return {
+        'strategies': strategy_set,
+        'samples': len(labels),
+        'target_accuracy': target_accuracy,
+        'accuracy': accuracy,
+        'mean_ms': mean_ms,
+        'meets_target': meets_target,
+    }
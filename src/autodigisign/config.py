@@ -1,8 +1,12 @@
 import configparser
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+from autodigisign.captcha import CAPTCHA_CAPTURE_METHODS, OCR_BACKEND_NAMES
+from autodigisign.portal import LOGIN_FORM_FILL_METHODS
+
 
 class ConfigurationError(ValueError):
     """Raised when an AutoDigiSign configuration file is incomplete or invalid."""
@@ -13,6 +17,9 @@ class ProjectPaths:
     credentials: Path
     employee_list: Path
     email_config: Optional[Path]
+    glyph_bank: Optional[Path] = None
+    strategy_profile: Optional[Path] = None
+    captcha_model: Optional[Path] = None
 
 
 @dataclass(frozen=True)
@@ -22,12 +29,32 @@ class CredentialsSettings:
     pincode: str
 
 
+@dataclass(frozen=True)
+class RuntimeOptions:
+    captcha_workers: int = 1
+    ocr_thread_limit: Optional[int] = None
+    ocr_backend: str = 'pytesseract'
+    captcha_corpus: bool = False
+    adaptive_captcha_strategies: bool = False
+    captcha_consensus_threshold: Optional[float] = None
+    captcha_capture: str = 'screenshot'
+    tiled_captcha_ocr: bool = False
+    captcha_quality_gate: bool = False
+    pipelined_login: bool = False
+    session_cache: bool = False
+    login_form_fill: str = 'keystrokes'
+    browser_events: bool = False
+
+
 def resolve_project_paths(project_root):
     """Resolve the documented project paths without recursively guessing files."""
     project_root = Path(project_root).resolve()
     credentials = project_root / 'inputs' / 'configs' / 'credentials.ini'
     employee_list = project_root / 'inputs' / 'employee_list.txt'
     email_config = project_root / 'inputs' / 'configs' / 'email_config.ini'
+    glyph_bank = project_root / 'inputs' / 'captcha' / 'glyph_bank.npz'
+    strategy_profile = project_root / 'inputs' / 'captcha' / 'strategy_profile.json'
+    captcha_model = project_root / 'inputs' / 'captcha' / 'captcha_cnn.npz'
 
     missing_paths = [
         path for path in (credentials, employee_list) if not path.is_file()
@@ -47,6 +74,11 @@ def resolve_project_paths(project_root):
         credentials=credentials,
         employee_list=employee_list,
         email_config=email_config if email_config.is_file() else None,
+        glyph_bank=glyph_bank if glyph_bank.is_file() else None,
+        strategy_profile=(
+            strategy_profile if strategy_profile.is_file() else None
+        ),
+        captcha_model=captcha_model if captcha_model.is_file() else None,
     )
 
 
@@ -118,3 +150,132 @@ def load_credentials_settings(credentials_path):
         password=password,
         pincode=pincode,
     )
+
+
+def _positive_integer_option(environment, name, default):
+    value = environment.get(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        parsed_value = int(value.strip())
+    except ValueError:
+        parsed_value = 0
+    if parsed_value <= 0:
+        raise ConfigurationError(
+            f"Environment variable {name} must be a positive integer: {value}"
+        )
+    return parsed_value
+
+
+def _choice_option(environment, name, choices, default):
+    value = environment.get(name)
+    if value is None or not value.strip():
+        return default
+    normalized_value = value.strip().lower()
+    if normalized_value not in choices:
+        raise ConfigurationError(
+            f"Environment variable {name} must be one of "
+            f"{', '.join(choices)}: {value}"
+        )
+    return normalized_value
+
+
+def _boolean_option(environment, name):
+    value = environment.get(name)
+    if value is None or not value.strip():
+        return False
+    normalized_value = value.strip().lower()
+    if normalized_value in ('1', 'true', 'yes', 'on'):
+        return True
+    if normalized_value in ('0', 'false', 'no', 'off'):
+        return False
+    raise ConfigurationError(
+        f"Environment variable {name} must be true or false: {value}"
+    )
+
+
+def _fraction_option(environment, name):
+    value = environment.get(name)
+    if value is None or not value.strip():
+        return None
+    try:
+        parsed_value = float(value.strip())
+    except ValueError:
+        parsed_value = 0.0
+    if not 0 < parsed_value <= 1:
+        raise ConfigurationError(
+            f"Environment variable {name} must be a number in (0, 1]: {value}"
+        )
+    return parsed_value
+
+
+def load_runtime_options(environment=None):
+    """Load optional performance settings from AUTODIGISIGN_* variables."""
+    environment = os.environ if environment is None else environment
+    captcha_workers = _positive_integer_option(
+        environment,
+        'AUTODIGISIGN_CAPTCHA_WORKERS',
+        1,
+    )
+    # Concurrent OCR defaults to single-threaded Tesseract processes so the
+    # strategy pool, rather than OpenMP, decides how many cores are busy.
+    ocr_thread_limit = _positive_integer_option(
+        environment,
+        'AUTODIGISIGN_OCR_THREAD_LIMIT',
+        1 if captcha_workers > 1 else None,
+    )
+    ocr_backend = _choice_option(
+        environment,
+        'AUTODIGISIGN_OCR_BACKEND',
+        OCR_BACKEND_NAMES,
+        'pytesseract',
+    )
+    return RuntimeOptions(
+        captcha_workers=captcha_workers,
+        ocr_thread_limit=ocr_thread_limit,
+        ocr_backend=ocr_backend,
+        captcha_corpus=_boolean_option(
+            environment,
+            'AUTODIGISIGN_CAPTCHA_CORPUS',
+        ),
+        adaptive_captcha_strategies=_boolean_option(
+            environment,
+            'AUTODIGISIGN_ADAPTIVE_CAPTCHA',
+        ),
+        captcha_consensus_threshold=_fraction_option(
+            environment,
+            'AUTODIGISIGN_CAPTCHA_CONSENSUS',
+        ),
+        captcha_capture=_choice_option(
+            environment,
+            'AUTODIGISIGN_CAPTCHA_CAPTURE',
+            CAPTCHA_CAPTURE_METHODS,
+            'screenshot',
+        ),
+        tiled_captcha_ocr=_boolean_option(
+            environment,
+            'AUTODIGISIGN_CAPTCHA_TILED',
+        ),
+        captcha_quality_gate=_boolean_option(
+            environment,
+            'AUTODIGISIGN_CAPTCHA_QUALITY_GATE',
+        ),
+        pipelined_login=_boolean_option(
+            environment,
+            'AUTODIGISIGN_PIPELINED_LOGIN',
+        ),
+        session_cache=_boolean_option(
+            environment,
+            'AUTODIGISIGN_SESSION_CACHE',
+        ),
+        login_form_fill=_choice_option(
+            environment,
+            'AUTODIGISIGN_LOGIN_FORM_FILL',
+            LOGIN_FORM_FILL_METHODS,
+            'keystrokes',
+        ),
+        browser_events=_boolean_option(
+            environment,
+            'AUTODIGISIGN_BROWSER_EVENTS',
+        ),
+    )
@@ -0,0 +1,11 @@
+import os
+
+
+def write_atomically(file_path, data):
+    """Replace ``file_path`` with ``data`` so readers never see a torn file."""
+    temporary_path = file_path.with_name(f'.{file_path.name}.tmp')
+    with temporary_path.open('wb') as output_file:
+        output_file.write(data)
+        output_file.flush()
+        os.fsync(output_file.fileno())
+    os.replace(temporary_path, file_path)
@@ -111,6 +111,13 @@ class SensitiveDataFormatter(logging.Formatter):
         return SensitiveDataFilter.redact(super().format(record))
 
 
+def get_run_artifact_path(info_log_filepath, name):
+    """Return ``<run>_<name>`` in the directory of one run's INFO log."""
+    directory, filename = os.path.split(info_log_filepath)
+    run_prefix = filename.removesuffix('_info.log')
+    return os.path.join(directory, f'{run_prefix}_{name}')
+
+
 def setup_logging(log_directory, timestamp=None):
     if timestamp is None:
         timestamp = datetime.now().strftime(LOG_TIMESTAMP_FORMAT)
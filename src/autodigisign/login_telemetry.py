@@ -0,0 +1,80 @@
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+
+from autodigisign.logging_config import (
+    format_exception_summary,
+    get_run_artifact_path,
+)
+
+
+LOGIN_TELEMETRY_FORMAT_VERSION = 1
+CAPTCHA_TIMING_KEYS = (
+    'image_wait_ms',
+    'capture_ms',
+    'decode_ms',
+    'preprocess_ms',
+    'ocr_ms',
+)
+LOGIN_TIMING_KEYS = (
+    'captcha_ms',
+    'form_fill_ms',
+    'outcome_ms',
+    'refresh_ms',
+    'total_ms',
+)
+
+
+def get_login_telemetry_path(info_log_filepath):
+    """Return the telemetry file that sits next to one run's INFO log."""
+    return Path(get_run_artifact_path(info_log_filepath, 'login.jsonl'))
+
+
+class LoginTelemetry:
+    """Append one JSON line per login attempt with its timing breakdown.
+
+    ``captcha_timings`` is handed to the CAPTCHA functions, which fill in the
+    duration of each stage; it is cleared when the next attempt starts. The
+    optional ``settings``, such as the form fill method, are repeated in every
+    record so runs with different settings can be compared.
+    """
+
+    def __init__(self, telemetry_path, settings=None):
+        self.telemetry_path = Path(telemetry_path)
+        self.settings = dict(settings or {})
+        self.captcha_timings = {}
+
+    def start_attempt(self):
+        self.captcha_timings.clear()
+
+    def record_attempt(self, attempt, outcome, timings, error=None):
+        """Write one attempt; ``timings`` holds the login-side durations.
+
+        Every record has the same keys, with ``None`` for stages the attempt
+        did not reach.
+        """
+        record = {
+            'format_version': LOGIN_TELEMETRY_FORMAT_VERSION,
+            'recorded_at': datetime.now().isoformat(timespec='milliseconds'),
+            'attempt': attempt,
+            'outcome': outcome,
+            'error': error,
+            'settings': self.settings,
+        }
+        for key in CAPTCHA_TIMING_KEYS:
+            record[key] = self.captcha_timings.get(key)
+        for key in LOGIN_TIMING_KEYS:
+            record[key] = timings.get(key)
+        for key in (*CAPTCHA_TIMING_KEYS, *LOGIN_TIMING_KEYS):
+            if record[key] is not None:
+                record[key] = round(record[key], 1)
+        try:
+            self.telemetry_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.telemetry_path.open('a', encoding='utf-8') as telemetry_file:
+                telemetry_file.write(json.dumps(record) + '\n')
+        except OSError as error:
+            logging.warning(
+                "Could not record login telemetry: %s",
+                format_exception_summary(error),
+            )
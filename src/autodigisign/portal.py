@@ -1,10 +1,15 @@
 import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass
 from urllib.parse import parse_qs, urlencode, urlsplit
 
 from selenium.common.exceptions import (
     NoSuchElementException,
     StaleElementReferenceException,
     TimeoutException,
+    WebDriverException,
 )
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -17,18 +22,152 @@ from autodigisign.selenium_helpers import safe_find
 LOGIN_SUCCESS_TIMEOUT_SECONDS = 3
 LOGIN_SUCCEEDED = 'success'
 LOGIN_REJECTED = 'rejected'
+LOGIN_TIMED_OUT = 'timeout'
+CAPTCHA_REFRESH_TIMEOUT_SECONDS = 5
+LOGIN_FORM_FILL_METHODS = ('keystrokes', 'script')
+# Consecutive script failures tolerated, e.g. while the login postback
+# replaces the document, before falling back to WebDriverWait polling.
+LOGIN_OUTCOME_SCRIPT_ATTEMPTS = 3
 DIGITAL_SIGNATURE_URL = (
     'https://ihisaw.ntuh.gov.tw/WebApplication/'
     'DigitalSignature/DsQuery.aspx'
 )
 
 
+# Re-request only imgVerifyCode when the login form is still usable. The
+# result is 'loaded' once the new image decodes, 'invalid-form' when a full
+# page refresh is needed, and 'error' or 'timeout' when the request failed.
+_REFRESH_CAPTCHA_IMAGE_SCRIPT = """
+const timeoutMs = arguments[0];
+const done = arguments[arguments.length - 1];
+const image = document.getElementById('imgVerifyCode');
+const formIsUsable = document.readyState === 'complete'
+    && image
+    && ['txtUserID', 'txtPass', 'txtVerifyCode', 'imgBtnSubmitNew'].every(
+        (elementId) => document.getElementById(elementId)
+    );
+if (!formIsUsable) {
+    done('invalid-form');
+    return;
+}
+const timer = setTimeout(() => done('timeout'), timeoutMs);
+image.addEventListener('load', () => {
+    clearTimeout(timer);
+    done(image.naturalWidth > 0 ? 'loaded' : 'error');
+}, {once: true});
+image.addEventListener('error', () => {
+    clearTimeout(timer);
+    done('error');
+}, {once: true});
+const source = new URL(image.getAttribute('src') || image.src, document.baseURI);
+source.searchParams.set('_', String(Date.now()));
+image.src = source.toString();
+"""
+
+
+# Set every field, fire the input and change events a user would, and
+# optionally click the submit button, all in one round trip. Returns the ID of
+# a missing element without changing the form, or null.
+_FILL_LOGIN_FORM_SCRIPT = """
+const values = arguments[0];
+const submitId = arguments[1];
+const elementIds = Object.keys(values).concat(submitId ? [submitId] : []);
+const missingId = elementIds.find((elementId) => !document.getElementById(elementId));
+if (missingId) {
+    return missingId;
+}
+for (const [elementId, value] of Object.entries(values)) {
+    const field = document.getElementById(elementId);
+    field.focus();
+    field.value = value;
+    field.dispatchEvent(new Event('input', {bubbles: true}));
+    field.dispatchEvent(new Event('change', {bubbles: true}));
+}
+if (submitId) {
+    document.getElementById(submitId).click();
+}
+return null;
+"""
+
+
+# Resolve the login outcome in the browser: immediately when the page already
+# shows it, otherwise from a MutationObserver as the DOM changes. The result is
+# 'success', 'rejected', or 'pending' once the timeout expires. A postback that
+# unloads the document aborts the script, and the caller re-issues it. With
+# awaitCaptcha, a rejection is reported once the new imgVerifyCode has loaded,
+# so the next CAPTCHA can be captured without another wait.
+_LOGIN_OUTCOME_SCRIPT = """
+const timeoutMs = arguments[0];
+const awaitCaptcha = arguments[1];
+const done = arguments[arguments.length - 1];
+const currentOutcome = (requireCaptcha) => {
+    if (document.getElementById('TopButtonLogOutDIV')) {
+        return 'success';
+    }
+    const verifyCode = document.getElementById('txtVerifyCode');
+    if (!verifyCode || verifyCode.value.trim()) {
+        return null;
+    }
+    const image = document.getElementById('imgVerifyCode');
+    const captchaLoaded = Boolean(
+        image && image.complete && image.naturalWidth > 0
+    );
+    return !requireCaptcha || captchaLoaded ? 'rejected' : null;
+};
+const outcome = currentOutcome(awaitCaptcha);
+if (outcome) {
+    done(outcome);
+    return;
+}
+let timer = null;
+let observer = null;
+const checkOutcome = () => {
+    const changedOutcome = currentOutcome(awaitCaptcha);
+    if (changedOutcome) {
+        observer.disconnect();
+        document.removeEventListener('load', checkOutcome, true);
+        clearTimeout(timer);
+        done(changedOutcome);
+    }
+};
+observer = new MutationObserver(checkOutcome);
+observer.observe(document, {
+    childList: true,
+    subtree: true,
+    attributes: true,
+    attributeFilter: ['value'],
+});
+// Image loads do not mutate the DOM; load events do not bubble but can be
+// caught on the way down.
+document.addEventListener('load', checkOutcome, true);
+timer = setTimeout(() => {
+    observer.disconnect();
+    document.removeEventListener('load', checkOutcome, true);
+    done(currentOutcome(false) || 'pending');
+}, timeoutMs);
+"""
+
+
 class PortalNavigationError(RuntimeError):
     """The portal did not provide the session information needed to continue."""
 
 
-def login(driver, username, password, captcha_text):
-    """Submit one login attempt without recording credentials in logs."""
+def _fill_login_form_by_script(driver, values, submit_id=None):
+    missing_id = driver.execute_script(_FILL_LOGIN_FORM_SCRIPT, values, submit_id)
+    if missing_id:
+        raise NoSuchElementException(
+            f"Login form element was not found: {missing_id}"
+        )
+
+
+def fill_login_credentials(driver, username, password, form_fill='keystrokes'):
+    if form_fill == 'script':
+        _fill_login_form_by_script(
+            driver,
+            {'txtUserID': username, 'txtPass': password},
+        )
+        return
+
     user_id = safe_find(driver, By.ID, 'txtUserID')
     user_id.clear()
     user_id.send_keys(username)
@@ -37,6 +176,16 @@ def login(driver, username, password, captcha_text):
     user_password.clear()
     user_password.send_keys(password)
 
+
+def submit_login_captcha(driver, captcha_text, form_fill='keystrokes'):
+    if form_fill == 'script':
+        _fill_login_form_by_script(
+            driver,
+            {'txtVerifyCode': captcha_text},
+            'imgBtnSubmitNew',
+        )
+        return
+
     verify_code = safe_find(driver, By.ID, 'txtVerifyCode')
     verify_code.clear()
     verify_code.send_keys(captcha_text)
@@ -44,6 +193,106 @@ def login(driver, username, password, captcha_text):
     safe_find(driver, By.ID, 'imgBtnSubmitNew').click()
 
 
+def login(driver, username, password, captcha_text, form_fill='keystrokes'):
+    """Submit one login attempt without recording credentials in logs.
+
+    ``form_fill='script'`` sets all three fields and submits in a single
+    script call instead of about ten WebDriver round trips; the default types
+    real keystrokes into each field.
+    """
+    if form_fill not in LOGIN_FORM_FILL_METHODS:
+        raise ValueError(f"Unknown login form fill method: {form_fill}")
+    if form_fill == 'script':
+        _fill_login_form_by_script(
+            driver,
+            {
+                'txtUserID': username,
+                'txtPass': password,
+                'txtVerifyCode': captcha_text,
+            },
+            'imgBtnSubmitNew',
+        )
+        return
+    fill_login_credentials(driver, username, password)
+    submit_login_captcha(driver, captcha_text)
+
+
+def _elapsed_ms(started_at):
+    return (time.monotonic() - started_at) * 1000
+
+
+@dataclass(frozen=True)
+class _CaptchaPrefetch:
+    """A CAPTCHA captured on the driver thread and recognized on a worker.
+
+    ``timings`` receives the capture and recognition stage durations, and
+    ``capture_ms`` is the driver time the capture took.
+    """
+
+    recognition: Future
+    timings: dict
+    capture_ms: float
+
+
+def _prefetch_captcha(driver, captcha_pipeline, executor):
+    """Capture the displayed CAPTCHA and start recognizing it on a worker."""
+    capture, recognize = captcha_pipeline
+    timings = {}
+    started_at = time.monotonic()
+    captured = capture(driver, timings=timings)
+    capture_ms = _elapsed_ms(started_at)
+    return _CaptchaPrefetch(
+        executor.submit(recognize, captured, timings=timings),
+        timings,
+        capture_ms,
+    )
+
+
+def _prefetch_next_captcha(driver, captcha_pipeline, executor):
+    """Start the next attempt's CAPTCHA now, or return None to capture later.
+
+    A failed capture is left to the next attempt, which captures again and
+    reports the error as its own.
+    """
+    try:
+        return _prefetch_captcha(driver, captcha_pipeline, executor)
+    except (RetryableCaptchaError, WebDriverException) as error:
+        logging.debug(
+            "CAPTCHA prefetch failed; capturing on the next attempt: %s",
+            format_exception_summary(error),
+        )
+        return None
+
+
+def _pipelined_login(
+    driver,
+    username,
+    password,
+    prefetch,
+    attempt,
+    timings,
+    form_fill,
+):
+    """Type the credentials while the prefetched CAPTCHA is recognized."""
+    started_at = time.monotonic()
+    try:
+        fill_login_credentials(driver, username, password, form_fill)
+    except BaseException:
+        # Let recognition and its recorders finish before the next capture.
+        wait([prefetch.recognition])
+        raise
+    form_fill_ms = _elapsed_ms(started_at)
+    started_at = time.monotonic()
+    captcha_text = prefetch.recognition.result()
+    # Only the capture and the time spent blocked on recognition delay the
+    # login.
+    timings['captcha_ms'] = prefetch.capture_ms + _elapsed_ms(started_at)
+    logging.info("Attempt #%d: CAPTCHA recognition completed.", attempt)
+    started_at = time.monotonic()
+    submit_login_captcha(driver, captcha_text, form_fill)
+    timings['form_fill_ms'] = form_fill_ms + _elapsed_ms(started_at)
+
+
 def _detect_login_outcome(driver):
     """Return a completed login outcome or False while navigation continues."""
     try:
@@ -61,10 +310,78 @@ def _detect_login_outcome(driver):
     return False
 
 
+def _wait_for_login_outcome(driver, timeout_seconds, await_captcha=False):
+    """Return the login outcome, raising TimeoutException when none arrives.
+
+    Each round trip waits in the browser until the outcome is visible. With
+    ``await_captcha``, a rejection is returned once the new CAPTCHA image has
+    loaded, or at the timeout. When the script cannot run, the remaining time
+    is spent polling ``_detect_login_outcome`` instead.
+    """
+    deadline = time.monotonic() + timeout_seconds
+    failures = 0
+    while True:
+        remaining_seconds = deadline - time.monotonic()
+        if remaining_seconds <= 0:
+            raise TimeoutException("No login outcome before the timeout.")
+        try:
+            outcome = driver.execute_async_script(
+                _LOGIN_OUTCOME_SCRIPT,
+                int(remaining_seconds * 1000),
+                await_captcha,
+            )
+        except WebDriverException as error:
+            failures += 1
+            logging.debug(
+                "Login outcome script failed: %s",
+                format_exception_summary(error),
+            )
+            if failures < LOGIN_OUTCOME_SCRIPT_ATTEMPTS:
+                continue
+            outcome = None
+        if outcome in (LOGIN_SUCCEEDED, LOGIN_REJECTED):
+            return outcome
+        if outcome == 'pending':
+            raise TimeoutException("No login outcome before the timeout.")
+        logging.debug("Polling for the login outcome instead.")
+        return WebDriverWait(
+            driver,
+            max(deadline - time.monotonic(), 0),
+        ).until(_detect_login_outcome)
+
+
+def _record_login_outcome(captcha_recorders, outcome):
+    for recorder in captcha_recorders:
+        recorder.record_outcome(outcome)
+
+
+def _refresh_captcha_image(driver):
+    """Load a new CAPTCHA in place; return False when the page must reload."""
+    try:
+        state = driver.execute_async_script(
+            _REFRESH_CAPTCHA_IMAGE_SCRIPT,
+            int(CAPTCHA_REFRESH_TIMEOUT_SECONDS * 1000),
+        )
+    except WebDriverException as error:
+        logging.debug(
+            "CAPTCHA image refresh failed: %s",
+            format_exception_summary(error),
+        )
+        return False
+    if state != 'loaded':
+        logging.debug("CAPTCHA image refresh was not possible: %s", state)
+        return False
+    return True
+
+
 def _refresh_login_page_for_retry(driver, attempt, max_retries):
-    if attempt < max_retries:
-        logging.debug("Refreshing the portal login page before retrying.")
-        driver.refresh()
+    if attempt >= max_retries:
+        return
+    if _refresh_captcha_image(driver):
+        logging.debug("Requested a new CAPTCHA image before retrying.")
+        return
+    logging.debug("Refreshing the portal login page before retrying.")
+    driver.refresh()
 
 
 def retry_login(
@@ -74,46 +391,151 @@ def retry_login(
     max_retries=30,
     success_timeout_seconds=LOGIN_SUCCESS_TIMEOUT_SECONDS,
     captcha_loader=None,
+    captcha_recorders=(),
+    captcha_pipeline=None,
+    login_telemetry=None,
+    form_fill='keystrokes',
 ):
-    """Retry only expected CAPTCHA and short-lived DOM failures."""
+    """Retry only expected CAPTCHA and short-lived DOM failures.
+
+    Each of the optional ``captcha_recorders`` receives the portal's verdict
+    for every submitted CAPTCHA guess. A ``captcha_pipeline`` is a
+    ``(capture, recognize)`` pair that replaces ``captcha_loader``. After a
+    rejection, the outcome wait ends once the new CAPTCHA has loaded; that
+    CAPTCHA, or the one loaded by a retry refresh, is captured at once and
+    recognized on a background thread while the attempt is recorded and the
+    next credentials are typed. An optional
+    ``login_telemetry`` records the timing breakdown of every attempt, and
+    ``form_fill`` selects how login() fills the form.
+    """
     if max_retries <= 0:
         raise ValueError("max_retries must be greater than zero.")
+    if form_fill not in LOGIN_FORM_FILL_METHODS:
+        raise ValueError(f"Unknown login form fill method: {form_fill}")
     captcha_loader = captcha_loader or get_captcha_text
+    executor_context = (
+        nullcontext()
+        if captcha_pipeline is None
+        else ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix='captcha-pipeline',
+        )
+    )
+    with executor_context as executor:
+        return _retry_login_attempts(
+            driver,
+            username,
+            password,
+            max_retries,
+            success_timeout_seconds,
+            captcha_loader,
+            captcha_recorders,
+            captcha_pipeline,
+            executor,
+            login_telemetry,
+            form_fill,
+        )
 
+
+def _retry_login_attempts(
+    driver,
+    username,
+    password,
+    max_retries,
+    success_timeout_seconds,
+    captcha_loader,
+    captcha_recorders,
+    captcha_pipeline,
+    executor,
+    login_telemetry,
+    form_fill,
+):
+    prefetch = None
     for attempt in range(1, max_retries + 1):
+        attempt_started_at = time.monotonic()
+        outcome_started_at = None
+        outcome = None
+        error_name = None
+        timings = {}
+        current_prefetch = None
+        more_attempts = captcha_pipeline is not None and attempt < max_retries
+        if login_telemetry is not None:
+            login_telemetry.start_attempt()
         try:
-            captcha_text = captcha_loader(driver)
-            logging.info(
-                "Attempt #%d: CAPTCHA recognition completed.",
-                attempt,
-            )
-            login(driver, username, password, captcha_text)
-            outcome = WebDriverWait(
+            if captcha_pipeline is None:
+                started_at = time.monotonic()
+                captcha_text = captcha_loader(driver)
+                timings['captcha_ms'] = _elapsed_ms(started_at)
+                logging.info(
+                    "Attempt #%d: CAPTCHA recognition completed.",
+                    attempt,
+                )
+                started_at = time.monotonic()
+                login(driver, username, password, captcha_text, form_fill)
+                timings['form_fill_ms'] = _elapsed_ms(started_at)
+            else:
+                current_prefetch = prefetch or _prefetch_captcha(
+                    driver,
+                    captcha_pipeline,
+                    executor,
+                )
+                prefetch = None
+                _pipelined_login(
+                    driver,
+                    username,
+                    password,
+                    current_prefetch,
+                    attempt,
+                    timings,
+                    form_fill,
+                )
+            outcome_started_at = time.monotonic()
+            outcome = _wait_for_login_outcome(
                 driver,
                 success_timeout_seconds,
-            ).until(
-                _detect_login_outcome
+                await_captcha=more_attempts,
             )
+            timings['outcome_ms'] = _elapsed_ms(outcome_started_at)
+            _record_login_outcome(captcha_recorders, outcome)
             if outcome == LOGIN_REJECTED:
+                if more_attempts:
+                    prefetch = _prefetch_next_captcha(
+                        driver,
+                        captcha_pipeline,
+                        executor,
+                    )
                 logging.info(
                     "Login attempt #%d was rejected; retrying.",
                     attempt,
                 )
                 continue
         except TimeoutException:
+            outcome = LOGIN_TIMED_OUT
+            if outcome_started_at is not None:
+                timings['outcome_ms'] = _elapsed_ms(outcome_started_at)
+            _record_login_outcome(captcha_recorders, LOGIN_TIMED_OUT)
             logging.info(
                 "Login attempt #%d did not complete within %.1f seconds; "
                 "retrying.",
                 attempt,
                 success_timeout_seconds,
             )
+            started_at = time.monotonic()
             _refresh_login_page_for_retry(driver, attempt, max_retries)
+            timings['refresh_ms'] = _elapsed_ms(started_at)
+            if more_attempts:
+                prefetch = _prefetch_next_captcha(
+                    driver,
+                    captcha_pipeline,
+                    executor,
+                )
             continue
         except (
             RetryableCaptchaError,
             NoSuchElementException,
             StaleElementReferenceException,
         ) as error:
+            error_name = type(error).__name__
             logging.warning(
                 "Retryable login error on attempt #%d: %s",
                 attempt,
@@ -124,8 +546,32 @@ def retry_login(
                 attempt,
                 exc_info=(type(error), error, error.__traceback__),
             )
+            started_at = time.monotonic()
             _refresh_login_page_for_retry(driver, attempt, max_retries)
+            timings['refresh_ms'] = _elapsed_ms(started_at)
+            if more_attempts:
+                prefetch = _prefetch_next_captcha(
+                    driver,
+                    captcha_pipeline,
+                    executor,
+                )
             continue
+        except Exception as error:
+            error_name = type(error).__name__
+            raise
+        finally:
+            if login_telemetry is not None:
+                if current_prefetch is not None:
+                    login_telemetry.captcha_timings.update(
+                        current_prefetch.timings
+                    )
+                timings['total_ms'] = _elapsed_ms(attempt_started_at)
+                login_telemetry.record_attempt(
+                    attempt,
+                    outcome,
+                    timings,
+                    error_name,
+                )
 
         logging.info("Login successful on attempt #%d.", attempt)
         return True
@@ -137,15 +583,23 @@ def retry_login(
     return False
 
 
+def get_session_value(url):
+    """Return the portal ``SESSION`` query value of a URL, or None."""
+    session_values = parse_qs(urlsplit(url).query).get('SESSION')
+    return session_values[0] if session_values and session_values[0] else None
+
+
+def get_signature_page_url(session_value):
+    return f"{DIGITAL_SIGNATURE_URL}?{urlencode({'SESSION': session_value})}"
+
+
 def navigate(driver):
     """Open the signature page using the session ID from the portal URL."""
-    query = parse_qs(urlsplit(driver.current_url).query)
-    session_values = query.get('SESSION')
-    if not session_values or not session_values[0]:
+    session_value = get_session_value(driver.current_url)
+    if session_value is None:
         raise PortalNavigationError(
             "The portal login URL did not contain a SESSION value."
         )
 
-    destination = f"{DIGITAL_SIGNATURE_URL}?{urlencode({'SESSION': session_values[0]})}"
     logging.info("Navigating to the DigitalSignature page.")
-    driver.get(destination)
+    driver.get(get_signature_page_url(session_value))
@@ -0,0 +1,208 @@
+import ctypes
+import json
+import logging
+import time
+from pathlib import Path
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from autodigisign.file_helpers import write_atomically
+from autodigisign.logging_config import format_exception_summary
+from autodigisign.portal import get_session_value, get_signature_page_url
+from autodigisign.signing import SIGNATURE_BUTTON_ID
+
+
+SESSION_CACHE_FORMAT_VERSION = 1
+SESSION_CACHE_PATH = Path('outputs') / 'portal_session.bin'
+# Older sessions are not worth a probe; the portal expires them long before.
+SESSION_CACHE_MAX_AGE_SECONDS = 8 * 60 * 60
+SESSION_PROBE_TIMEOUT_SECONDS = 5
+CRYPTPROTECT_UI_FORBIDDEN = 0x1
+_DPAPI_ENTROPY = b'AutoDigiSign portal session'
+
+
+class SessionCacheError(RuntimeError):
+    """The portal session cache is unavailable or could not be decrypted."""
+
+
+class _DataBlob(ctypes.Structure):
+    _fields_ = [
+        ('cbData', ctypes.c_uint32),
+        ('pbData', ctypes.POINTER(ctypes.c_char)),
+    ]
+
+
+def _blob(data):
+    """Return a DATA_BLOB over ``data`` and the buffer that must outlive it."""
+    buffer = ctypes.create_string_buffer(data, len(data))
+    pointer = ctypes.cast(buffer, ctypes.POINTER(ctypes.c_char))
+    return _DataBlob(len(data), pointer), buffer
+
+
+def _call_dpapi(function_name, data):
+    crypt32 = ctypes.WinDLL('crypt32', use_last_error=True)
+    kernel32 = ctypes.WinDLL('kernel32')
+    input_blob, _input_buffer = _blob(data)
+    entropy_blob, _entropy_buffer = _blob(_DPAPI_ENTROPY)
+    output_blob = _DataBlob()
+    if not getattr(crypt32, function_name)(
+        ctypes.byref(input_blob),
+        None,
+        ctypes.byref(entropy_blob),
+        None,
+        None,
+        CRYPTPROTECT_UI_FORBIDDEN,
+        ctypes.byref(output_blob),
+    ):
+        raise SessionCacheError(
+            f"Windows {function_name} failed: "
+            f"{ctypes.WinError(ctypes.get_last_error())}"
+        )
+    try:
+        return ctypes.string_at(output_blob.pbData, output_blob.cbData)
+    finally:
+        kernel32.LocalFree(output_blob.pbData)
+
+
+class DpapiCipher:
+    """Encrypt with Windows DPAPI, which binds the key to the signed-in account."""
+
+    def protect(self, data):
+        return _call_dpapi('CryptProtectData', data)
+
+    def unprotect(self, data):
+        return _call_dpapi('CryptUnprotectData', data)
+
+
+def load_session_cipher(operating_system):
+    if operating_system != 'windows':
+        raise SessionCacheError(
+            "The portal session cache requires Windows DPAPI and is not "
+            f"available on {operating_system}."
+        )
+    return DpapiCipher()
+
+
+class SessionCache:
+    """Opt-in, encrypted store of the last signed-in portal session.
+
+    The ``SESSION`` value and the signature-page cookies are saved after
+    navigation succeeds. A later run restores them and probes the signature
+    page before falling back to a full login.
+    """
+
+    def __init__(
+        self,
+        cache_path,
+        cipher,
+        max_age_seconds=SESSION_CACHE_MAX_AGE_SECONDS,
+    ):
+        self.cache_path = Path(cache_path)
+        self.cipher = cipher
+        self.max_age_seconds = max_age_seconds
+
+    def save(self, driver):
+        """Store the session of the signature page the driver is showing."""
+        session_value = get_session_value(driver.current_url)
+        if session_value is None:
+            logging.warning(
+                "Portal session was not cached: the page has no SESSION value."
+            )
+            return
+        try:
+            payload = {
+                'format_version': SESSION_CACHE_FORMAT_VERSION,
+                'saved_at': time.time(),
+                'session': session_value,
+                'cookies': driver.get_cookies(),
+            }
+            encrypted = self.cipher.protect(json.dumps(payload).encode('utf-8'))
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomically(self.cache_path, encrypted)
+        except (OSError, SessionCacheError, WebDriverException) as error:
+            logging.warning(
+                "Could not cache the portal session: %s",
+                format_exception_summary(error),
+            )
+            return
+        logging.info("Portal session cached for the next run.")
+
+    def load(self):
+        """Return the cached session payload, or None when none is usable."""
+        try:
+            encrypted = self.cache_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as error:
+            logging.warning(
+                "Ignoring an unreadable portal session cache: %s",
+                format_exception_summary(error),
+            )
+            return None
+        try:
+            payload = json.loads(self.cipher.unprotect(encrypted))
+        except (SessionCacheError, ValueError) as error:
+            logging.warning(
+                "Ignoring a portal session cache that could not be decrypted: %s",
+                format_exception_summary(error),
+            )
+            self.clear()
+            return None
+        if (
+            not isinstance(payload, dict)
+            or payload.get('format_version') != SESSION_CACHE_FORMAT_VERSION
+            or not payload.get('session')
+        ):
+            logging.info("Discarding a portal session cache from another format.")
+            self.clear()
+            return None
+        if time.time() - payload.get('saved_at', 0) > self.max_age_seconds:
+            logging.info("Discarding an expired portal session cache.")
+            self.clear()
+            return None
+        return payload
+
+    def clear(self):
+        try:
+            self.cache_path.unlink(missing_ok=True)
+        except OSError as error:
+            logging.warning(
+                "Could not remove the portal session cache: %s",
+                format_exception_summary(error),
+            )
+
+    def restore(self, driver):
+        """Open the signature page with the cached session; False to log in."""
+        payload = self.load()
+        if payload is None:
+            return False
+        destination = get_signature_page_url(payload['session'])
+        try:
+            # Cookies can only be added for the domain the browser is on.
+            driver.get(destination)
+            for cookie in payload.get('cookies', []):
+                try:
+                    driver.add_cookie(cookie)
+                except WebDriverException as error:
+                    logging.debug(
+                        "Skipped a cached portal cookie: %s",
+                        format_exception_summary(error),
+                    )
+            driver.get(destination)
+            WebDriverWait(driver, SESSION_PROBE_TIMEOUT_SECONDS).until(
+                lambda current_driver: current_driver.find_elements(
+                    By.ID,
+                    SIGNATURE_BUTTON_ID,
+                )
+            )
+        except (TimeoutException, WebDriverException) as error:
+            logging.info(
+                "Cached portal session was not accepted; logging in: %s",
+                format_exception_summary(error),
+            )
+            self.clear()
+            return False
+        logging.info("Restored the cached portal session; login skipped.")
+        return True
@@ -1,8 +1,10 @@
 import logging
+import queue
 import re
 import time
 
 from selenium.common.exceptions import (
+    JavascriptException,
     NoSuchElementException,
     StaleElementReferenceException,
     TimeoutException,
@@ -18,7 +20,13 @@ from autodigisign.selenium_helpers import safe_find
 
 
 SIGNATURE_POLL_INTERVAL_SECONDS = 3
+# One status watch stays well below Selenium's default 30-second script
+# timeout; the signing deadlines are checked between watches.
+SIGNATURE_STATUS_WATCH_SECONDS = 10
 POPUP_CLOSE_WAIT_SECONDS = 3
+# Window handles are still read this often while waiting for a popup event,
+# so a lost event costs at most this much latency.
+POPUP_EVENT_RECHECK_SECONDS = 1
 EMPLOYEE_POSTBACK_WAIT_SECONDS = 1
 FIELD_ACTION_RETRIES = 3
 FIELD_RETRY_DELAY_SECONDS = 0.2
@@ -28,8 +36,62 @@ DETACHED_NODE_POSTBACK_ERROR = (
 POSSIBLE_READER_TYPE_ERROR_MESSAGE = '[-1]查無錯誤代碼定義'
 SIGNATURE_IN_PROGRESS_MESSAGE = '批次電子簽章作業中'
 SIGNATURE_BUTTON_ID = 'NTUHWeb1_btnDoSignatureByPCSC'
+NO_PENDING_RECORDS_MESSAGE = '查無待簽章電子病歷資料'
 SIGNATURE_POPUP_TIMEOUT_SECONDS = 30
 SIGNATURE_PROCESSING_TIMEOUT_SECONDS = 180
+# Timed stages of one signature, in order. ``in_progress`` ends when the popup
+# first reports signing in progress and ``terminal`` when a final result is
+# read; a stage that was not reached has no duration.
+SIGNING_STAGES = (
+    'employee_entry',
+    'employee_postback',
+    'pin_entry',
+    'popup_open',
+    'in_progress',
+    'terminal',
+    'cleanup',
+)
+
+
+# Resolve with the trimmed dsInfo text as soon as it differs from arguments[0],
+# or with the current text, possibly null, once the timeout expires. The whole
+# document is observed because a postback may replace dsInfo itself.
+_WATCH_SIGNATURE_STATUS_SCRIPT = """
+const previousText = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const readStatus = () => {
+    const status = document.getElementById('dsInfo');
+    return status ? status.innerText.trim() : null;
+};
+const changedStatus = () => {
+    const text = readStatus();
+    return text !== null && text !== previousText ? text : null;
+};
+const initialText = changedStatus();
+if (initialText !== null) {
+    done(initialText);
+    return;
+}
+let timer = null;
+const observer = new MutationObserver(() => {
+    const text = changedStatus();
+    if (text !== null) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(text);
+    }
+});
+observer.observe(document.documentElement, {
+    childList: true,
+    characterData: true,
+    subtree: true,
+});
+timer = setTimeout(() => {
+    observer.disconnect();
+    done(readStatus());
+}, timeoutMs);
+"""
 
 
 class SignatureError(RuntimeError):
@@ -73,7 +135,7 @@ def _evaluate_signature_message(
             "The connected reader may be the wrong type or may not support "
             "PCSC signing."
         )
-    if re.search(r'查無待簽章電子病歷資料|簽章完成', message):
+    if re.search(rf'{NO_PENDING_RECORDS_MESSAGE}|簽章完成', message):
         logging.info(log_context)
         return True
     component_error_pattern = (
@@ -109,6 +171,124 @@ def _wait_for_popup(driver, main_window, deadline):
     return None
 
 
+def _watch_signature_status(driver, last_message, timeout_seconds):
+    """Return the dsInfo text as soon as it changes, in one script call.
+
+    Returns the unchanged text, or None while dsInfo is missing, when the
+    timeout expires first. Raises WebDriverException when the watcher script
+    cannot run.
+    """
+    status = driver.execute_async_script(
+        _WATCH_SIGNATURE_STATUS_SCRIPT,
+        last_message,
+        int(min(timeout_seconds, SIGNATURE_STATUS_WATCH_SECONDS) * 1000),
+    )
+    if status is not None and not isinstance(status, str):
+        raise JavascriptException(
+            "The signing status watcher returned an unexpected result."
+        )
+    return status
+
+
+def _poll_signature_status(driver, timeout_seconds, employee_id, employee_name):
+    """Read dsInfo after the polling interval; None when it is unavailable."""
+    time.sleep(min(SIGNATURE_POLL_INTERVAL_SECONDS, max(timeout_seconds, 0)))
+    try:
+        return safe_find(driver, By.ID, 'dsInfo').text
+    except (
+        NoSuchElementException,
+        StaleElementReferenceException,
+    ) as error:
+        logging.warning(
+            "Employee ID: %s, Name: %s: could not refresh signing status: %s",
+            employee_id,
+            employee_name,
+            format_exception_summary(error),
+        )
+        logging.debug(
+            "Employee ID: %s, Name: %s: signing-status refresh traceback",
+            employee_id,
+            employee_name,
+            exc_info=(type(error), error, error.__traceback__),
+        )
+        return None
+
+
+class PopupWatcher:
+    """Wake on WebDriver BiDi ``browsingContext.contextCreated`` events.
+
+    The subscription is made once per batch. Top-level context IDs are the
+    WebDriver window handles of the new windows.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._created_contexts = queue.SimpleQueue()
+        self._callback_id = driver.browsing_context.add_event_handler(
+            'context_created',
+            self._context_created,
+        )
+
+    def _context_created(self, info):
+        if getattr(info, 'parent', None) is None:
+            self._created_contexts.put(info.context)
+
+    def clear(self):
+        """Forget windows opened before the next signing request."""
+        while True:
+            try:
+                self._created_contexts.get_nowait()
+            except queue.Empty:
+                return
+
+    def wait(self, main_window, deadline):
+        """Return the popup handle as soon as it opens, or None at the deadline."""
+        while True:
+            popup_handle = next(
+                (
+                    handle
+                    for handle in self.driver.window_handles
+                    if handle != main_window
+                ),
+                None,
+            )
+            if popup_handle:
+                return popup_handle
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                context = self._created_contexts.get(
+                    timeout=min(POPUP_EVENT_RECHECK_SECONDS, remaining)
+                )
+            except queue.Empty:
+                continue
+            if context != main_window:
+                return context
+
+    def close(self):
+        self.driver.browsing_context.remove_event_handler(
+            'context_created',
+            self._callback_id,
+        )
+
+
+def open_popup_watcher(driver):
+    """Return a PopupWatcher when the session has BiDi, otherwise None."""
+    if not isinstance(driver.caps.get('webSocketUrl'), str):
+        return None
+    try:
+        popup_watcher = PopupWatcher(driver)
+    except Exception as error:
+        logging.warning(
+            "Browser popup events are unavailable; polling window handles: %s",
+            format_exception_summary(error),
+        )
+        return None
+    logging.info("Signing popups are detected from browser events.")
+    return popup_watcher
+
+
 def _start_processing_deadline(message, processing_deadline):
     """Start the processing timeout once; repeated progress does not extend it."""
     if (
@@ -119,6 +299,13 @@ def _start_processing_deadline(message, processing_deadline):
     return processing_deadline
 
 
+def _record_stage(stage_timings, stage, started_at):
+    """Store one stage duration in milliseconds and return when it ended."""
+    ended_at = time.monotonic()
+    stage_timings[stage] = (ended_at - started_at) * 1000
+    return ended_at
+
+
 def _log_signature_elapsed(employee_id, employee_name, started_at):
     logging.info(
         "PCSC signing reached a successful terminal result for Employee ID: "
@@ -276,24 +463,45 @@ def digital_signature(
     employee_name,
     pincode,
     driver,
+    popup_watcher=None,
+    stage_timings=None,
 ):
-    """Perform one signature and leave WebDriver in a verified main-window state."""
+    """Perform one signature and leave WebDriver in a verified main-window state.
+
+    With a ``popup_watcher`` the signing popup is detected from browser
+    events; otherwise window handles are polled. The terminal popup message
+    is returned. An optional ``stage_timings`` dict receives the duration of
+    every SIGNING_STAGES stage reached, including on failure.
+    """
+    stage_timings = {} if stage_timings is None else stage_timings
     main_window = driver.current_window_handle
 
+    stage_started_at = time.monotonic()
     employee_field = _replace_input_value(
         driver,
         'NTUHWeb1_txbEmpNO',
         employee_id,
         Keys.ENTER,
     )
+    stage_started_at = _record_stage(
+        stage_timings,
+        'employee_entry',
+        stage_started_at,
+    )
 
     _wait_for_employee_postback(driver, employee_field)
+    stage_started_at = _record_stage(
+        stage_timings,
+        'employee_postback',
+        stage_started_at,
+    )
 
     _replace_input_value(
         driver,
         'NTUHWeb1_txbPinCode',
         pincode,
     )
+    _record_stage(stage_timings, 'pin_entry', stage_started_at)
 
     sign_button = safe_find(
         driver,
@@ -312,15 +520,25 @@ def digital_signature(
         SIGNATURE_POPUP_TIMEOUT_SECONDS,
         SIGNATURE_PROCESSING_TIMEOUT_SECONDS,
     )
+    if popup_watcher is not None:
+        popup_watcher.clear()
     sign_button.click()
 
-    popup_handle = _wait_for_popup(driver, main_window, popup_deadline)
+    if popup_watcher is not None:
+        popup_handle = popup_watcher.wait(main_window, popup_deadline)
+    else:
+        popup_handle = _wait_for_popup(driver, main_window, popup_deadline)
     if not popup_handle:
         raise SignatureTimeoutError(
             "No PCSC signing popup appeared within "
             f"{SIGNATURE_POPUP_TIMEOUT_SECONDS} seconds for Employee ID: "
             f"{employee_id}, Name: {employee_name}."
         )
+    status_started_at = _record_stage(
+        stage_timings,
+        'popup_open',
+        signing_started_at,
+    )
 
     try:
         driver.switch_to.window(popup_handle)
@@ -348,41 +566,52 @@ def digital_signature(
             employee_id,
             employee_name,
         ):
+            _record_stage(stage_timings, 'terminal', status_started_at)
             _log_signature_elapsed(
                 employee_id,
                 employee_name,
                 signing_started_at,
             )
-            return
+            return message
 
         processing_deadline = _start_processing_deadline(message, None)
+        if processing_deadline is not None:
+            status_started_at = _record_stage(
+                stage_timings,
+                'in_progress',
+                status_started_at,
+            )
         last_message = message
+        watch_status = True
         while True:
             active_deadline = processing_deadline or popup_deadline
             if time.monotonic() >= active_deadline:
                 break
             remaining = active_deadline - time.monotonic()
-            time.sleep(
-                min(SIGNATURE_POLL_INTERVAL_SECONDS, max(remaining, 0))
-            )
-            try:
-                current_message = safe_find(driver, By.ID, 'dsInfo').text
-            except (
-                NoSuchElementException,
-                StaleElementReferenceException,
-            ) as error:
-                logging.warning(
-                    "Employee ID: %s, Name: %s: could not refresh signing status: %s",
-                    employee_id,
-                    employee_name,
-                    format_exception_summary(error),
-                )
-                logging.debug(
-                    "Employee ID: %s, Name: %s: signing-status refresh traceback",
+            if watch_status:
+                try:
+                    current_message = _watch_signature_status(
+                        driver,
+                        last_message,
+                        remaining,
+                    )
+                except WebDriverException as error:
+                    watch_status = False
+                    logging.debug(
+                        "Signing status watcher unavailable; polling dsInfo "
+                        "every %d seconds: %s",
+                        SIGNATURE_POLL_INTERVAL_SECONDS,
+                        format_exception_summary(error),
+                    )
+                    continue
+            else:
+                current_message = _poll_signature_status(
+                    driver,
+                    remaining,
                     employee_id,
                     employee_name,
-                    exc_info=(type(error), error, error.__traceback__),
                 )
+            if current_message is None:
                 continue
 
             if current_message != last_message:
@@ -391,16 +620,24 @@ def digital_signature(
                     employee_id,
                     employee_name,
                 ):
+                    _record_stage(stage_timings, 'terminal', status_started_at)
                     _log_signature_elapsed(
                         employee_id,
                         employee_name,
                         signing_started_at,
                     )
-                    return
-                processing_deadline = _start_processing_deadline(
-                    current_message,
-                    processing_deadline,
-                )
+                    return current_message
+                if processing_deadline is None:
+                    processing_deadline = _start_processing_deadline(
+                        current_message,
+                        processing_deadline,
+                    )
+                    if processing_deadline is not None:
+                        status_started_at = _record_stage(
+                            stage_timings,
+                            'in_progress',
+                            status_started_at,
+                        )
                 last_message = current_message
 
         if processing_deadline is not None:
@@ -415,4 +652,8 @@ def digital_signature(
             f"ID: {employee_id}, Name: {employee_name}."
         )
     finally:
-        _restore_main_window(driver, main_window, popup_handle)
+        cleanup_started_at = time.monotonic()
+        try:
+            _restore_main_window(driver, main_window, popup_handle)
+        finally:
+            _record_stage(stage_timings, 'cleanup', cleanup_started_at)
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import date, datetime
+from pathlib import Path
+
+from autodigisign.logging_config import format_exception_summary
+
+
+SIGNING_JOURNAL_FORMAT_VERSION = 1
+SIGNING_JOURNAL_DIRECTORY = Path('outputs') / 'signing_journal'
+JOURNAL_SIGNED = 'signed'
+JOURNAL_NO_PENDING = 'no_pending'
+JOURNAL_FAILED = 'failed'
+# Outcomes that need no further popup or card work for the rest of the day.
+RESUMABLE_OUTCOMES = (JOURNAL_SIGNED, JOURNAL_NO_PENDING)
+
+
+def get_roster_hash(employees):
+    """Return a short digest that changes whenever the selected roster does."""
+    roster = json.dumps(
+        [[employee['id'], employee['name']] for employee in employees],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(roster.encode('utf-8')).hexdigest()[:12]
+
+
+def get_signing_journal_path(journal_directory, employees, run_date=None):
+    """Return the journal shared by every run of one roster on one day."""
+    run_date = date.today() if run_date is None else run_date
+    return (
+        Path(journal_directory)
+        / f'{run_date:%Y%m%d}_{get_roster_hash(employees)}.jsonl'
+    )
+
+
+class SigningJournal:
+    """Append-only record of each employee's terminal signing outcome.
+
+    Every record is flushed and fsync'd before the next employee starts, so a
+    browser crash or an aborted batch loses at most the employee in progress.
+    A resumed run skips employees already recorded as signed or as having no
+    pending records.
+    """
+
+    def __init__(self, journal_path):
+        self.journal_path = Path(journal_path)
+
+    def record(self, employee_id, outcome, error=None):
+        entry = {
+            'format_version': SIGNING_JOURNAL_FORMAT_VERSION,
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'employee_id': employee_id,
+            'outcome': outcome,
+            'error': error,
+        }
+        try:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.journal_path.open('a', encoding='utf-8') as journal_file:
+                journal_file.write(json.dumps(entry) + '\n')
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+        except OSError as error:
+            logging.warning(
+                "Could not record the signing journal: %s",
+                format_exception_summary(error),
+            )
+
+    def completed_outcomes(self):
+        """Return ``{employee_id: outcome}`` for employees needing no work.
+
+        The latest record for an employee wins. A torn final line left by a
+        crash is ignored.
+        """
+        try:
+            lines = self.journal_path.read_text(encoding='utf-8').splitlines()
+        except FileNotFoundError:
+            return {}
+        except OSError as error:
+            logging.warning(
+                "Ignoring an unreadable signing journal: %s",
+                format_exception_summary(error),
+            )
+            return {}
+        latest_outcomes = {}
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if (
+                not isinstance(entry, dict)
+                or entry.get('format_version') != SIGNING_JOURNAL_FORMAT_VERSION
+            ):
+                continue
+            latest_outcomes[entry.get('employee_id')] = entry.get('outcome')
+        return {
+            employee_id: outcome
+            for employee_id, outcome in latest_outcomes.items()
+            if outcome in RESUMABLE_OUTCOMES
+        }
+
+    def remaining_employees(self, employees):
+        """Return the employees that the journal does not mark as done."""
+        completed_outcomes = self.completed_outcomes()
+        remaining = []
+        for employee in employees:
+            outcome = completed_outcomes.get(employee['id'])
+            if outcome is None:
+                remaining.append(employee)
+                continue
+            logging.info(
+                "Resume: skipping Employee ID: %s, Name: %s, already "
+                "recorded as %s today.",
+                employee['id'],
+                employee['name'],
+                outcome,
+            )
+        logging.info(
+            "Resume: %d of %d employee(s) remain from %s.",
+            len(remaining),
+            len(employees),
+            self.journal_path.name,
+        )
+        return remaining
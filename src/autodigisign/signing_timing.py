@@ -0,0 +1,101 @@
+import json
+import logging
+import math
+from pathlib import Path
+
+from autodigisign.file_helpers import write_atomically
+from autodigisign.logging_config import (
+    format_exception_summary,
+    get_run_artifact_path,
+)
+from autodigisign.signing import SIGNING_STAGES
+
+
+SIGNING_TIMING_FORMAT_VERSION = 1
+
+
+def get_signing_timing_path(info_log_filepath):
+    """Return the signing timing file that sits next to one run's INFO log."""
+    return Path(get_run_artifact_path(info_log_filepath, 'signing.json'))
+
+
+def _percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted list."""
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class SigningTimingReport:
+    """Collect the stage durations of every signature in one batch.
+
+    Each employee is recorded by position in the batch rather than by ID so
+    the file can be shared when diagnosing slow runs. ``finish`` logs the
+    p50, p90 and maximum of every stage and writes the per-employee records.
+    """
+
+    def __init__(self, report_path):
+        self.report_path = Path(report_path)
+        self.employees = []
+
+    def add(self, outcome, stage_timings, error=None):
+        record = {
+            'employee': len(self.employees) + 1,
+            'outcome': outcome,
+            'error': error,
+        }
+        for stage in SIGNING_STAGES:
+            duration = stage_timings.get(stage)
+            record[f'{stage}_ms'] = (
+                None if duration is None else round(duration, 1)
+            )
+        self.employees.append(record)
+
+    def summary(self):
+        """Return ``{stage: {count, p50_ms, p90_ms, max_ms}}`` over all records."""
+        stage_summary = {}
+        for stage in SIGNING_STAGES:
+            durations = sorted(
+                record[f'{stage}_ms']
+                for record in self.employees
+                if record[f'{stage}_ms'] is not None
+            )
+            if not durations:
+                continue
+            stage_summary[stage] = {
+                'count': len(durations),
+                'p50_ms': _percentile(durations, 0.5),
+                'p90_ms': _percentile(durations, 0.9),
+                'max_ms': durations[-1],
+            }
+        return stage_summary
+
+    def finish(self):
+        if not self.employees:
+            return
+        stage_summary = self.summary()
+        for stage, statistics in stage_summary.items():
+            logging.info(
+                "Signing stage %s: count=%d, p50_ms=%.1f, p90_ms=%.1f, "
+                "max_ms=%.1f",
+                stage,
+                statistics['count'],
+                statistics['p50_ms'],
+                statistics['p90_ms'],
+                statistics['max_ms'],
+            )
+        report = {
+            'format_version': SIGNING_TIMING_FORMAT_VERSION,
+            'summary': stage_summary,
+            'employees': self.employees,
+        }
+        try:
+            self.report_path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomically(
+                self.report_path,
+                json.dumps(report, indent=2).encode('utf-8'),
+            )
+        except OSError as error:
+            logging.warning(
+                "Could not write the signing timing report: %s",
+                format_exception_summary(error),
+            )
@@ -1,48 +1,114 @@
 import logging
 
-from autodigisign.logging_config import log_exception
+from autodigisign.logging_config import format_exception_summary, log_exception
 from autodigisign.signing import (
+    NO_PENDING_RECORDS_MESSAGE,
     SignatureDriverStateError,
     SignatureReaderTypeError,
     digital_signature,
+    open_popup_watcher,
 )
+from autodigisign.signing_journal import (
+    JOURNAL_FAILED,
+    JOURNAL_NO_PENDING,
+    JOURNAL_SIGNED,
+)
+
+
+def _record_failure(
+    employee_id,
+    error,
+    stage_timings,
+    timing_report,
+    journal,
+):
+    if timing_report is not None:
+        timing_report.add('failed', stage_timings, type(error).__name__)
+    if journal is not None:
+        journal.record(employee_id, JOURNAL_FAILED, type(error).__name__)
 
 
 def process_employees(
     driver,
     employees,
     pincode,
+    timing_report=None,
+    journal=None,
 ):
     """Process employees and return the number of recoverable failures.
 
     Reader-type and driver-state errors still stop the batch immediately because
     they affect every remaining employee or make further browser use unsafe.
+    An optional ``timing_report`` receives the stage timings of every employee
+    and is finished when the batch ends, including when it stops early. An
+    optional ``journal`` records each employee's outcome as soon as it is
+    known so a later run can resume the batch.
     """
     failed_employee_count = 0
-    for employee in employees:
-        employee_id = employee['id']
-        employee_name = employee['name']
-        try:
-            digital_signature(
-                employee_id,
-                employee_name,
-                pincode,
-                driver,
-            )
-            logging.info(
-                "Digital signature performed for Employee ID: %s, Name: %s",
-                employee_id,
-                employee_name,
-            )
-        except (SignatureReaderTypeError, SignatureDriverStateError):
-            # Both conditions affect every remaining employee, so continuing the
-            # batch would produce repeated failures or use an incompatible reader.
-            raise
-        except Exception as error:
-            failed_employee_count += 1
-            log_exception(
-                "Error processing Employee ID: "
-                f"{employee_id}, Name: {employee_name}",
-                error,
-            )
+    popup_watcher = open_popup_watcher(driver)
+    try:
+        for employee in employees:
+            employee_id = employee['id']
+            employee_name = employee['name']
+            stage_timings = {}
+            try:
+                message = digital_signature(
+                    employee_id,
+                    employee_name,
+                    pincode,
+                    driver,
+                    popup_watcher=popup_watcher,
+                    stage_timings=stage_timings,
+                )
+                if timing_report is not None:
+                    timing_report.add('signed', stage_timings)
+                if journal is not None:
+                    journal.record(
+                        employee_id,
+                        JOURNAL_NO_PENDING
+                        if NO_PENDING_RECORDS_MESSAGE in message
+                        else JOURNAL_SIGNED,
+                    )
+                logging.info(
+                    "Digital signature performed for Employee ID: %s, Name: %s",
+                    employee_id,
+                    employee_name,
+                )
+            except (SignatureReaderTypeError, SignatureDriverStateError) as error:
+                _record_failure(
+                    employee_id,
+                    error,
+                    stage_timings,
+                    timing_report,
+                    journal,
+                )
+                # Both conditions affect every remaining employee, so
+                # continuing the batch would produce repeated failures or use
+                # an incompatible reader.
+                raise
+            except Exception as error:
+                failed_employee_count += 1
+                _record_failure(
+                    employee_id,
+                    error,
+                    stage_timings,
+                    timing_report,
+                    journal,
+                )
+                log_exception(
+                    "Error processing Employee ID: "
+                    f"{employee_id}, Name: {employee_name}",
+                    error,
+                )
+    finally:
+        if timing_report is not None:
+            timing_report.finish()
+        if popup_watcher is not None:
+            try:
+                popup_watcher.close()
+            except Exception as error:
+                logging.debug(
+                    "Could not unsubscribe from browser popup events: %s",
+                    format_exception_summary(error),
+                )
     return failed_employee_count
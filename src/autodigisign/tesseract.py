@@ -1,12 +1,15 @@
+import ctypes.util
 import os
 import re
 import shutil
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 
 TESSERACT_VERSION_PATTERN = re.compile(r'\d+(?:\.\d+){1,3}')
+TESSERACT_THREAD_LIMIT_VARIABLE = 'OMP_THREAD_LIMIT'
 
 
 class TesseractConfigurationError(RuntimeError):
@@ -20,6 +23,12 @@ class TesseractSelection:
     source: str
 
 
+@dataclass(frozen=True)
+class TesseractLibrary:
+    library_path: str
+    tessdata_path: Optional[Path]
+
+
 def _subprocess_options(operating_system):
     if operating_system == 'windows':
         return {'creationflags': getattr(subprocess, 'CREATE_NO_WINDOW', 0)}
@@ -227,3 +236,67 @@ def configure_pytesseract(operating_system, environment=None):
     )
     pytesseract.pytesseract.tesseract_cmd = str(selection.executable_path)
     return selection
+
+
+def limit_tesseract_threads(thread_limit, environment=None):
+    """Cap the OpenMP threads of every Tesseract child process started later.
+
+    Concurrent OCR strategies each start their own Tesseract process, so the
+    engine's internal threading must be bounded to avoid oversubscribing cores.
+    """
+    if thread_limit <= 0:
+        raise ValueError("thread_limit must be greater than zero.")
+    environment = os.environ if environment is None else environment
+    environment[TESSERACT_THREAD_LIMIT_VARIABLE] = str(thread_limit)
+
+
+def _bundled_library_candidates(executable_path, operating_system):
+    executable_path = Path(executable_path).resolve()
+    if operating_system == 'windows':
+        return sorted(executable_path.parent.glob('libtesseract*.dll'), reverse=True)
+    if operating_system == 'macos':
+        return sorted(
+            (executable_path.parent.parent / 'lib').glob('libtesseract*.dylib'),
+            reverse=True,
+        )
+    return []
+
+
+def _tessdata_candidates(executable_path, operating_system):
+    executable_path = Path(executable_path).resolve()
+    if operating_system == 'windows':
+        return (executable_path.parent / 'tessdata',)
+    return (executable_path.parent.parent / 'share' / 'tessdata',)
+
+
+def find_tesseract_library(executable_path, operating_system):
+    """Return the libtesseract installed with the selected executable, if any.
+
+    The resident OCR engine must use the same installation as the verified
+    executable, so the bundled library is preferred over the loader search path.
+    """
+    library_path = next(
+        (
+            str(candidate)
+            for candidate in _bundled_library_candidates(
+                executable_path,
+                operating_system,
+            )
+            if candidate.is_file()
+        ),
+        None,
+    ) or ctypes.util.find_library('tesseract')
+    if library_path is None:
+        return None
+    tessdata_path = next(
+        (
+            candidate
+            for candidate in _tessdata_candidates(
+                executable_path,
+                operating_system,
+            )
+            if candidate.is_dir()
+        ),
+        None,
+    )
+    return TesseractLibrary(library_path, tessdata_path)
@@ -0,0 +1,411 @@
+import base64
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import cv2
+import numpy as np
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from autodigisign import bench  # noqa: E402
+from autodigisign.captcha import PNG_SIGNATURE, StrategyResult  # noqa: E402
+from autodigisign.captcha_corpus import CaptchaCorpus  # noqa: E402
+from autodigisign.portal import LOGIN_SUCCEEDED  # noqa: E402
+
+
+class FakeBackend:
+    name = 'fake'
+
+    def __init__(self):
+        self.calls = 0
+
+    def image_to_string(self, processed_image, page_segmentation_mode):
+        self.calls += 1
+        return 'AB12C3'
+
+    def close(self):
+        pass
+
+
+def write_captcha_png(path, text='AB12C3'):
+    image = np.full((20, 80), 255, dtype=np.uint8)
+    cv2.putText(
+        image,
+        text,
+        (1, 15),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.4,
+        0,
+        1,
+        cv2.LINE_AA,
+    )
+    cv2.imwrite(str(path), image)
+    return path
+
+
+class FakeCaptureDriver:
+    def __init__(self):
+        self.image_element = MagicMock()
+        self.displayed = []
+
+    def execute_async_script(self, script, encoded_png):
+        png = base64.b64decode(encoded_png)
+        self.displayed.append(png)
+        self.image_element.screenshot_as_png = png
+        return self.image_element
+
+    def execute_script(self, script, image_element):
+        image = cv2.imdecode(
+            np.frombuffer(self.displayed[-1], dtype=np.uint8),
+            cv2.IMREAD_GRAYSCALE,
+        )
+        return [
+            image.shape[1],
+            image.shape[0],
+            base64.b64encode(image.tobytes()).decode('ascii'),
+        ]
+
+
+class BenchTests(unittest.TestCase):
+    def test_ocr_backend_benchmark_reports_per_call_latency(self):
+        backend = FakeBackend()
+        images = [('a.png', np.full((20, 80), 255, dtype=np.uint8))] * 2
+
+        results = bench.benchmark_ocr_backends(images, [backend], repeat=3)
+
+        self.assertEqual(backend.calls, 7)
+        self.assertEqual(results[0]['backend'], 'fake')
+        self.assertEqual(results[0]['calls'], 6)
+        self.assertGreaterEqual(results[0]['p95_ms'], results[0]['p50_ms'])
+
+    def test_ocr_backend_command_prints_one_row_per_backend(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            image_path = write_captcha_png(Path(temporary_directory) / 'a.png')
+            output = io.StringIO()
+            with patch.object(bench, '_configure_tesseract', return_value=None):
+                with patch.object(
+                    bench,
+                    'load_ocr_backend',
+                    return_value=FakeBackend(),
+                ):
+                    exit_code = bench.main(
+                        ['ocr-backends', str(image_path), '--repeat', '1'],
+                        output=output,
+                    )
+
+        self.assertEqual(exit_code, 0)
+        lines = output.getvalue().splitlines()
+        self.assertIn('backend', lines[0])
+        self.assertEqual(len(lines), 3)
+
+    def test_capture_benchmark_times_both_paths_on_each_image(self):
+        driver = FakeCaptureDriver()
+        with tempfile.TemporaryDirectory() as directory:
+            image_paths = [
+                write_captcha_png(Path(directory) / 'AB12C3.png'),
+                write_captcha_png(Path(directory) / 'DE45F6.png', 'DE45F6'),
+            ]
+
+            results = bench.benchmark_capture_paths(driver, image_paths, repeat=2)
+
+        self.assertEqual(len(driver.displayed), 2)
+        self.assertEqual(
+            [(row['method'], row['calls']) for row in results],
+            [('screenshot', 4), ('canvas', 4)],
+        )
+        self.assertEqual(results[1]['payload_kb'], 2136 / 1024)
+        self.assertEqual(results[1]['same_size_rate'], 1.0)
+
+    def test_labels_come_from_corpus_sidecars_or_filenames(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            directory = Path(temporary_directory)
+            write_captcha_png(directory / 'ab12c3_001.png')
+            write_captcha_png(directory / 'unlabelled.png')
+            filename_samples = bench.load_labelled_samples(directory)
+
+            corpus_directory = directory / 'corpus'
+            corpus = CaptchaCorpus(corpus_directory)
+            result = StrategyResult('otsu-psm8', 'ZX98Y7', True, 1.0)
+            corpus.record_capture(PNG_SIGNATURE + b'x', result, [result])
+            corpus.record_outcome(LOGIN_SUCCEEDED)
+            corpus_samples = bench.load_labelled_samples(corpus_directory)
+
+        self.assertEqual(
+            [label for _, label in filename_samples],
+            ['AB12C3', None],
+        )
+        self.assertEqual([label for _, label in corpus_samples], ['ZX98Y7'])
+
+    def test_glyph_bank_is_built_from_corpus_labels(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            directory = Path(temporary_directory)
+            png_bytes = write_captcha_png(directory / 'source.png').read_bytes()
+            corpus_directory = directory / 'corpus'
+            corpus = CaptchaCorpus(corpus_directory)
+            result = StrategyResult('otsu-psm8', 'AB12C3', True, 1.0)
+            corpus.record_capture(png_bytes, result, [result])
+            corpus.record_outcome(LOGIN_SUCCEEDED)
+            with patch.object(bench, 'build_glyph_bank') as build:
+                build.return_value.labels = list('AB12C3')
+                with patch.object(bench, 'save_glyph_bank'):
+                    exit_code = bench.main(
+                        ['build-glyph-bank', str(corpus_directory)],
+                        output=io.StringIO(),
+                    )
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(
+            [label for _, label in build.call_args.args[0]],
+            ['AB12C3'],
+        )
+
+    def test_captcha_benchmark_reports_accuracy_and_pipeline_attempts(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            directory = Path(temporary_directory)
+            samples = [
+                (write_captcha_png(directory / 'a.png'), 'AB12C3'),
+                (write_captcha_png(directory / 'b.png'), 'CD34E5'),
+            ]
+            # Strategy order per sample: otsu-psm8, adaptive-psm7.
+            candidates = iter(['AB12C3', 'AB12C8', 'CD34', 'CD34E5'])
+            with patch.object(
+                bench,
+                'recognize_captcha',
+                side_effect=lambda *_: next(candidates),
+            ):
+                results = bench.benchmark_captcha_strategies(
+                    samples,
+                    strategies=(
+                        ('otsu-psm8', 'otsu', 8),
+                        ('adaptive-psm7', 'adaptive', 7),
+                    ),
+                )
+
+        by_strategy = {result['strategy']: result for result in results}
+        self.assertEqual(by_strategy['otsu-psm8']['accuracy'], 0.5)
+        self.assertEqual(by_strategy['otsu-psm8']['format_valid_rate'], 0.5)
+        self.assertEqual(by_strategy['otsu-psm8']['expected_attempts'], 2)
+        self.assertEqual(by_strategy['adaptive-psm7']['accuracy'], 0.5)
+        self.assertEqual(by_strategy['pipeline']['accuracy'], 1.0)
+        self.assertEqual(by_strategy['pipeline']['expected_attempts'], 1)
+        self.assertGreaterEqual(
+            by_strategy['pipeline']['p99_ms'],
+            by_strategy['pipeline']['p50_ms'],
+        )
+
+    def test_quality_gate_benchmark_counts_false_skips(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            directory = Path(temporary_directory)
+            samples = [
+                (write_captcha_png(directory / 'a.png'), 'AB12C3'),
+                (write_captcha_png(directory / 'b.png'), 'CD34E5'),
+                (write_captcha_png(directory / 'c.png'), 'EF56G7'),
+            ]
+            with patch.object(
+                bench,
+                'captcha_quality_problem',
+                side_effect=[None, 'contrast=10', 'glyph_blobs=1'],
+            ):
+                with patch.object(
+                    bench,
+                    'recognize_captcha',
+                    side_effect=['CD34E5', 'XY', 'EF56G8'],
+                ) as recognize:
+                    result = bench.benchmark_quality_gate(
+                        samples,
+                        strategies=(
+                            ('otsu-psm8', 'otsu', 8),
+                            ('adaptive-psm7', 'adaptive', 7),
+                        ),
+                    )
+
+        self.assertEqual(recognize.call_count, 3)
+        self.assertEqual(
+            (result['samples'], result['gated'], result['false_skips']),
+            (3, 2, 1),
+        )
+        self.assertEqual(result['false_skip_rate'], 0.5)
+
+    def test_captcha_command_writes_quality_gate_to_json(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            directory = Path(temporary_directory)
+            write_captcha_png(directory / 'AB12C3.png')
+            json_path = directory / 'report.json'
+            # The command installs its backend process-wide; restore it after.
+            with patch('autodigisign.captcha._ocr_backend'):
+                with patch.object(bench, '_configure_tesseract', return_value=None):
+                    with patch.object(
+                        bench,
+                        'load_ocr_backend',
+                        return_value=FakeBackend(),
+                    ):
+                        exit_code = bench.main(
+                            [
+                                'captcha',
+                                str(directory),
+                                '--quality-gate',
+                                '--json',
+                                str(json_path),
+                            ],
+                            output=io.StringIO(),
+                        )
+            report = json.loads(json_path.read_text(encoding='utf-8'))
+
+        self.assertEqual(exit_code, 0)
+        self.assertIn(
+            'pipeline',
+            [row['strategy'] for row in report['strategies']],
+        )
+        self.assertEqual(report['quality_gate']['samples'], 1)
+
+    def test_quality_gate_uses_the_benchmarked_strategies(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            write_captcha_png(Path(temporary_directory) / 'AB12C3.png')
+            with patch('autodigisign.captcha._ocr_backend'):
+                with patch.object(bench, '_configure_tesseract', return_value=None):
+                    with patch.object(
+                        bench,
+                        'load_ocr_backend',
+                        return_value=FakeBackend(),
+                    ):
+                        with patch.object(
+                            bench,
+                            'benchmark_quality_gate',
+                            return_value={'samples': 1},
+                        ) as gate:
+                            bench.main(
+                                [
+                                    'captcha',
+                                    temporary_directory,
+                                    '--denoise',
+                                    '--quality-gate',
+                                ],
+                                output=io.StringIO(),
+                            )
+
+        strategy_names = [strategy[0] for strategy in gate.call_args.args[1]]
+        self.assertIn('otsu-psm8+cc', strategy_names)
+        self.assertIsNone(gate.call_args.kwargs['template_recognizer'])
+
+    def test_undefined_rates_are_written_as_json_null(self):
+        def reject_constant(name):
+            raise ValueError(f"non-standard JSON constant {name}")
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            directory = Path(temporary_directory)
+            # An unlabelled sample that the gate passes leaves the accuracy,
+            # expected attempts and false-skip rate undefined.
+            write_captcha_png(directory / 'unlabelled.png')
+            json_path = directory / 'report.json'
+            with patch('autodigisign.captcha._ocr_backend'):
+                with patch.object(bench, '_configure_tesseract', return_value=None):
+                    with patch.object(
+                        bench,
+                        'load_ocr_backend',
+                        return_value=FakeBackend(),
+                    ):
+                        bench.main(
+                            [
+                                'captcha',
+                                str(directory),
+                                '--quality-gate',
+                                '--json',
+                                str(json_path),
+                            ],
+                            output=io.StringIO(),
+                        )
+            report = json.loads(
+                json_path.read_text(encoding='utf-8'),
+                parse_constant=reject_constant,
+            )
+
+        pipeline = report['strategies'][-1]
+        self.assertEqual(pipeline['strategy'], 'pipeline')
+        self.assertIsNone(pipeline['accuracy'])
+        self.assertIsNone(pipeline['expected_attempts'])
+        self.assertEqual(report['quality_gate']['gated'], 0)
+        self.assertIsNone(report['quality_gate']['false_skip_rate'])
+
+    def test_json_ready_replaces_non_finite_floats(self):
+        self.assertEqual(
+            bench.json_ready(
+                {'rate': float('nan'), 'rows': [float('inf'), 1.5, 'x']}
+            ),
+            {'rate': None, 'rows': [None, 1.5, 'x']},
+        )
+
+    def test_unavailable_backend_is_a_clean_exit(self):
+        with patch.object(bench, '_configure_tesseract', return_value=None):
+            with tempfile.TemporaryDirectory() as temporary_directory:
+                write_captcha_png(Path(temporary_directory) / 'AB12C3.png')
+                with self.assertRaisesRegex(SystemExit, 'tesseract-api'):
+                    bench.main(
+                        [
+                            'captcha',
+                            temporary_directory,
+                            '--backend',
+                            'tesseract-api',
+                        ],
+                        output=io.StringIO(),
+                    )
+
+    def test_tuning_an_unlabelled_corpus_is_a_clean_exit(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            write_captcha_png(Path(temporary_directory) / 'unlabelled.png')
+            with patch('autodigisign.captcha._ocr_backend'):
+                with patch.object(bench, '_configure_tesseract', return_value=None):
+                    with patch.object(
+                        bench,
+                        'load_ocr_backend',
+                        return_value=FakeBackend(),
+                    ):
+                        with self.assertRaisesRegex(
+                            SystemExit,
+                            'requires labelled CAPTCHA samples',
+                        ):
+                            bench.main(
+                                ['tune', temporary_directory, '--trials', '1'],
+                                output=io.StringIO(),
+                            )
+
+    def test_training_on_an_empty_corpus_is_a_clean_exit(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            with self.assertRaisesRegex(SystemExit, 'at least two labelled'):
+                bench.main(
+                    ['train-cnn', temporary_directory],
+                    output=io.StringIO(),
+                )
+
+    def test_glyph_bank_from_an_empty_corpus_is_a_clean_exit(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            with self.assertRaisesRegex(SystemExit, 'could be segmented'):
+                bench.main(
+                    ['build-glyph-bank', temporary_directory],
+                    output=io.StringIO(),
+                )
+
+    def test_denoised_twins_keep_strategy_settings(self):
+        twins = bench.denoised_strategies(
+            (
+                ('otsu-psm8', 'otsu', 8),
+                ('adaptive-psm7', 'adaptive', 7),
+            )
+        )
+
+        self.assertEqual(
+            [(name, psm) for name, _, psm in twins],
+            [('otsu-psm8+cc', 8), ('adaptive-psm7+cc', 7)],
+        )
+        self.assertTrue(all(settings.denoise for _, settings, _ in twins))
+        self.assertEqual(twins[1][1].blur_kernel, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
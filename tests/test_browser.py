@@ -63,6 +63,7 @@ class BrowserTests(unittest.TestCase):
         start_browser.assert_called_once_with(
             'chrome',
             Path('chromedriver.exe'),
+            False,
         )
         warning_messages = [
             record.getMessage()
@@ -1,11 +1,19 @@
+import base64
+import ctypes
 import sys
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import MagicMock, call, patch
 
 import cv2
 import numpy as np
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.common.exceptions import (
+    JavascriptException,
+    TimeoutException,
+    WebDriverException,
+)
 from selenium.webdriver.common.by import By
 
 
@@ -14,15 +22,32 @@ sys.path.insert(0, str(PROJECT_ROOT / 'src'))
 
 from autodigisign.captcha import (  # noqa: E402
     CAPTCHA_IMAGE_LOAD_TIMEOUT_SECONDS,
+    CAPTCHA_OCR_STRATEGIES,
     PNG_SIGNATURE,
     CaptchaCaptureError,
     CaptchaRecognitionError,
+    OcrBackendError,
+    PreprocessingSettings,
+    PytesseractBackend,
+    StrategyResult,
+    TesseractApiBackend,
+    _ProcessedImages,
+    _recognize_concurrently,
     _wait_for_captcha_image,
     capture_captcha_bytes,
+    capture_captcha_pixels,
+    assess_captcha_quality,
+    captcha_quality_problem,
     decode_captcha_image,
+    denoise_captcha,
     get_captcha_text,
+    load_ocr_backend,
     preprocess_captcha,
     recognize_captcha,
+    recognize_captcha_scored,
+    recognize_captcha_tiles,
+    set_captcha_strategies,
+    vote_on_candidates,
 )
 
 
@@ -32,6 +57,39 @@ class _BrokenScreenshotElement:
         raise WebDriverException('browser capture failed')
 
 
+class FakeTesseractLibrary:
+    def __init__(self, text=b'ab12c3\n'):
+        self.text = ctypes.create_string_buffer(text)
+        self.calls = []
+        for name in (
+            'TessBaseAPICreate',
+            'TessBaseAPIInit2',
+            'TessBaseAPISetVariable',
+            'TessBaseAPISetPageSegMode',
+            'TessBaseAPISetImage',
+            'TessBaseAPIGetUTF8Text',
+            'TessBaseAPIMeanTextConf',
+            'TessDeleteText',
+            'TessBaseAPIClear',
+            'TessBaseAPIEnd',
+            'TessBaseAPIDelete',
+            'TessBaseAPIRecognize',
+            'TessBaseAPIGetIterator',
+            'TessResultIteratorGetPageIterator',
+            'TessResultIteratorGetUTF8Text',
+            'TessPageIteratorBoundingBox',
+            'TessResultIteratorNext',
+            'TessResultIteratorDelete',
+        ):
+            setattr(self, name, MagicMock(name=name))
+        self.TessBaseAPICreate.return_value = 1234
+        self.TessBaseAPIInit2.return_value = 0
+        self.TessBaseAPIGetUTF8Text.return_value = ctypes.addressof(self.text)
+        self.TessBaseAPIMeanTextConf.return_value = 91
+        self.TessBaseAPIRecognize.return_value = 0
+        self.TessBaseAPIGetIterator.return_value = 5678
+
+
 class CaptchaTests(unittest.TestCase):
     def test_capture_returns_browser_rendered_png_bytes(self):
         image_element = MagicMock()
@@ -55,6 +113,65 @@ class CaptchaTests(unittest.TestCase):
         with self.assertRaisesRegex(CaptchaCaptureError, 'valid PNG'):
             capture_captcha_bytes(image_element)
 
+    def test_canvas_capture_builds_grayscale_array_without_png(self):
+        pixels = np.arange(6, dtype=np.uint8).reshape(2, 3)
+        driver = MagicMock()
+        driver.execute_script.return_value = [
+            3,
+            2,
+            base64.b64encode(pixels.tobytes()).decode('ascii'),
+        ]
+        image_element = MagicMock()
+
+        image = capture_captcha_pixels(driver, image_element)
+
+        np.testing.assert_array_equal(image, pixels)
+        self.assertIs(driver.execute_script.call_args.args[1], image_element)
+        image_element.screenshot_as_png.assert_not_called()
+
+    def test_unreadable_canvas_is_capture_error(self):
+        for script_result in (
+            {'side_effect': JavascriptException('tainted canvas')},
+            {'return_value': None},
+            {'return_value': [4, 4, 'AAAA']},
+        ):
+            with self.subTest(script_result=script_result):
+                driver = MagicMock()
+                driver.execute_script.configure_mock(**script_result)
+
+                with self.assertRaises(CaptchaCaptureError):
+                    capture_captcha_pixels(driver, MagicMock())
+
+    def test_canvas_capture_falls_back_to_screenshot(self):
+        screenshot = np.full((4, 4), 255, dtype=np.uint8)
+        image_element = MagicMock()
+        image_element.screenshot_as_png = cv2.imencode('.png', screenshot)[1].tobytes()
+        driver = MagicMock()
+        driver.execute_script.side_effect = JavascriptException('tainted canvas')
+
+        with patch(
+            'autodigisign.captcha._wait_for_captcha_image',
+            return_value=image_element,
+        ):
+            with patch(
+                'autodigisign.captcha.recognize_captcha',
+                return_value='AB12C3',
+            ) as recognize:
+                timings = {}
+                result = get_captcha_text(
+                    driver,
+                    capture_method='canvas',
+                    timings=timings,
+                )
+
+        self.assertEqual(result, 'AB12C3')
+        driver.execute_script.assert_called_once()
+        self.assertEqual(recognize.call_args.args[0].shape, (12, 12))
+        self.assertEqual(
+            set(timings),
+            {'image_wait_ms', 'capture_ms', 'decode_ms', 'preprocess_ms', 'ocr_ms'},
+        )
+
     def test_decode_and_preprocess_image_without_files(self):
         original = np.full((20, 80), 255, dtype=np.uint8)
         cv2.putText(
@@ -78,6 +195,84 @@ class CaptchaTests(unittest.TestCase):
         self.assertEqual(otsu.shape, (60, 240))
         self.assertEqual(adaptive.shape, (60, 240))
 
+    def test_denoising_removes_specks_and_lines_and_crops_to_text(self):
+        image = np.full((60, 200), 255, dtype=np.uint8)
+        image[20:45, 60:68] = 0
+        image[20:45, 90:110] = 0
+        image[2:4, 2:4] = 0
+        image[50, 0:200] = 0
+
+        cleaned = denoise_captcha(image, min_component_area=30)
+
+        self.assertEqual(cleaned.shape, (25 + 16, 50 + 16))
+        self.assertEqual(int((cleaned == 0).sum()), 25 * 8 + 25 * 20)
+        blank = np.full((20, 20), 255, dtype=np.uint8)
+        self.assertIs(denoise_captcha(blank, 30), blank)
+
+    def test_quality_statistics_flag_blank_and_cluttered_images(self):
+        readable = np.full((30, 100), 230, dtype=np.uint8)
+        for left in range(8, 92, 15):
+            readable[6:24, left:left + 5] = 20
+        blank = np.full((30, 100), 200, dtype=np.uint8)
+        cluttered = np.full((30, 100), 230, dtype=np.uint8)
+        cluttered[::2, :] = 20
+
+        quality = assess_captcha_quality(readable)
+
+        self.assertEqual(quality.glyph_blobs, 6)
+        self.assertAlmostEqual(quality.ink_ratio, 6 * 18 * 5 / 3000)
+        self.assertIsNone(captcha_quality_problem(quality))
+        self.assertIn(
+            'contrast',
+            captcha_quality_problem(assess_captcha_quality(blank)),
+        )
+        self.assertIn(
+            'ink_ratio',
+            captcha_quality_problem(assess_captcha_quality(cluttered)),
+        )
+
+    def test_quality_gate_counts_glyphs_joined_by_an_interference_line(self):
+        image = np.full((30, 100), 230, dtype=np.uint8)
+        for left in range(8, 92, 15):
+            image[6:24, left:left + 5] = 20
+        # A 1-pixel line through every glyph makes them one connected blob.
+        image[15, :] = 20
+
+        quality = assess_captcha_quality(image)
+
+        self.assertEqual(quality.glyph_blobs, 6)
+        self.assertIsNone(captcha_quality_problem(quality))
+
+    def test_quality_gate_skips_ocr_and_records_the_capture(self):
+        recorder = MagicMock()
+        with patch(
+            'autodigisign.captcha._wait_for_captcha_image',
+            return_value=MagicMock(),
+        ):
+            with patch(
+                'autodigisign.captcha.capture_captcha_bytes',
+                return_value=PNG_SIGNATURE,
+            ):
+                with patch(
+                    'autodigisign.captcha.decode_captcha_image',
+                    return_value=np.full((30, 100), 200, dtype=np.uint8),
+                ):
+                    with patch(
+                        'autodigisign.captcha.recognize_captcha',
+                    ) as recognize:
+                        with self.assertRaisesRegex(
+                            CaptchaRecognitionError,
+                            'quality gate',
+                        ):
+                            get_captcha_text(
+                                MagicMock(),
+                                recorders=[recorder],
+                                quality_gate=True,
+                            )
+
+        recognize.assert_not_called()
+        recorder.record_capture.assert_called_once_with(PNG_SIGNATURE, None, [])
+
     def test_recognition_filters_to_allowed_uppercase_characters(self):
         with patch(
             'autodigisign.captcha.pytesseract.image_to_string',
@@ -211,6 +406,100 @@ class CaptchaTests(unittest.TestCase):
             ],
         )
 
+    def test_tuned_strategy_profile_replaces_default_strategies(self):
+        settings = PreprocessingSettings('otsu', scale_factor=2)
+        set_captcha_strategies((('otsu-s2-b0-psm7', settings, 7),))
+        self.addCleanup(set_captcha_strategies, CAPTCHA_OCR_STRATEGIES)
+
+        with patch(
+            'autodigisign.captcha._wait_for_captcha_image',
+            return_value=MagicMock(),
+        ):
+            with patch(
+                'autodigisign.captcha.capture_captcha_bytes',
+                return_value=PNG_SIGNATURE,
+            ):
+                with patch(
+                    'autodigisign.captcha.decode_captcha_image',
+                    return_value=object(),
+                ) as decode:
+                    with patch(
+                        'autodigisign.captcha.preprocess_captcha',
+                        return_value=object(),
+                    ) as preprocess:
+                        with patch(
+                            'autodigisign.captcha.recognize_captcha',
+                            return_value='AB12C3',
+                        ) as recognize:
+                            result = get_captcha_text(MagicMock())
+
+        self.assertEqual(result, 'AB12C3')
+        preprocess.assert_called_once_with(decode.return_value, settings)
+        recognize.assert_called_once_with(preprocess.return_value, 7)
+
+    def test_tiled_recognition_splits_words_by_tile(self):
+        tiles = [
+            np.full((30, 90), 255, dtype=np.uint8),
+            np.full((30, 120), 255, dtype=np.uint8),
+        ]
+        backend = MagicMock()
+        # Tile bands are rows [8, 52) and [53, 97) of the stacked image.
+        backend.image_to_words.return_value = [
+            ('c3', 60, 16, 30),
+            ('AB1', 15, 15, 30),
+            ('2', 40, 17, 28),
+            ('de45f6', 15, 60, 30),
+        ]
+
+        candidates = recognize_captcha_tiles(tiles, backend)
+
+        self.assertEqual(candidates, ['AB12C3', 'DE45F6'])
+        stacked, page_segmentation_mode = backend.image_to_words.call_args.args
+        self.assertEqual(stacked.shape, (105, 150))
+        self.assertEqual(page_segmentation_mode, 6)
+
+    def test_tiled_mode_falls_back_to_strategies_when_no_tile_is_valid(self):
+        with patch(
+            'autodigisign.captcha._wait_for_captcha_image',
+            return_value=MagicMock(),
+        ):
+            with patch(
+                'autodigisign.captcha.capture_captcha_bytes',
+                return_value=PNG_SIGNATURE,
+            ):
+                with patch(
+                    'autodigisign.captcha.decode_captcha_image',
+                    return_value=object(),
+                ):
+                    with patch(
+                        'autodigisign.captcha.preprocess_captcha',
+                        side_effect=lambda image, method: method,
+                    ) as preprocess:
+                        with patch(
+                            'autodigisign.captcha.recognize_captcha_tiles',
+                            side_effect=[['AB12C3', 'XY'], ['AB1', '']],
+                        ) as recognize_tiles:
+                            with patch(
+                                'autodigisign.captcha.recognize_captcha',
+                                return_value='DE45F6',
+                            ) as recognize:
+                                tiled_result = get_captcha_text(
+                                    MagicMock(),
+                                    tiled=True,
+                                )
+                                fallback_result = get_captcha_text(
+                                    MagicMock(),
+                                    tiled=True,
+                                )
+
+        self.assertEqual((tiled_result, fallback_result), ('AB12C3', 'DE45F6'))
+        self.assertEqual(
+            recognize_tiles.call_args.args[0],
+            ['otsu', 'adaptive'],
+        )
+        self.assertEqual(preprocess.call_count, 4)
+        recognize.assert_called_once_with('otsu', 8)
+
     def test_all_non_six_character_results_are_rejected(self):
         with patch(
             'autodigisign.captcha._wait_for_captcha_image',
@@ -238,6 +527,265 @@ class CaptchaTests(unittest.TestCase):
                             ):
                                 get_captcha_text(MagicMock())
 
+    def test_concurrent_mode_preprocesses_once_and_returns_first_valid(self):
+        slow_strategy_started = threading.Event()
+        release_slow_strategy = threading.Event()
+
+        def recognize(processed_image, page_segmentation_mode):
+            if page_segmentation_mode == 8:
+                slow_strategy_started.set()
+                release_slow_strategy.wait(5)
+                return 'SLOW01'
+            slow_strategy_started.wait(5)
+            return 'FAST01' if page_segmentation_mode == 7 else 'AB'
+
+        with patch(
+            'autodigisign.captcha.preprocess_captcha',
+            side_effect=lambda image, method: method,
+        ) as preprocess:
+            with patch(
+                'autodigisign.captcha.recognize_captcha',
+                side_effect=recognize,
+            ):
+                try:
+                    result = _recognize_concurrently(
+                        object(),
+                        (
+                            ('otsu-psm8', 'otsu', 8),
+                            ('adaptive-psm7', 'adaptive', 7),
+                            ('otsu-psm13', 'otsu', 13),
+                        ),
+                        max_workers=3,
+                        processed_images=_ProcessedImages(),
+                        strategy_results=[],
+                    )
+                finally:
+                    release_slow_strategy.set()
+
+        self.assertEqual(
+            (result.strategy, result.candidate),
+            ('adaptive-psm7', 'FAST01'),
+        )
+        self.assertEqual(preprocess.call_count, 2)
+
+    def test_concurrent_mode_rejects_when_no_strategy_is_valid(self):
+        with patch(
+            'autodigisign.captcha._wait_for_captcha_image',
+            return_value=MagicMock(),
+        ):
+            with patch(
+                'autodigisign.captcha.capture_captcha_bytes',
+                return_value=PNG_SIGNATURE,
+            ):
+                with patch(
+                    'autodigisign.captcha.decode_captcha_image',
+                    return_value=object(),
+                ):
+                    with patch(
+                        'autodigisign.captcha.preprocess_captcha',
+                        return_value=object(),
+                    ):
+                        with patch(
+                            'autodigisign.captcha.recognize_captcha',
+                            return_value='ABC',
+                        ) as recognize:
+                            with self.assertRaises(CaptchaRecognitionError):
+                                get_captcha_text(MagicMock(), max_workers=3)
+
+        self.assertEqual(recognize.call_count, 3)
+
+    def test_resident_engine_loads_language_data_once(self):
+        library = FakeTesseractLibrary()
+
+        with patch('autodigisign.captcha.ctypes.CDLL', return_value=library):
+            backend = TesseractApiBackend('libtesseract.so', None)
+            first = recognize_captcha(
+                np.zeros((10, 20), dtype=np.uint8),
+                8,
+                backend,
+            )
+            second = recognize_captcha(
+                np.zeros((10, 20), dtype=np.uint8),
+                7,
+                backend,
+            )
+            backend.close()
+
+        self.assertEqual((first, second), ('AB12C3', 'AB12C3'))
+        library.TessBaseAPIInit2.assert_called_once_with(1234, None, b'eng', 3)
+        self.assertEqual(library.TessDeleteText.call_count, 2)
+        image_call = library.TessBaseAPISetImage.call_args.args
+        self.assertEqual(image_call[2:], (20, 10, 1, 20))
+        library.TessBaseAPIDelete.assert_called_once_with(1234)
+
+    def test_resident_engine_pool_is_shared_across_thread_pools(self):
+        library = FakeTesseractLibrary()
+        library.TessBaseAPICreate.side_effect = range(1, 100)
+        image = np.zeros((10, 20), dtype=np.uint8)
+
+        with patch('autodigisign.captcha.ctypes.CDLL', return_value=library):
+            backend = TesseractApiBackend('libtesseract.so', None)
+            for _ in range(10):
+                # A fresh executor per CAPTCHA, as the concurrent path uses.
+                with ThreadPoolExecutor(max_workers=3) as executor:
+                    for future in [
+                        executor.submit(recognize_captcha, image, 8, backend)
+                        for _ in range(3)
+                    ]:
+                        self.assertEqual(future.result(), 'AB12C3')
+            created = library.TessBaseAPIInit2.call_count
+            backend.close()
+
+        self.assertLessEqual(created, 3)
+        self.assertEqual(library.TessBaseAPIDelete.call_count, created)
+
+    def test_closed_resident_engine_refuses_new_handles(self):
+        library = FakeTesseractLibrary()
+
+        with patch('autodigisign.captcha.ctypes.CDLL', return_value=library):
+            backend = TesseractApiBackend('libtesseract.so', None)
+            backend.close()
+            with self.assertRaises(OcrBackendError):
+                recognize_captcha(
+                    np.zeros((10, 20), dtype=np.uint8),
+                    8,
+                    backend,
+                )
+
+        library.TessBaseAPICreate.assert_called_once_with()
+        library.TessBaseAPIDelete.assert_called_once_with(1234)
+
+    def test_resident_engine_returns_word_boxes_for_tiled_ocr(self):
+        library = FakeTesseractLibrary()
+        words = [
+            ctypes.create_string_buffer(b'AB12C3'),
+            ctypes.create_string_buffer(b' '),
+            ctypes.create_string_buffer(b'DE45F6'),
+        ]
+        boxes = iter([(4, 10, 60, 30), (2, 50, 58, 72)])
+
+        def bounding_box(_iterator, _level, *corners):
+            for corner, value in zip(corners, next(boxes)):
+                corner._obj.value = value
+            return 1
+
+        library.TessResultIteratorGetUTF8Text.side_effect = [
+            ctypes.addressof(word) for word in words
+        ]
+        library.TessPageIteratorBoundingBox.side_effect = bounding_box
+        library.TessResultIteratorNext.side_effect = [1, 1, 0]
+
+        with patch('autodigisign.captcha.ctypes.CDLL', return_value=library):
+            backend = TesseractApiBackend('libtesseract.so', None)
+            result = backend.image_to_words(
+                np.zeros((80, 70), dtype=np.uint8),
+                6,
+            )
+            backend.close()
+
+        self.assertEqual(result, [('AB12C3', 4, 10, 20), ('DE45F6', 2, 50, 22)])
+        self.assertEqual(library.TessDeleteText.call_count, 3)
+        library.TessResultIteratorDelete.assert_called_once_with(5678)
+        library.TessBaseAPIClear.assert_called_once_with(1234)
+
+    def test_missing_language_data_is_backend_error(self):
+        library = FakeTesseractLibrary()
+        library.TessBaseAPIInit2.return_value = -1
+
+        with patch('autodigisign.captcha.ctypes.CDLL', return_value=library):
+            with self.assertRaisesRegex(OcrBackendError, 'language data'):
+                TesseractApiBackend('libtesseract.so')
+
+    def test_auto_backend_falls_back_to_pytesseract(self):
+        with patch(
+            'autodigisign.captcha.ctypes.CDLL',
+            side_effect=OSError('not found'),
+        ):
+            with self.assertRaises(OcrBackendError):
+                load_ocr_backend(
+                    'tesseract-api',
+                    MagicMock(library_path='missing', tessdata_path=None),
+                )
+            backend = load_ocr_backend(
+                'auto',
+                MagicMock(library_path='missing', tessdata_path=None),
+            )
+
+        self.assertIsInstance(backend, PytesseractBackend)
+
+    def test_scored_recognition_spreads_word_confidence_over_characters(self):
+        data = {
+            'text': ['', 'ab1', '2c3'],
+            'conf': ['-1', '96.0', '40'],
+        }
+
+        with patch(
+            'autodigisign.captcha.pytesseract.image_to_data',
+            return_value=data,
+        ):
+            candidate, confidences = recognize_captcha_scored(
+                object(),
+                8,
+                PytesseractBackend(),
+            )
+
+        self.assertEqual(candidate, 'AB12C3')
+        self.assertEqual(confidences, (0.96,) * 3 + (0.4,) * 3)
+
+    def test_vote_weights_characters_by_confidence(self):
+        results = [
+            StrategyResult('a', 'AB12C3', True, 1.0, 0.9, (0.9,) * 6),
+            StrategyResult('b', 'AB12C8', True, 1.0, 0.3, (0.9,) * 5 + (0.3,)),
+            StrategyResult('c', 'XY', False, 1.0, 0.9, (0.9,) * 2),
+        ]
+
+        candidate, confidence = vote_on_candidates(results)
+
+        self.assertEqual(candidate, 'AB12C3')
+        self.assertAlmostEqual(confidence, 0.45)
+        self.assertEqual(vote_on_candidates(results[2:]), (None, 0.0))
+
+    def test_consensus_below_threshold_is_rejected(self):
+        with patch(
+            'autodigisign.captcha._wait_for_captcha_image',
+            return_value=MagicMock(),
+        ):
+            with patch(
+                'autodigisign.captcha.capture_captcha_bytes',
+                return_value=PNG_SIGNATURE,
+            ):
+                with patch(
+                    'autodigisign.captcha.decode_captcha_image',
+                    return_value=object(),
+                ):
+                    with patch(
+                        'autodigisign.captcha.preprocess_captcha',
+                        return_value=object(),
+                    ):
+                        with patch(
+                            'autodigisign.captcha.recognize_captcha_scored',
+                            side_effect=[
+                                ('AB12C3', (0.9,) * 6),
+                                ('AB12C3', (0.8,) * 6),
+                                ('XB12C3', (0.9,) * 6),
+                            ] * 2,
+                        ) as recognize:
+                            with self.assertRaisesRegex(
+                                CaptchaRecognitionError,
+                                'did not agree',
+                            ):
+                                get_captcha_text(
+                                    MagicMock(),
+                                    consensus_threshold=0.7,
+                                )
+                            result = get_captcha_text(
+                                MagicMock(),
+                                consensus_threshold=0.5,
+                            )
+
+        self.assertEqual(result, 'AB12C3')
+        self.assertEqual(recognize.call_count, 6)
+
 
 if __name__ == '__main__':
     unittest.main()
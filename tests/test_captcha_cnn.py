@@ -0,0 +1,113 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from autodigisign.captcha import CAPTCHA_PATTERN  # noqa: E402
+from autodigisign.captcha_cnn import (  # noqa: E402
+    CAPTCHA_CNN_INPUT_SHAPE,
+    CaptchaCnn,
+    CaptchaModelError,
+    CnnRecognizer,
+    encode_labels,
+    load_captcha_cnn,
+    save_captcha_cnn,
+    train_captcha_cnn,
+)
+
+
+def random_inputs(count, seed=0):
+    return np.random.default_rng(seed).random(
+        (count,) + CAPTCHA_CNN_INPUT_SHAPE
+    ).astype(np.float32)
+
+
+class CaptchaCnnTests(unittest.TestCase):
+    def test_gradients_match_numerical_estimates(self):
+        model = CaptchaCnn.initialize(np.random.default_rng(1))
+        inputs = random_inputs(2)
+        targets = encode_labels(['AB12C3', 'DE45F6'])
+        _, gradients = model.loss_and_gradients(inputs, targets)
+
+        for name in ('conv1_w', 'conv2_w', 'dense_w', 'dense_b'):
+            with self.subTest(parameter=name):
+                index = np.unravel_index(
+                    np.argmax(np.abs(gradients[name])),
+                    gradients[name].shape,
+                )
+                original = model.parameters[name][index]
+                estimates = []
+                for step in (1e-2, -1e-2):
+                    model.parameters[name][index] = original + step
+                    estimates.append(model.loss_and_gradients(inputs, targets)[0])
+                model.parameters[name][index] = original
+                numerical = (estimates[0] - estimates[1]) / 2e-2
+                self.assertAlmostEqual(
+                    numerical / gradients[name][index],
+                    1.0,
+                    delta=0.05,
+                )
+
+    def test_model_round_trips_through_npz_and_checks_shapes(self):
+        model = CaptchaCnn.initialize(np.random.default_rng(2))
+        inputs = random_inputs(1)
+        with tempfile.TemporaryDirectory() as directory:
+            model_path = Path(directory) / 'captcha_cnn.npz'
+            save_captcha_cnn(model, model_path)
+            loaded = load_captcha_cnn(model_path)
+
+            np.testing.assert_array_equal(
+                loaded.predict_probabilities(inputs),
+                model.predict_probabilities(inputs),
+            )
+
+            model.parameters['dense_b'] = np.zeros(3, dtype=np.float32)
+            save_captcha_cnn(model, model_path)
+            with self.assertRaisesRegex(CaptchaModelError, 'dense_b'):
+                load_captcha_cnn(model_path)
+
+            model_path.write_bytes(b'not a model')
+            with self.assertRaises(CaptchaModelError):
+                load_captcha_cnn(model_path)
+
+    def test_recognizer_reads_six_characters_with_probabilities(self):
+        recognizer = CnnRecognizer(CaptchaCnn.initialize(np.random.default_rng(3)))
+        processed_image = np.full((96, 300), 255, dtype=np.uint8)
+        processed_image[30:60, 20:280:40] = 0
+
+        text, scores = recognizer.recognize_with_scores(processed_image)
+
+        self.assertRegex(text, CAPTCHA_PATTERN)
+        self.assertEqual(len(scores), 6)
+        self.assertTrue(all(0 < score <= 1 for score in scores))
+        self.assertEqual(recognizer.recognize(processed_image), (text, min(scores)))
+
+    def test_training_reduces_loss_on_a_fixed_batch(self):
+        images = [
+            np.where(random_inputs(1, seed)[0] > 0.5, 255, 0).astype(np.uint8)
+            for seed in range(8)
+        ]
+        labels = ['AB12C3', 'DE45F6'] * 4
+
+        _, history = train_captcha_cnn(
+            images + images[:1],
+            labels + ['bad'],
+            epochs=3,
+            batch_size=7,
+            seed=0,
+        )
+
+        self.assertEqual([epoch for epoch, _, _ in history], [1, 2, 3])
+        self.assertLess(history[-1][1], history[0][1])
+        with self.assertRaises(ValueError):
+            train_captcha_cnn(images[:1], labels[:1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from autodigisign.captcha import PNG_SIGNATURE, StrategyResult  # noqa: E402
+from autodigisign.captcha_corpus import (  # noqa: E402
+    OUTCOME_UNRECOGNIZED,
+    CaptchaCorpus,
+    iter_corpus_samples,
+    sample_identifier,
+)
+from autodigisign.portal import LOGIN_REJECTED, LOGIN_SUCCEEDED  # noqa: E402
+
+
+def strategy_result(candidate, strategy='otsu-psm8'):
+    return StrategyResult(
+        strategy=strategy,
+        candidate=candidate,
+        format_valid=len(candidate) == 6,
+        elapsed_ms=12.5,
+    )
+
+
+class CaptchaCorpusTests(unittest.TestCase):
+    def test_accepted_candidate_becomes_content_addressed_label(self):
+        image_bytes = PNG_SIGNATURE + b'first'
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            corpus = CaptchaCorpus(temporary_directory)
+            result = strategy_result('AB12C3')
+
+            identifier = corpus.record_capture(
+                image_bytes,
+                result,
+                [strategy_result('AB1', 'adaptive-psm7'), result],
+            )
+            corpus.record_outcome(LOGIN_SUCCEEDED)
+            samples = list(iter_corpus_samples(temporary_directory))
+
+        self.assertEqual(identifier, sample_identifier(image_bytes))
+        self.assertEqual(len(samples), 1)
+        image_path, metadata = samples[0]
+        self.assertEqual(image_path.name, f'{identifier}.png')
+        self.assertEqual(image_path.parent.name, identifier[:2])
+        self.assertEqual(metadata['label'], 'AB12C3')
+        observation = metadata['observations'][0]
+        self.assertEqual(observation['strategy'], 'otsu-psm8')
+        self.assertEqual(observation['outcome'], LOGIN_SUCCEEDED)
+        self.assertEqual(
+            [entry['strategy'] for entry in observation['strategy_results']],
+            ['adaptive-psm7', 'otsu-psm8'],
+        )
+
+    def test_repeated_image_accumulates_rejections_without_label(self):
+        image_bytes = PNG_SIGNATURE + b'repeat'
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            corpus = CaptchaCorpus(temporary_directory)
+            for candidate in ('AB12C3', 'AB12C8'):
+                result = strategy_result(candidate)
+                corpus.record_capture(image_bytes, result, [result])
+                corpus.record_outcome(LOGIN_REJECTED)
+            # A second outcome without a new capture is ignored.
+            corpus.record_outcome(LOGIN_SUCCEEDED)
+            (_, metadata), = iter_corpus_samples(temporary_directory)
+
+        self.assertIsNone(metadata['label'])
+        self.assertEqual(metadata['rejected_candidates'], ['AB12C3', 'AB12C8'])
+        self.assertEqual(len(metadata['observations']), 2)
+
+    def test_unrecognized_capture_is_kept_for_tuning(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            corpus = CaptchaCorpus(temporary_directory)
+            corpus.record_capture(
+                PNG_SIGNATURE + b'unreadable',
+                None,
+                [strategy_result('AB')],
+            )
+            corpus.record_outcome(LOGIN_SUCCEEDED)
+            metadata_path, = Path(temporary_directory).glob('*/*.json')
+            metadata = json.loads(metadata_path.read_text(encoding='utf-8'))
+
+        self.assertIsNone(metadata['label'])
+        self.assertEqual(
+            metadata['observations'][0]['outcome'],
+            OUTCOME_UNRECOGNIZED,
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
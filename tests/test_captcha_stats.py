@@ -0,0 +1,164 @@
+import json
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from autodigisign.captcha import (  # noqa: E402
+    CONSENSUS_STRATEGY_NAME,
+    TILED_STRATEGY_PREFIX,
+    StrategyResult,
+)
+from autodigisign.captcha_stats import StrategyStatistics  # noqa: E402
+from autodigisign.portal import LOGIN_REJECTED, LOGIN_SUCCEEDED  # noqa: E402
+
+
+STRATEGIES = (
+    ('otsu-psm8', 'otsu', 8),
+    ('adaptive-psm7', 'adaptive', 7),
+    ('otsu-psm13', 'otsu', 13),
+)
+
+
+class NeverExplore(random.Random):
+    def random(self):
+        return 1.0
+
+
+def result(strategy, candidate):
+    return StrategyResult(strategy, candidate, len(candidate) == 6, 10.0)
+
+
+class StrategyStatisticsTests(unittest.TestCase):
+    def record(self, statistics, results, outcome=None):
+        selected = next((item for item in results if item.format_valid), None)
+        statistics.record_capture(b'png', selected, results)
+        if outcome is not None:
+            statistics.record_outcome(outcome)
+
+    def test_strategy_with_accepted_logins_moves_first_and_persists(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            statistics_path = Path(temporary_directory) / 'stats.json'
+            statistics = StrategyStatistics(
+                statistics_path,
+                random_source=NeverExplore(),
+            )
+            for _ in range(3):
+                self.record(
+                    statistics,
+                    [result('otsu-psm8', 'AB12C3')],
+                    LOGIN_REJECTED,
+                )
+                self.record(
+                    statistics,
+                    [result('adaptive-psm7', 'AB12C3')],
+                    LOGIN_SUCCEEDED,
+                )
+
+            reloaded = StrategyStatistics(
+                statistics_path,
+                random_source=NeverExplore(),
+            )
+            order = reloaded.order_strategies(STRATEGIES)
+            saved = json.loads(statistics_path.read_text(encoding='utf-8'))
+
+        self.assertEqual(
+            [strategy[0] for strategy in order],
+            ['adaptive-psm7', 'otsu-psm13', 'otsu-psm8'],
+        )
+        self.assertEqual(saved['strategies']['adaptive-psm7']['accepted'], 3)
+        self.assertEqual(saved['strategies']['otsu-psm8']['rejected'], 3)
+
+    def test_tiled_results_rank_their_underlying_strategies(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            statistics = StrategyStatistics(
+                Path(temporary_directory) / 'stats.json',
+                random_source=NeverExplore(),
+            )
+            before = statistics.order_strategies(STRATEGIES)
+            for _ in range(3):
+                self.record(
+                    statistics,
+                    [
+                        result(f'{TILED_STRATEGY_PREFIX}otsu-psm8', 'AB'),
+                        result(f'{TILED_STRATEGY_PREFIX}otsu-psm13', 'AB12C3'),
+                    ],
+                    LOGIN_SUCCEEDED,
+                )
+            after = statistics.order_strategies(STRATEGIES)
+
+        self.assertEqual(before[0][0], 'otsu-psm8')
+        self.assertEqual(after[0][0], 'otsu-psm13')
+        self.assertEqual(statistics.strategies['otsu-psm13']['accepted'], 3)
+        self.assertNotIn(
+            f'{TILED_STRATEGY_PREFIX}otsu-psm13',
+            statistics.strategies,
+        )
+
+    def test_consensus_outcome_is_credited_to_agreeing_strategies(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            statistics = StrategyStatistics(
+                Path(temporary_directory) / 'stats.json',
+                random_source=NeverExplore(),
+            )
+            voters = [
+                result('otsu-psm8', 'AB12C8'),
+                result('adaptive-psm7', 'AB12C3'),
+                result('otsu-psm13', 'AB12C3'),
+            ]
+            consensus = StrategyResult(
+                CONSENSUS_STRATEGY_NAME,
+                'AB12C3',
+                True,
+                30.0,
+            )
+            for _ in range(3):
+                statistics.record_capture(b'png', consensus, voters)
+                statistics.record_outcome(LOGIN_SUCCEEDED)
+            order = statistics.order_strategies(STRATEGIES)
+
+        self.assertEqual(
+            [strategy[0] for strategy in order],
+            ['adaptive-psm7', 'otsu-psm13', 'otsu-psm8'],
+        )
+        self.assertEqual(statistics.strategies['otsu-psm8']['accepted'], 0)
+        self.assertNotIn(CONSENSUS_STRATEGY_NAME, statistics.strategies)
+
+    def test_unproductive_strategy_is_skipped_unless_exploring(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            statistics = StrategyStatistics(
+                Path(temporary_directory) / 'stats.json',
+                random_source=NeverExplore(),
+            )
+            for _ in range(20):
+                self.record(statistics, [result('otsu-psm13', 'AB')])
+
+            order = statistics.order_strategies(STRATEGIES)
+            exploring = StrategyStatistics(
+                Path(temporary_directory) / 'stats.json',
+                exploration_rate=1.0,
+                random_source=random.Random(1),
+            )
+            explored = exploring.order_strategies(STRATEGIES)
+
+        self.assertNotIn('otsu-psm13', [strategy[0] for strategy in order])
+        self.assertEqual(sorted(explored), sorted(STRATEGIES))
+
+    def test_unreadable_statistics_file_starts_fresh(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            statistics_path = Path(temporary_directory) / 'stats.json'
+            statistics_path.write_text('{broken', encoding='utf-8')
+
+            with self.assertLogs(level='WARNING'):
+                statistics = StrategyStatistics(statistics_path)
+
+        self.assertEqual(statistics.strategies, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from autodigisign import bench  # noqa: E402
+from autodigisign.bench import label_from_filename  # noqa: E402
+from autodigisign.captcha import (  # noqa: E402
+    CAPTCHA_PATTERN,
+    decode_captcha_image,
+    preprocess_captcha,
+)
+from autodigisign.captcha_synthetic import (  # noqa: E402
+    SyntheticCaptchaStyle,
+    generate_captcha_batch,
+    random_captcha_text,
+    render_captcha,
+)
+
+
+class SyntheticCaptchaTests(unittest.TestCase):
+    def test_batches_are_labelled_decodable_and_reproducible(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first = generate_captcha_batch(Path(directory) / 'a', 5, seed=7)
+            second = generate_captcha_batch(Path(directory) / 'b', 5, seed=7)
+
+            self.assertEqual(
+                [label for _, label in first],
+                [label for _, label in second],
+            )
+            for image_path, label in first:
+                self.assertRegex(label, CAPTCHA_PATTERN)
+                self.assertEqual(label_from_filename(image_path), label)
+                self.assertEqual(
+                    decode_captcha_image(image_path.read_bytes()).shape,
+                    (32, 100),
+                )
+
+    def test_inverted_captchas_are_normalized_to_dark_text(self):
+        random_generator = np.random.default_rng(3)
+        for invert in (False, True):
+            with self.subTest(invert=invert):
+                image = render_captcha(
+                    random_captcha_text(random_generator),
+                    SyntheticCaptchaStyle(invert=invert, warp=1.5, color=False),
+                    random_generator,
+                )
+                gray = image[:, :, 0]
+                self.assertEqual(float(np.mean(gray)) > 127, not invert)
+
+                for method in ('otsu', 'adaptive'):
+                    processed = preprocess_captcha(gray, method)
+                    self.assertGreater(float(np.mean(processed)), 127)
+
+    def test_synthesize_command_renders_the_selected_font(self):
+        with tempfile.TemporaryDirectory() as directory:
+            images = {}
+            for font in ('simplex', 'triplex'):
+                output_directory = Path(directory) / font
+                bench.main(
+                    [
+                        'synthesize',
+                        str(output_directory),
+                        '--count',
+                        '1',
+                        '--seed',
+                        '5',
+                        '--font',
+                        font,
+                    ],
+                    output=io.StringIO(),
+                )
+                (image_path,) = output_directory.glob('*.png')
+                images[font] = (image_path.name, image_path.read_bytes())
+
+        self.assertEqual(images['simplex'][0], images['triplex'][0])
+        self.assertNotEqual(images['simplex'][1], images['triplex'][1])
+
+    def test_batch_count_must_be_positive(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(ValueError):
+                generate_captcha_batch(directory, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
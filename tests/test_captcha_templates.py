@@ -0,0 +1,156 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import cv2
+import numpy as np
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from autodigisign.captcha import (  # noqa: E402
+    CAPTCHA_WHITELIST,
+    PNG_SIGNATURE,
+    CaptchaRecognitionError,
+    get_captcha_text,
+    set_template_recognizer,
+)
+from autodigisign.captcha_templates import (  # noqa: E402
+    GlyphBankError,
+    TemplateRecognizer,
+    build_glyph_bank,
+    load_glyph_bank,
+    save_glyph_bank,
+    segment_glyphs,
+)
+
+
+def render_processed_captcha(text):
+    """Render evenly spaced dark glyphs on white, like preprocess_captcha()."""
+    image = np.full((60, 240), 255, dtype=np.uint8)
+    for index, character in enumerate(text):
+        cv2.putText(
+            image,
+            character,
+            (8 + index * 38, 45),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1.2,
+            0,
+            3,
+        )
+    return image
+
+
+def reference_bank():
+    texts = [
+        CAPTCHA_WHITELIST[start:start + 6]
+        for start in range(0, len(CAPTCHA_WHITELIST), 6)
+    ]
+    return build_glyph_bank(
+        (render_processed_captcha(text), text) for text in texts
+    )
+
+
+class CaptchaTemplateTests(unittest.TestCase):
+    def tearDown(self):
+        set_template_recognizer(None)
+
+    def test_segmentation_finds_six_glyph_columns(self):
+        ranges = segment_glyphs(render_processed_captcha('AB12C3'))
+
+        self.assertEqual(len(ranges), 6)
+        self.assertTrue(all(start < stop for start, stop in ranges))
+
+    def test_touching_glyphs_are_split_to_expected_count(self):
+        image = render_processed_captcha('AB12C3')
+        # Bridge the first two glyphs with a horizontal stroke.
+        image[30:33, 20:60] = 0
+
+        self.assertEqual(len(segment_glyphs(image)), 6)
+
+    def test_template_recognizer_reads_unseen_combination(self):
+        recognizer = TemplateRecognizer(reference_bank())
+
+        text, confidence = recognizer.recognize(
+            render_processed_captcha('Z9Q4K7')
+        )
+
+        self.assertEqual(text, 'Z9Q4K7')
+        self.assertGreater(confidence, recognizer.confidence_threshold)
+
+    def test_blank_image_is_recognition_error(self):
+        recognizer = TemplateRecognizer(reference_bank())
+
+        with self.assertRaises(CaptchaRecognitionError):
+            recognizer.recognize(np.full((60, 240), 255, dtype=np.uint8))
+
+    def test_glyph_bank_round_trips_through_npz(self):
+        bank = reference_bank()
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            bank_path = Path(temporary_directory) / 'captcha' / 'bank.npz'
+            save_glyph_bank(bank, bank_path)
+            loaded = load_glyph_bank(bank_path)
+
+            bank_path.write_bytes(b'not an npz')
+            with self.assertRaises(GlyphBankError):
+                load_glyph_bank(bank_path)
+
+        np.testing.assert_array_equal(loaded.templates, bank.templates)
+        self.assertEqual(loaded.labels.tolist(), bank.labels.tolist())
+
+    def _get_captcha_text_with_recognizer(self, recognizer):
+        set_template_recognizer(recognizer)
+        with patch(
+            'autodigisign.captcha._wait_for_captcha_image',
+            return_value=MagicMock(),
+        ):
+            with patch(
+                'autodigisign.captcha.capture_captcha_bytes',
+                return_value=PNG_SIGNATURE,
+            ):
+                with patch(
+                    'autodigisign.captcha.decode_captcha_image',
+                    return_value=object(),
+                ):
+                    with patch(
+                        'autodigisign.captcha.preprocess_captcha',
+                        return_value=object(),
+                    ):
+                        with patch(
+                            'autodigisign.captcha.recognize_captcha',
+                            return_value='OCR123',
+                        ) as recognize:
+                            return get_captcha_text(MagicMock()), recognize
+
+    def test_confident_template_result_skips_tesseract(self):
+        recognizer = MagicMock(
+            preprocessing_method='otsu',
+            confidence_threshold=0.85,
+        )
+        recognizer.name = 'otsu-template'
+        recognizer.recognize.return_value = ('AB12C3', 0.95)
+
+        result, recognize = self._get_captcha_text_with_recognizer(recognizer)
+
+        self.assertEqual(result, 'AB12C3')
+        recognize.assert_not_called()
+
+    def test_low_confidence_template_result_falls_back_to_tesseract(self):
+        recognizer = MagicMock(
+            preprocessing_method='otsu',
+            confidence_threshold=0.85,
+        )
+        recognizer.name = 'otsu-template'
+        recognizer.recognize.return_value = ('AB12C3', 0.4)
+
+        result, recognize = self._get_captcha_text_with_recognizer(recognizer)
+
+        self.assertEqual(result, 'OCR123')
+        recognize.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import json
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from autodigisign.captcha import (  # noqa: E402
+    PreprocessingSettings,
+    preprocess_captcha,
+)
+from autodigisign.captcha_tuning import (  # noqa: E402
+    StrategyProfileError,
+    candidate_strategies,
+    load_strategy_profile,
+    save_strategy_profile,
+    tune_strategies,
+)
+
+
+OTSU = PreprocessingSettings('otsu')
+ADAPTIVE = PreprocessingSettings('adaptive', blur_kernel=3)
+ACCURATE = ('accurate', ADAPTIVE, 7)
+FAST = ('fast', OTSU, 8)
+
+
+def fake_evaluation(samples, strategies):
+    labels = ['AB12C3', 'DE45F6']
+    evaluations = {
+        'accurate': {'candidates': labels, 'seconds': [0.1, 0.1]},
+        # The fast strategy is right once and format-invalid once.
+        'fast': {'candidates': ['AB12C3', 'XY'], 'seconds': [0.01, 0.01]},
+    }
+    return labels, evaluations, {OTSU: [0.0, 0.0], ADAPTIVE: [0.0, 0.0]}
+
+
+class CaptchaTuningTests(unittest.TestCase):
+    def test_default_settings_match_named_preprocessing(self):
+        image = np.random.default_rng(0).integers(0, 256, (20, 60), dtype=np.uint8)
+
+        for method, settings in (('otsu', OTSU), ('adaptive', ADAPTIVE)):
+            with self.subTest(method=method):
+                np.testing.assert_array_equal(
+                    preprocess_captcha(image, method),
+                    preprocess_captcha(image, settings),
+                )
+
+    def test_fastest_set_meeting_target_accuracy_is_selected(self):
+        samples = [('a.png', 'AB12C3'), ('b.png', 'DE45F6')]
+        with patch(
+            'autodigisign.captcha_tuning.evaluate_strategies',
+            side_effect=fake_evaluation,
+        ):
+            exact = tune_strategies(samples, (ACCURATE, FAST), 1.0)
+            relaxed = tune_strategies(samples, (ACCURATE, FAST), 0.5)
+            unreachable = tune_strategies(
+                samples,
+                (ACCURATE, FAST),
+                1.0,
+                max_strategies=1,
+            )
+
+        self.assertEqual(exact['strategies'], (FAST, ACCURATE))
+        self.assertAlmostEqual(exact['mean_ms'], 60.0)
+        self.assertEqual(relaxed['strategies'], (FAST,))
+        self.assertEqual(unreachable['strategies'], (ACCURATE,))
+
+    def test_unlabelled_samples_cannot_be_tuned(self):
+        with self.assertRaises(ValueError):
+            tune_strategies([('a.png', None)], (FAST,), 0.9)
+
+    def test_profile_round_trips_and_rejects_other_versions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            profile_path = Path(directory) / 'strategy_profile.json'
+            save_strategy_profile(
+                profile_path,
+                {
+                    'strategies': (FAST, ACCURATE),
+                    'samples': 2,
+                    'target_accuracy': 1.0,
+                    'accuracy': 1.0,
+                    'mean_ms': 60.0,
+                },
+            )
+
+            self.assertEqual(load_strategy_profile(profile_path), (FAST, ACCURATE))
+
+            profile = json.loads(profile_path.read_text(encoding='utf-8'))
+            profile['format_version'] = 0
+            profile_path.write_text(json.dumps(profile), encoding='utf-8')
+            with self.assertRaisesRegex(StrategyProfileError, 'version'):
+                load_strategy_profile(profile_path)
+
+            profile['format_version'] = 1
+            profile['strategies'][0]['adaptive_block_size'] = 30
+            profile_path.write_text(json.dumps(profile), encoding='utf-8')
+            with self.assertRaisesRegex(StrategyProfileError, 'fast'):
+                load_strategy_profile(profile_path)
+
+    def test_random_search_keeps_the_default_strategies(self):
+        strategies = candidate_strategies(trials=5, random_source=random.Random(1))
+
+        self.assertEqual(len(strategies), 8)
+        self.assertEqual(
+            [strategy[0] for strategy in strategies[:3]],
+            ['otsu-s3-b0-psm8', 'adaptive-s3-b3-k31-c9-psm7', 'otsu-s3-b0-psm13'],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,7 +9,9 @@ sys.path.insert(0, str(PROJECT_ROOT / 'src'))
 
 from autodigisign.config import (  # noqa: E402
     ConfigurationError,
+    RuntimeOptions,
     load_credentials_settings,
+    load_runtime_options,
     resolve_project_paths,
 )
 
@@ -76,6 +78,52 @@ class ConfigTests(unittest.TestCase):
                 r'credentials\.pincode',
             ):
                 load_credentials_settings(path)
+    def test_runtime_options_default_to_sequential_ocr(self):
+        self.assertEqual(load_runtime_options({}), RuntimeOptions())
+
+    def test_concurrent_ocr_limits_tesseract_threads_by_default(self):
+        options = load_runtime_options(
+            {'AUTODIGISIGN_CAPTCHA_WORKERS': '3'}
+        )
+        self.assertEqual(options.captcha_workers, 3)
+        self.assertEqual(options.ocr_thread_limit, 1)
+
+        options = load_runtime_options(
+            {
+                'AUTODIGISIGN_CAPTCHA_WORKERS': '2',
+                'AUTODIGISIGN_OCR_THREAD_LIMIT': '2',
+            }
+        )
+        self.assertEqual(options.ocr_thread_limit, 2)
+
+    def test_invalid_runtime_option_is_configuration_error(self):
+        with self.assertRaisesRegex(
+            ConfigurationError,
+            'AUTODIGISIGN_CAPTCHA_WORKERS',
+        ):
+            load_runtime_options({'AUTODIGISIGN_CAPTCHA_WORKERS': 'many'})
+
+    def test_consensus_threshold_must_be_a_fraction(self):
+        options = load_runtime_options({'AUTODIGISIGN_CAPTCHA_CONSENSUS': '0.7'})
+        self.assertEqual(options.captcha_consensus_threshold, 0.7)
+
+        with self.assertRaisesRegex(
+            ConfigurationError,
+            'AUTODIGISIGN_CAPTCHA_CONSENSUS',
+        ):
+            load_runtime_options({'AUTODIGISIGN_CAPTCHA_CONSENSUS': '70'})
+
+    def test_login_form_fill_defaults_to_real_keystrokes(self):
+        self.assertEqual(load_runtime_options({}).login_form_fill, 'keystrokes')
+        options = load_runtime_options({'AUTODIGISIGN_LOGIN_FORM_FILL': 'script'})
+        self.assertEqual(options.login_form_fill, 'script')
+
+        with self.assertRaisesRegex(
+            ConfigurationError,
+            'AUTODIGISIGN_LOGIN_FORM_FILL',
+        ):
+            load_runtime_options({'AUTODIGISIGN_LOGIN_FORM_FILL': 'paste'})
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,109 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from selenium.common.exceptions import TimeoutException
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from autodigisign.captcha import CaptchaRecognitionError  # noqa: E402
+from autodigisign.login_telemetry import (  # noqa: E402
+    LoginTelemetry,
+    get_login_telemetry_path,
+)
+from autodigisign.portal import (  # noqa: E402
+    LOGIN_SUCCEEDED,
+    LOGIN_TIMED_OUT,
+    retry_login,
+)
+
+
+def _read_records(telemetry_path):
+    return [
+        json.loads(line)
+        for line in telemetry_path.read_text(encoding='utf-8').splitlines()
+    ]
+
+
+class LoginTelemetryTests(unittest.TestCase):
+    def test_telemetry_file_sits_next_to_the_info_log(self):
+        self.assertEqual(
+            get_login_telemetry_path(
+                Path('logs') / 'autodigisign_20260101_080000_info.log'
+            ),
+            Path('logs') / 'autodigisign_20260101_080000_login.jsonl',
+        )
+
+    def test_attempt_record_merges_captcha_stage_timings(self):
+        with tempfile.TemporaryDirectory() as directory:
+            telemetry_path = Path(directory) / 'run_login.jsonl'
+            telemetry = LoginTelemetry(
+                telemetry_path,
+                settings={'form_fill': 'script'},
+            )
+            telemetry.start_attempt()
+            telemetry.captcha_timings.update(capture_ms=12.345, ocr_ms=80.0)
+            telemetry.record_attempt(1, LOGIN_SUCCEEDED, {'form_fill_ms': 7.06})
+            telemetry.start_attempt()
+            telemetry.record_attempt(2, None, {}, 'RuntimeError')
+
+            first, second = _read_records(telemetry_path)
+
+        self.assertEqual(first['outcome'], LOGIN_SUCCEEDED)
+        self.assertEqual(first['settings'], {'form_fill': 'script'})
+        self.assertEqual(first['capture_ms'], 12.3)
+        self.assertEqual(first['ocr_ms'], 80.0)
+        self.assertEqual(first['form_fill_ms'], 7.1)
+        self.assertIsNone(first['preprocess_ms'])
+        self.assertIsNone(second['capture_ms'])
+        self.assertEqual(second['error'], 'RuntimeError')
+
+    def test_retry_login_records_every_attempt(self):
+        wait = MagicMock()
+        wait.until.side_effect = [TimeoutException(), LOGIN_SUCCEEDED]
+        captcha_loader = MagicMock(
+            side_effect=[
+                CaptchaRecognitionError('unreadable'),
+                'AB12C3',
+                'DE45F6',
+            ]
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            telemetry_path = Path(directory) / 'run_login.jsonl'
+            with patch('autodigisign.portal.login'):
+                with patch('autodigisign.portal.WebDriverWait', return_value=wait):
+                    result = retry_login(
+                        MagicMock(),
+                        'username',
+                        'password',
+                        max_retries=3,
+                        captcha_loader=captcha_loader,
+                        login_telemetry=LoginTelemetry(telemetry_path),
+                    )
+            records = _read_records(telemetry_path)
+
+        self.assertTrue(result)
+        self.assertEqual(
+            [(record['attempt'], record['outcome'], record['error']) for record in records],
+            [
+                (1, None, 'CaptchaRecognitionError'),
+                (2, LOGIN_TIMED_OUT, None),
+                (3, LOGIN_SUCCEEDED, None),
+            ],
+        )
+        self.assertIsNotNone(records[0]['refresh_ms'])
+        self.assertIsNotNone(records[1]['outcome_ms'])
+        self.assertIsNotNone(records[1]['refresh_ms'])
+        for key in ('captcha_ms', 'form_fill_ms', 'outcome_ms', 'total_ms'):
+            self.assertIsNotNone(records[2][key])
+        self.assertIsNone(records[2]['refresh_ms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
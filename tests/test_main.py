@@ -2,7 +2,7 @@ import sys
 import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -32,6 +32,10 @@ class MainTests(unittest.TestCase):
         ):
             main.validate_python_version((3, 13, 11))
 
+    def test_resume_is_an_explicit_flag(self):
+        self.assertFalse(main.build_parser().parse_args([]).resume)
+        self.assertTrue(main.build_parser().parse_args(['--resume']).resume)
+
     def test_logs_are_grouped_by_year_and_month(self):
         self.assertEqual(
             main.get_log_directory(
@@ -55,7 +59,7 @@ class MainTests(unittest.TestCase):
                         'autodigisign.__main__.initialize_driver'
                     ) as initialize_driver:
                         with patch('autodigisign.__main__.logging.shutdown'):
-                            exit_code = main.main()
+                            exit_code = main.main([])
 
         self.assertEqual(exit_code, 1)
         initialize_driver.assert_not_called()
@@ -115,7 +119,7 @@ class MainTests(unittest.TestCase):
                                                     'autodigisign.__main__.'
                                                     'logging.shutdown'
                                                 ):
-                                                    exit_code = main.main()
+                                                    exit_code = main.main([])
 
         self.assertEqual(exit_code, 0)
         driver.get.assert_called_once_with(main.PORTAL_LOGIN_URL)
@@ -125,6 +129,8 @@ class MainTests(unittest.TestCase):
             driver,
             employees,
             '1234',
+            timing_report=ANY,
+            journal=ANY,
         )
         send_email.assert_not_called()
 
@@ -176,7 +182,7 @@ class MainTests(unittest.TestCase):
                                                 'autodigisign.__main__.'
                                                 'logging.shutdown'
                                             ):
-                                                exit_code = main.main()
+                                                exit_code = main.main([])
 
         self.assertEqual(exit_code, 1)
         driver.quit.assert_called_once()
@@ -1,10 +1,15 @@
 import logging
 import sys
+import threading
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoSuchElementException,
+    TimeoutException,
+)
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -14,10 +19,15 @@ from autodigisign.captcha import CaptchaCaptureError  # noqa: E402
 from autodigisign.portal import (  # noqa: E402
     LOGIN_REJECTED,
     LOGIN_SUCCEEDED,
+    LOGIN_TIMED_OUT,
     PortalNavigationError,
     _detect_login_outcome,
+    _refresh_login_page_for_retry,
+    _wait_for_login_outcome,
+    login,
     navigate,
     retry_login,
+    submit_login_captcha,
 )
 
 
@@ -95,6 +105,7 @@ class PortalTests(unittest.TestCase):
             'username',
             'password',
             'AB12C3',
+            'keystrokes',
         )
         warning_messages = [
             record.getMessage()
@@ -106,6 +117,234 @@ class PortalTests(unittest.TestCase):
         self.assertNotIn('driver frame details', warning_messages[0])
         self.assertIn('driver frame details', '\n'.join(captured_logs.output))
 
+    def test_login_outcomes_are_reported_to_captcha_recorders(self):
+        wait = MagicMock()
+        wait.until.side_effect = [
+            TimeoutException(),
+            LOGIN_REJECTED,
+            LOGIN_SUCCEEDED,
+        ]
+        captcha_corpus = MagicMock()
+
+        with patch('autodigisign.portal.login'):
+            with patch('autodigisign.portal.WebDriverWait', return_value=wait):
+                result = retry_login(
+                    MagicMock(),
+                    'username',
+                    'password',
+                    max_retries=3,
+                    captcha_loader=MagicMock(return_value='AB12C3'),
+                    captcha_recorders=[captcha_corpus],
+                )
+
+        self.assertTrue(result)
+        self.assertEqual(
+            [call.args[0] for call in captcha_corpus.record_outcome.call_args_list],
+            [LOGIN_TIMED_OUT, LOGIN_REJECTED, LOGIN_SUCCEEDED],
+        )
+
+    def test_pipelined_login_recognizes_while_credentials_are_typed(self):
+        driver = MagicMock()
+        credentials_filled = threading.Event()
+        captured = MagicMock()
+        capture = MagicMock(return_value=captured)
+
+        def recognize(image, timings):
+            # Only finishes when the credentials are typed in parallel.
+            if not credentials_filled.wait(timeout=5):
+                raise AssertionError('credentials were not typed during OCR')
+            return 'AB12C3'
+
+        wait = MagicMock()
+        wait.until.return_value = LOGIN_SUCCEEDED
+
+        with patch(
+            'autodigisign.portal.fill_login_credentials',
+            side_effect=lambda *args: credentials_filled.set(),
+        ) as fill_login_credentials:
+            with patch('autodigisign.portal.submit_login_captcha') as submit:
+                with patch('autodigisign.portal.WebDriverWait', return_value=wait):
+                    result = retry_login(
+                        driver,
+                        'username',
+                        'password',
+                        max_retries=1,
+                        captcha_pipeline=(capture, recognize),
+                    )
+
+        self.assertTrue(result)
+        capture.assert_called_once_with(driver, timings={})
+        fill_login_credentials.assert_called_once_with(
+            driver,
+            'username',
+            'password',
+            'keystrokes',
+        )
+        submit.assert_called_once_with(driver, 'AB12C3', 'keystrokes')
+
+    def test_pipelined_recognition_failure_is_retried(self):
+        driver = MagicMock()
+        recognize = MagicMock(
+            side_effect=[CaptchaCaptureError('capture failed'), 'AB12C3']
+        )
+        wait = MagicMock()
+        wait.until.return_value = LOGIN_SUCCEEDED
+
+        with patch('autodigisign.portal.fill_login_credentials'):
+            with patch('autodigisign.portal.submit_login_captcha') as submit:
+                with patch('autodigisign.portal.WebDriverWait', return_value=wait):
+                    result = retry_login(
+                        driver,
+                        'username',
+                        'password',
+                        max_retries=2,
+                        captcha_pipeline=(MagicMock(), recognize),
+                    )
+
+        self.assertTrue(result)
+        self.assertEqual(recognize.call_count, 2)
+        submit.assert_called_once_with(driver, 'AB12C3', 'keystrokes')
+        driver.refresh.assert_called_once_with()
+
+    def test_pipelined_login_recognizes_the_next_captcha_after_rejection(self):
+        driver = MagicMock()
+        events = []
+        capture = MagicMock(
+            side_effect=lambda driver, timings: events.append('capture')
+        )
+        outcomes = iter([LOGIN_REJECTED, LOGIN_SUCCEEDED])
+
+        def wait_for_login_outcome(driver, timeout_seconds, await_captcha):
+            events.append(('outcome', await_captcha))
+            return next(outcomes)
+
+        def recognize(image, timings):
+            timings['ocr_ms'] = 1.0
+            return 'AB12C3'
+
+        login_telemetry = MagicMock(captcha_timings={})
+
+        with patch(
+            'autodigisign.portal.fill_login_credentials',
+            side_effect=lambda *args: events.append('fill'),
+        ):
+            with patch('autodigisign.portal.submit_login_captcha'):
+                with patch(
+                    'autodigisign.portal._wait_for_login_outcome',
+                    side_effect=wait_for_login_outcome,
+                ):
+                    result = retry_login(
+                        driver,
+                        'username',
+                        'password',
+                        max_retries=2,
+                        captcha_pipeline=(capture, recognize),
+                        login_telemetry=login_telemetry,
+                    )
+
+        self.assertTrue(result)
+        # The rejected page's CAPTCHA is captured before the attempt ends,
+        # and the last attempt does not wait for a CAPTCHA it cannot use.
+        self.assertEqual(
+            events,
+            [
+                'capture',
+                'fill',
+                ('outcome', True),
+                'capture',
+                'fill',
+                ('outcome', False),
+            ],
+        )
+        self.assertEqual(login_telemetry.start_attempt.call_count, 2)
+        self.assertEqual(login_telemetry.captcha_timings, {'ocr_ms': 1.0})
+
+    def test_failed_captcha_prefetch_is_captured_again(self):
+        driver = MagicMock()
+        capture = MagicMock(
+            side_effect=[
+                MagicMock(),
+                CaptchaCaptureError('image not loaded'),
+                MagicMock(),
+            ]
+        )
+        recognize = MagicMock(return_value='AB12C3')
+
+        with patch('autodigisign.portal.fill_login_credentials'):
+            with patch('autodigisign.portal.submit_login_captcha') as submit:
+                with patch(
+                    'autodigisign.portal._wait_for_login_outcome',
+                    side_effect=[LOGIN_REJECTED, LOGIN_SUCCEEDED],
+                ):
+                    result = retry_login(
+                        driver,
+                        'username',
+                        'password',
+                        max_retries=2,
+                        captcha_pipeline=(capture, recognize),
+                    )
+
+        self.assertTrue(result)
+        self.assertEqual(capture.call_count, 3)
+        self.assertEqual(submit.call_count, 2)
+
+    def test_script_form_fill_submits_in_one_round_trip(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = None
+
+        login(driver, 'username', 'password', 'AB12C3', form_fill='script')
+
+        driver.execute_script.assert_called_once()
+        self.assertEqual(
+            driver.execute_script.call_args.args[1:],
+            (
+                {
+                    'txtUserID': 'username',
+                    'txtPass': 'password',
+                    'txtVerifyCode': 'AB12C3',
+                },
+                'imgBtnSubmitNew',
+            ),
+        )
+        driver.find_element.assert_not_called()
+
+    def test_script_form_fill_reports_missing_element_as_retryable(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = 'txtVerifyCode'
+
+        with self.assertRaisesRegex(NoSuchElementException, 'txtVerifyCode'):
+            submit_login_captcha(driver, 'AB12C3', form_fill='script')
+
+    def test_retry_reloads_only_the_captcha_image_when_form_is_usable(self):
+        driver = MagicMock()
+        driver.execute_async_script.return_value = 'loaded'
+
+        _refresh_login_page_for_retry(driver, attempt=1, max_retries=2)
+
+        script, timeout_ms = driver.execute_async_script.call_args.args
+        self.assertIn('imgVerifyCode', script)
+        self.assertEqual(timeout_ms, 5000)
+        driver.refresh.assert_not_called()
+
+    def test_retry_falls_back_to_full_refresh(self):
+        for script_result in (
+            {'return_value': 'invalid-form'},
+            {'return_value': 'timeout'},
+            {'side_effect': JavascriptException('script failed')},
+        ):
+            with self.subTest(script_result=script_result):
+                driver = MagicMock()
+                driver.execute_async_script.configure_mock(**script_result)
+
+                _refresh_login_page_for_retry(driver, attempt=1, max_retries=2)
+
+                driver.refresh.assert_called_once_with()
+
+        driver = MagicMock()
+        _refresh_login_page_for_retry(driver, attempt=2, max_retries=2)
+        driver.execute_async_script.assert_not_called()
+        driver.refresh.assert_not_called()
+
     def test_unexpected_login_programming_error_is_not_hidden(self):
         def broken_loader(*args):
             raise RuntimeError('unexpected')
@@ -136,6 +375,66 @@ class PortalTests(unittest.TestCase):
 
         self.assertEqual(_detect_login_outcome(driver), LOGIN_REJECTED)
 
+    def test_outcome_script_resolves_in_one_round_trip(self):
+        driver = MagicMock()
+        driver.execute_async_script.return_value = LOGIN_SUCCEEDED
+
+        with patch('autodigisign.portal.WebDriverWait') as web_driver_wait:
+            outcome = _wait_for_login_outcome(driver, 3)
+
+        self.assertEqual(outcome, LOGIN_SUCCEEDED)
+        driver.execute_async_script.assert_called_once()
+        driver.find_element.assert_not_called()
+        web_driver_wait.assert_not_called()
+
+    def test_outcome_script_can_wait_for_the_next_captcha(self):
+        driver = MagicMock()
+        driver.execute_async_script.return_value = LOGIN_REJECTED
+
+        outcome = _wait_for_login_outcome(driver, 3, await_captcha=True)
+
+        self.assertEqual(outcome, LOGIN_REJECTED)
+        script, timeout_ms, await_captcha = (
+            driver.execute_async_script.call_args.args
+        )
+        self.assertIn('imgVerifyCode', script)
+        self.assertGreater(timeout_ms, 0)
+        self.assertTrue(await_captcha)
+
+    def test_outcome_script_is_reissued_after_the_postback_unloads_it(self):
+        driver = MagicMock()
+        driver.execute_async_script.side_effect = [
+            JavascriptException('document unloaded while waiting for result'),
+            LOGIN_REJECTED,
+        ]
+
+        self.assertEqual(_wait_for_login_outcome(driver, 3), LOGIN_REJECTED)
+        self.assertEqual(driver.execute_async_script.call_count, 2)
+
+    def test_pending_outcome_script_is_a_timeout(self):
+        driver = MagicMock()
+        driver.execute_async_script.return_value = 'pending'
+
+        with self.assertRaises(TimeoutException):
+            _wait_for_login_outcome(driver, 3)
+
+    def test_outcome_detection_falls_back_to_polling(self):
+        driver = MagicMock()
+        driver.execute_async_script.side_effect = JavascriptException('blocked')
+        wait = MagicMock()
+        wait.until.return_value = LOGIN_SUCCEEDED
+
+        with patch(
+            'autodigisign.portal.WebDriverWait',
+            return_value=wait,
+        ) as web_driver_wait:
+            outcome = _wait_for_login_outcome(driver, 3)
+
+        self.assertEqual(outcome, LOGIN_SUCCEEDED)
+        self.assertEqual(driver.execute_async_script.call_count, 3)
+        web_driver_wait.assert_called_once()
+        wait.until.assert_called_once_with(_detect_login_outcome)
+
     def test_navigate_requires_session_and_does_not_guess(self):
         driver = MagicMock()
         driver.current_url = 'https://portal.example/home'
@@ -0,0 +1,104 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from selenium.common.exceptions import TimeoutException
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from autodigisign.session_cache import (  # noqa: E402
+    SessionCache,
+    SessionCacheError,
+    load_session_cipher,
+)
+
+
+SIGNATURE_PAGE_URL = (
+    'https://ihisaw.ntuh.gov.tw/WebApplication/'
+    'DigitalSignature/DsQuery.aspx?SESSION=abc123'
+)
+
+
+class _XorCipher:
+    """Reversible stand-in for DPAPI so the tests run on every platform."""
+
+    def protect(self, data):
+        return bytes(byte ^ 0x5A for byte in data)
+
+    def unprotect(self, data):
+        return self.protect(data)
+
+
+def _signed_in_driver():
+    driver = MagicMock()
+    driver.current_url = SIGNATURE_PAGE_URL
+    driver.get_cookies.return_value = [
+        {'name': 'ASP.NET_SessionId', 'value': 'cookie-value', 'path': '/'}
+    ]
+    return driver
+
+
+class SessionCacheTests(unittest.TestCase):
+    def test_saved_session_is_encrypted_and_restored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = Path(directory) / 'portal_session.bin'
+            cache = SessionCache(cache_path, _XorCipher())
+            cache.save(_signed_in_driver())
+
+            self.assertNotIn(b'abc123', cache_path.read_bytes())
+            self.assertNotIn(b'cookie-value', cache_path.read_bytes())
+
+            driver = MagicMock()
+            driver.find_elements.return_value = [MagicMock()]
+            self.assertTrue(cache.restore(driver))
+
+        self.assertEqual(
+            [call.args[0] for call in driver.get.call_args_list],
+            [SIGNATURE_PAGE_URL, SIGNATURE_PAGE_URL],
+        )
+        driver.add_cookie.assert_called_once_with(
+            {'name': 'ASP.NET_SessionId', 'value': 'cookie-value', 'path': '/'}
+        )
+
+    def test_rejected_session_is_discarded(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = Path(directory) / 'portal_session.bin'
+            cache = SessionCache(cache_path, _XorCipher())
+            cache.save(_signed_in_driver())
+
+            wait = MagicMock()
+            wait.until.side_effect = TimeoutException()
+            with patch('autodigisign.session_cache.WebDriverWait', return_value=wait):
+                self.assertFalse(cache.restore(MagicMock()))
+            self.assertFalse(cache_path.exists())
+
+    def test_old_or_undecryptable_cache_is_not_probed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = Path(directory) / 'portal_session.bin'
+            SessionCache(cache_path, _XorCipher()).save(_signed_in_driver())
+
+            with self.assertLogs(level='INFO'):
+                expired = SessionCache(cache_path, _XorCipher(), max_age_seconds=-1)
+                self.assertIsNone(expired.load())
+            self.assertFalse(cache_path.exists())
+
+            cache_path.write_bytes(b'not encrypted by this account')
+            cipher = MagicMock()
+            cipher.unprotect.side_effect = SessionCacheError('wrong account')
+            driver = MagicMock()
+            with self.assertLogs(level='WARNING'):
+                self.assertFalse(SessionCache(cache_path, cipher).restore(driver))
+            driver.get.assert_not_called()
+            self.assertFalse(cache_path.exists())
+
+    def test_cache_requires_windows_dpapi(self):
+        with self.assertRaises(SessionCacheError):
+            load_session_cipher('macos')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,13 @@
 import logging
 import sys
+import time
 import unittest
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 from selenium.common.exceptions import (
+    JavascriptException,
     StaleElementReferenceException,
     TimeoutException,
     WebDriverException,
@@ -20,6 +22,8 @@ from autodigisign.signing import (  # noqa: E402
     SIGNATURE_BUTTON_ID,
     SIGNATURE_POPUP_TIMEOUT_SECONDS,
     SIGNATURE_PROCESSING_TIMEOUT_SECONDS,
+    SIGNING_STAGES,
+    PopupWatcher,
     SignatureDriverStateError,
     SignatureReaderTypeError,
     SignatureTimeoutError,
@@ -30,6 +34,7 @@ from autodigisign.signing import (  # noqa: E402
     _wait_for_employee_postback,
     _wait_for_popup,
     digital_signature,
+    open_popup_watcher,
 )
 from autodigisign.signing_workflow import process_employees  # noqa: E402
 
@@ -271,6 +276,131 @@ class SigningTests(unittest.TestCase):
         self.assertEqual(clock.current_time, 180)
         sign_button.click.assert_called_once_with()
 
+    def _sign_with_status_watcher(self, driver, stage_timings=None):
+        """Sign one employee whose popup first reports signing in progress."""
+        driver.current_window_handle = 'main'
+        in_progress = SimpleNamespace(text='批次電子簽章作業中，請勿取出卡片。')
+        postback_wait = MagicMock()
+        postback_wait.until.side_effect = TimeoutException()
+        clock = FakeClock()
+
+        def find_element(_driver, _by, value, **_kwargs):
+            if value == 'dsInfo':
+                return in_progress
+            return MagicMock()
+
+        with patch('autodigisign.signing._replace_input_value'):
+            with patch(
+                'autodigisign.signing.WebDriverWait',
+                return_value=postback_wait,
+            ):
+                with patch(
+                    'autodigisign.signing.safe_find',
+                    side_effect=find_element,
+                ):
+                    with patch(
+                        'autodigisign.signing._wait_for_popup',
+                        return_value='popup',
+                    ):
+                        with patch('autodigisign.signing._restore_main_window'):
+                            with patch(
+                                'autodigisign.signing.time.monotonic',
+                                side_effect=clock.monotonic,
+                            ):
+                                with patch(
+                                    'autodigisign.signing.time.sleep',
+                                    side_effect=clock.sleep,
+                                ) as sleep:
+                                    digital_signature(
+                                        '100001',
+                                        'User',
+                                        '1234',
+                                        driver,
+                                        stage_timings=stage_timings,
+                                    )
+        return sleep
+
+    def test_status_watcher_returns_as_soon_as_dsinfo_changes(self):
+        driver = MagicMock()
+        driver.execute_async_script.return_value = '[PCSC] 簽章完成, 共完成43筆簽章'
+
+        sleep = self._sign_with_status_watcher(driver)
+
+        sleep.assert_not_called()
+        driver.execute_async_script.assert_called_once()
+        self.assertEqual(
+            driver.execute_async_script.call_args.args[1],
+            '批次電子簽章作業中，請勿取出卡片。',
+        )
+
+    def test_every_reached_stage_is_timed(self):
+        driver = MagicMock()
+        driver.execute_async_script.return_value = '[PCSC] 簽章完成, 共完成43筆簽章'
+        stage_timings = {}
+
+        self._sign_with_status_watcher(driver, stage_timings)
+
+        self.assertEqual(set(stage_timings), set(SIGNING_STAGES))
+        for duration in stage_timings.values():
+            self.assertGreaterEqual(duration, 0)
+
+    def test_status_watcher_failure_falls_back_to_polling(self):
+        driver = MagicMock()
+        driver.execute_async_script.side_effect = JavascriptException('blocked')
+
+        with patch(
+            'autodigisign.signing._poll_signature_status',
+            return_value='[PCSC] 簽章完成, 共完成43筆簽章',
+        ) as poll:
+            self._sign_with_status_watcher(driver)
+
+        driver.execute_async_script.assert_called_once()
+        poll.assert_called_once()
+
+    def test_popup_watcher_wakes_on_new_top_level_context(self):
+        driver = MagicMock()
+        driver.window_handles = ['main']
+        watcher = PopupWatcher(driver)
+        event, callback = driver.browsing_context.add_event_handler.call_args.args
+        self.assertEqual(event, 'context_created')
+
+        callback(SimpleNamespace(context='stale', parent=None))
+        watcher.clear()
+        callback(SimpleNamespace(context='frame', parent='main'))
+        callback(SimpleNamespace(context='popup', parent=None))
+
+        with patch('autodigisign.signing.time.sleep') as sleep:
+            popup_handle = watcher.wait('main', time.monotonic() + 5)
+
+        self.assertEqual(popup_handle, 'popup')
+        sleep.assert_not_called()
+        watcher.close()
+        driver.browsing_context.remove_event_handler.assert_called_once_with(
+            'context_created',
+            driver.browsing_context.add_event_handler.return_value,
+        )
+
+    def test_popup_watcher_returns_none_at_the_deadline(self):
+        driver = MagicMock()
+        driver.window_handles = ['main']
+
+        watcher = PopupWatcher(driver)
+
+        self.assertIsNone(watcher.wait('main', time.monotonic() + 0.05))
+
+    def test_popup_watcher_requires_a_bidi_session(self):
+        driver = MagicMock()
+        driver.caps = {}
+        self.assertIsNone(open_popup_watcher(driver))
+        driver.browsing_context.add_event_handler.assert_not_called()
+
+        driver.caps = {'webSocketUrl': 'ws://localhost/session'}
+        driver.browsing_context.add_event_handler.side_effect = (
+            WebDriverException('BiDi unavailable')
+        )
+        with self.assertLogs(level='WARNING'):
+            self.assertIsNone(open_popup_watcher(driver))
+
     def test_input_is_refound_after_clear_can_replace_the_dom(self):
         driver = MagicMock()
         previous_field = MagicMock()
@@ -417,6 +547,5 @@ class SigningTests(unittest.TestCase):
                 process_employees(MagicMock(), employees, '1')
         self.assertEqual(sign.call_count, 1)
 
-
 if __name__ == '__main__':
     unittest.main()
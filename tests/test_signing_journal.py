@@ -0,0 +1,113 @@
+import json
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from autodigisign.signing import SignatureDriverStateError  # noqa: E402
+from autodigisign.signing_journal import (  # noqa: E402
+    JOURNAL_FAILED,
+    JOURNAL_NO_PENDING,
+    JOURNAL_SIGNED,
+    SigningJournal,
+    get_signing_journal_path,
+)
+from autodigisign.signing_workflow import process_employees  # noqa: E402
+
+
+EMPLOYEES = [
+    {'id': '1', 'name': 'One'},
+    {'id': '2', 'name': 'Two'},
+    {'id': '3', 'name': 'Three'},
+]
+
+
+class SigningJournalTests(unittest.TestCase):
+    def test_journal_is_keyed_by_run_date_and_roster(self):
+        path = get_signing_journal_path(
+            Path('outputs'),
+            EMPLOYEES,
+            date(2026, 1, 2),
+        )
+
+        self.assertEqual(path.parent, Path('outputs'))
+        self.assertTrue(path.name.startswith('20260102_'))
+        self.assertEqual(
+            path,
+            get_signing_journal_path(
+                Path('outputs'),
+                EMPLOYEES,
+                date(2026, 1, 2),
+            ),
+        )
+        self.assertNotEqual(
+            path,
+            get_signing_journal_path(
+                Path('outputs'),
+                EMPLOYEES[:2],
+                date(2026, 1, 2),
+            ),
+        )
+
+    def test_resume_skips_only_completed_employees(self):
+        with tempfile.TemporaryDirectory() as directory:
+            journal = SigningJournal(Path(directory) / 'journal.jsonl')
+            journal.record('1', JOURNAL_SIGNED)
+            journal.record('2', JOURNAL_FAILED, 'SignatureTimeoutError')
+            journal.record('3', JOURNAL_NO_PENDING)
+            journal.record('3', JOURNAL_FAILED, 'SignatureTimeoutError')
+            with journal.journal_path.open('a', encoding='utf-8') as torn:
+                torn.write('{"format_version": 1, "employee_id": "2", "outc')
+
+            with self.assertLogs(level='INFO'):
+                remaining = journal.remaining_employees(EMPLOYEES)
+
+        self.assertEqual([employee['id'] for employee in remaining], ['2', '3'])
+
+    def test_batch_records_outcomes_until_it_is_aborted(self):
+        sign = MagicMock(
+            side_effect=[
+                '[PCSC] 簽章完成, 共完成43筆簽章',
+                '[PCSC] 查無待簽章電子病歷資料',
+                SignatureDriverStateError('broken'),
+            ]
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            journal = SigningJournal(Path(directory) / 'journal.jsonl')
+            with patch('autodigisign.signing_workflow.digital_signature', sign):
+                with self.assertRaises(SignatureDriverStateError):
+                    process_employees(
+                        MagicMock(),
+                        EMPLOYEES,
+                        '1',
+                        journal=journal,
+                    )
+            entries = [
+                json.loads(line)
+                for line in journal.journal_path.read_text(
+                    encoding='utf-8'
+                ).splitlines()
+            ]
+            with self.assertLogs(level='INFO'):
+                remaining = journal.remaining_employees(EMPLOYEES)
+
+        self.assertEqual(
+            [(entry['employee_id'], entry['outcome']) for entry in entries],
+            [
+                ('1', JOURNAL_SIGNED),
+                ('2', JOURNAL_NO_PENDING),
+                ('3', JOURNAL_FAILED),
+            ],
+        )
+        self.assertEqual(entries[2]['error'], 'SignatureDriverStateError')
+        self.assertEqual([employee['id'] for employee in remaining], ['3'])
+
+
+if __name__ == '__main__':
+    unittest.main()
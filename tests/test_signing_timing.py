@@ -0,0 +1,85 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from autodigisign.signing import SignatureDriverStateError  # noqa: E402
+from autodigisign.signing_timing import (  # noqa: E402
+    SigningTimingReport,
+    get_signing_timing_path,
+)
+from autodigisign.signing_workflow import process_employees  # noqa: E402
+
+
+class SigningTimingReportTests(unittest.TestCase):
+    def test_report_file_sits_next_to_the_info_log(self):
+        self.assertEqual(
+            get_signing_timing_path(
+                Path('logs') / 'autodigisign_20260101_080000_info.log'
+            ),
+            Path('logs') / 'autodigisign_20260101_080000_signing.json',
+        )
+
+    def test_summary_uses_nearest_rank_percentiles(self):
+        report = SigningTimingReport('unused.json')
+        for duration in range(1, 11):
+            report.add('signed', {'popup_open': duration * 100.0})
+        report.add('failed', {'employee_entry': 5.0}, 'SignatureTimeoutError')
+
+        summary = report.summary()
+
+        self.assertEqual(
+            summary['popup_open'],
+            {'count': 10, 'p50_ms': 500.0, 'p90_ms': 900.0, 'max_ms': 1000.0},
+        )
+        self.assertEqual(summary['employee_entry']['count'], 1)
+        self.assertNotIn('terminal', summary)
+        self.assertIsNone(report.employees[-1]['popup_open_ms'])
+
+    def test_batch_writes_report_even_when_it_stops_early(self):
+        employees = [
+            {'id': '1', 'name': 'One'},
+            {'id': '2', 'name': 'Two'},
+            {'id': '3', 'name': 'Three'},
+        ]
+
+        def sign(*_args, stage_timings, **_kwargs):
+            stage_timings['employee_entry'] = 12.34
+            if sign.call_count == 2:
+                raise SignatureDriverStateError('broken')
+
+        sign = MagicMock(side_effect=sign)
+        with tempfile.TemporaryDirectory() as directory:
+            report_path = Path(directory) / 'run_signing.json'
+            with patch('autodigisign.signing_workflow.digital_signature', sign):
+                with self.assertLogs(level='INFO') as captured_logs:
+                    with self.assertRaises(SignatureDriverStateError):
+                        process_employees(
+                            MagicMock(),
+                            employees,
+                            '1',
+                            timing_report=SigningTimingReport(report_path),
+                        )
+            report = json.loads(report_path.read_text(encoding='utf-8'))
+
+        self.assertEqual(
+            [
+                (record['employee'], record['outcome'], record['error'])
+                for record in report['employees']
+            ],
+            [(1, 'signed', None), (2, 'failed', 'SignatureDriverStateError')],
+        )
+        self.assertEqual(report['employees'][0]['employee_entry_ms'], 12.3)
+        self.assertTrue(
+            any('Signing stage employee_entry' in line for line in captured_logs.output)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
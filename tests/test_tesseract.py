@@ -10,6 +10,8 @@ sys.path.insert(0, str(PROJECT_ROOT / 'src'))
 
 from autodigisign.tesseract import (  # noqa: E402
     TesseractConfigurationError,
+    find_tesseract_library,
+    limit_tesseract_threads,
     resolve_tesseract,
 )
 
@@ -44,6 +46,32 @@ class TesseractTests(unittest.TestCase):
                 },
             )
 
+    def test_thread_limit_applies_to_later_tesseract_processes(self):
+        environment = {}
+
+        limit_tesseract_threads(1, environment=environment)
+
+        self.assertEqual(environment, {'OMP_THREAD_LIMIT': '1'})
+        with self.assertRaises(ValueError):
+            limit_tesseract_threads(0, environment=environment)
+
+    def test_resident_library_is_taken_from_the_selected_installation(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            install_directory = Path(temporary_directory)
+            executable = install_directory / 'tesseract.exe'
+            executable.write_text('', encoding='utf-8')
+            library = install_directory / 'libtesseract-5.dll'
+            library.write_text('', encoding='utf-8')
+            (install_directory / 'tessdata').mkdir()
+
+            selection = find_tesseract_library(executable, 'windows')
+
+        self.assertEqual(selection.library_path, str(library.resolve()))
+        self.assertEqual(
+            selection.tessdata_path,
+            (install_directory / 'tessdata').resolve(),
+        )
+
 
 if __name__ == '__main__':
     unittest.main()